@@ -2,6 +2,8 @@
 
 import contextlib
 import csv
+import io
+import time
 import urllib
 from copy import copy
 from pathlib import Path
@@ -14,7 +16,7 @@ from PIL import Image
 
 from tests import CFG, MODEL, MODELS, SOURCE, SOURCES_LIST, TASK_MODEL_DATA, TMP
 from ultralytics import RTDETR, YOLO
-from ultralytics.cfg import TASK2DATA, TASKS
+from ultralytics.cfg import TASK2DATA, TASKS, get_cfg
 from ultralytics.data.build import load_inference_source
 from ultralytics.data.utils import check_det_dataset
 from ultralytics.utils import (
@@ -32,6 +34,7 @@ from ultralytics.utils import (
     checks,
     is_dir_writeable,
     is_github_action_running,
+    ops,
 )
 from ultralytics.utils.downloads import download
 from ultralytics.utils.torch_utils import TORCH_1_9
@@ -139,6 +142,99 @@ def test_predict_visualize(model):
     YOLO(WEIGHTS_DIR / model)(SOURCE, imgsz=32, visualize=True)
 
 
+def test_predict_pipeline():
+    """Test that pipelined prediction returns the same results in the same order as sequential prediction."""
+    model = YOLO(CFG)
+    results = model(SOURCES_LIST[1], imgsz=64, conf=0.01)
+    pipelined = model(SOURCES_LIST[1], imgsz=64, conf=0.01, pipeline=True)
+    assert [r.path for r in results] == [r.path for r in pipelined]
+    for r, p in zip(results, pipelined):
+        assert torch.allclose(r.boxes.data, p.boxes.data)
+        assert {"decode", "preprocess", "inference", "postprocess", "queue"} <= set(p.speed)
+
+
+def test_predict_save_columns():
+    """Test that save_columns streams boxes and run-length encoded masks that read back equal to the results."""
+    from ultralytics.engine.results import ResultsSink
+
+    model = YOLO("yolo11n-seg.yaml")
+    for head in model.model.model[-1].cv3:
+        head[-1].bias.data.fill_(0.0)  # confident detections from untrained weights
+    results = model(SOURCES_LIST[1], imgsz=64, max_det=5, save_columns=True, project=TMP, name="columns")
+    columns = ResultsSink.read(model.predictor.save_dir / "columns")
+    assert list(columns["path"]) == [r.path for r in results]
+    for i, r in enumerate(results):
+        a, b = columns["offsets"][i : i + 2]
+        np.testing.assert_allclose(columns["xyxy"][a:b], r.boxes.xyxy.cpu().numpy())
+        np.testing.assert_array_equal(columns["cls"][a:b], r.boxes.cls.cpu().numpy())
+        for j in range(a, b):
+            counts = columns["mask_counts"][columns["mask_offsets"][j] : columns["mask_offsets"][j + 1]]
+            mask = ops.rle2mask(counts, columns["mask_shape"][i])
+            np.testing.assert_array_equal(mask, r.masks.data[j - a].cpu().numpy().astype(bool))
+    assert columns["offsets"][-1] > 0
+
+    gen = model.predict(SOURCES_LIST[1], imgsz=64, stream=True, save_columns=True, project=TMP, name="columns_break")
+    next(gen)
+    gen.close()  # leaving a stream early still writes the buffered results
+    assert len(ResultsSink.read(model.predictor.save_dir / "columns")["path"]) == 1
+    sink = ResultsSink(TMP / "columns_interval", interval=0.1)
+    parts = sink.parts
+    sink.append(results[:1])
+    time.sleep(1)  # written by the time-based flush before the sink is closed
+    assert sink.parts == parts + 1
+    sink.close()
+
+
+def test_predict_lazy_masks():
+    """Test that lazy_masks defers mask assembly and yields the same masks as eager prediction."""
+    model = YOLO("yolo11n-seg.yaml")
+    for head in model.model.model[-1].cv3:
+        head[-1].bias.data.fill_(0.0)  # confident detections from untrained weights
+    for retina_masks in False, True:
+        eager = model(SOURCE, imgsz=64, max_det=5, retina_masks=retina_masks)[0]
+        lazy = model(SOURCE, imgsz=64, max_det=5, retina_masks=retina_masks, lazy_masks=True)[0]
+        assert lazy.masks._data is None
+        assert len(lazy.masks) == len(lazy.boxes) >= len(eager.masks)  # empty masks are not filtered lazily
+        assert lazy.masks.shape[1:] == eager.masks.shape[1:]
+        assert lazy[0].masks._data is None and lazy.cpu().masks._data is None and lazy.to("cpu").masks._data is None
+        keep = lazy.masks.data.sum((-2, -1)) > 0
+        assert torch.equal(lazy.boxes.data[keep], eager.boxes.data)
+        assert torch.equal(lazy.masks.data[keep], eager.masks.data)
+        masks = lazy.masks
+        assert len(masks.xy) == len(masks)
+        masks.data = eager.masks.data[:1]
+        assert len(masks.xy) == len(masks.xyn) == 1  # segments of the new data
+
+    im = cv2.imread(str(SOURCE))
+    expected = model(im, imgsz=64, max_det=5, lazy_masks=True)[0].masks.data
+    predictor, proto = model.predictor, {}
+    inference = predictor.inference
+
+    def bound(*args, **kwargs):
+        """Return the prototypes in one reused buffer, like the IO bindings of TensorRT and static ONNX models."""
+        preds = inference(*args, **kwargs)
+        proto.setdefault("p", torch.empty_like(preds[1][-1])).copy_(preds[1][-1])
+        return preds[0], (*preds[1][:-1], proto["p"])
+
+    predictor.inference = bound
+    first = model(im, imgsz=64, max_det=5, lazy_masks=True)[0]
+    model(im[::-1].copy(), imgsz=64, max_det=5, lazy_masks=True)  # next batch overwrites the bound buffer
+    assert torch.equal(first.masks.data, expected)
+
+
+def test_predict_batched_preprocess():
+    """Test that batched letterbox preprocessing matches per-image letterboxing, stacking and normalization."""
+    model = YOLO(CFG)
+    model(SOURCE, imgsz=64)
+    predictor = model.predictor
+    im = cv2.imread(str(SOURCE))
+    for batch in [im], [im, im[:200]], [im[..., :1], im[:100, ..., :1]]:
+        expected = np.stack(predictor.pre_transform(batch))
+        expected = expected[..., ::-1] if expected.shape[-1] == 3 else expected
+        expected = torch.from_numpy(np.ascontiguousarray(expected.transpose(0, 3, 1, 2))).float() / 255
+        assert torch.equal(predictor.preprocess(batch), expected)
+
+
 def test_predict_grey_and_4ch():
     """Test YOLO prediction on SOURCE converted to greyscale and 4-channel images with various filenames."""
     im = Image.open(SOURCE)
@@ -201,6 +297,226 @@ def test_track_stream(model):
         model.track(video_url, imgsz=160, tracker=custom_yaml)
 
 
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_track_offline():
+    """Test that offline tracking with batched look-ahead detection returns the same tracks as online tracking."""
+    video = TMP / "track_offline.avi"
+    im = cv2.imread(str(SOURCE))
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"MJPG"), 30, (320, 240))
+    for i in range(10):
+        writer.write(cv2.resize(im[20 * i : 20 * i + 600, 10 * i : 10 * i + 800], (320, 240)))  # camera panning
+    writer.release()
+    tracker = TMP / "botsort-offline.yaml"
+    YAML.save(tracker, {**YAML.load(ROOT / "cfg/trackers/botsort.yaml"), "with_reid": True, "model": "auto"})
+    model = YOLO(CFG)
+    for head in model.model.model[-1].cv3:
+        head[-1].bias.data.fill_(0.0)  # confident detections from untrained weights
+    online = model.track(video, imgsz=160, max_det=20, tracker=tracker)
+    offline = model.track(video, imgsz=160, max_det=20, tracker=tracker, lookahead=2, batch=4)
+    assert len(online) == len(offline) == 10
+    assert offline[-1].boxes.is_track
+    for a, b in zip(online, offline):
+        assert torch.allclose(a.boxes.data, b.boxes.data, atol=1e-4)
+
+
+@pytest.mark.parametrize("kf", ["KalmanFilterXYAH", "KalmanFilterXYWH"])
+def test_track_kalman_vectorized(kf):
+    """Test that the vectorized Kalman filter steps match the per-track steps."""
+    from ultralytics.trackers.utils import kalman_filter
+
+    kf = getattr(kalman_filter, kf)()
+    rng = np.random.default_rng(0)
+    boxes = rng.uniform(10, 100, (20, 4))
+    mean, covariance = kf.multi_predict(*kf.multi_initiate(boxes))
+    measurement = boxes + rng.normal(0, 2, boxes.shape)
+    new_mean, new_covariance = kf.multi_update(mean, covariance, measurement)
+    distances = kf.multi_gating_distance(mean, covariance, measurement[:5])
+    for i in range(len(boxes)):
+        m, c = kf.predict(*kf.initiate(boxes[i]))
+        np.testing.assert_allclose(m, mean[i])
+        np.testing.assert_allclose(c, covariance[i])
+        m, c = kf.update(mean[i], covariance[i], measurement[i])
+        np.testing.assert_allclose(m, new_mean[i])
+        np.testing.assert_allclose(c, new_covariance[i], atol=1e-9)
+        np.testing.assert_allclose(kf.gating_distance(mean[i], covariance[i], measurement[:5]), distances[i])
+
+
+@pytest.mark.parametrize("tracker_type", ["bytetrack", "botsort"])
+def test_track_table(tracker_type):
+    """Test that BYTETracker and BOTSORT keep IDs of moving boxes and return rows of (xyxy, id, score, cls, idx)."""
+    from ultralytics.engine.results import Boxes
+    from ultralytics.trackers.track import TRACKER_MAP
+    from ultralytics.utils import IterableSimpleNamespace
+
+    cfg = IterableSimpleNamespace(**{**YAML.load(ROOT / f"cfg/trackers/{tracker_type}.yaml"), "gmc_method": "none"})
+    tracker = TRACKER_MAP[tracker_type](args=cfg, frame_rate=30)
+    for i in range(6):
+        boxes = np.array([[10 + 4 * i, 10, 60 + 4 * i, 90, 0.9, 0], [200, 50 + 3 * i, 240, 100 + 3 * i, 0.8, 2]])
+        if i % 2:
+            boxes = boxes[::-1]  # detection order must not affect IDs
+        tracks = tracker.update(Boxes(boxes, (320, 320)), np.zeros((320, 320, 3), dtype=np.uint8))
+        assert tracks.shape == (2, 8)
+        tracks = tracks[np.argsort(tracks[:, 4])]
+        assert tracks[:, 4].tolist() == [1, 2]  # track IDs
+        assert tracks[:, 6].tolist() == [0, 2]  # classes
+        assert tracks[:, 7].tolist() == ([1, 0] if i % 2 else [0, 1])  # detection indices
+        np.testing.assert_allclose(tracks[0, :4], boxes[i % 2, :4], atol=3)
+    assert len(tracker.update(Boxes(np.empty((0, 6)), (320, 320)))) == 0  # both tracks lost
+    assert len(tracker.lost_stracks) == 2
+    tracker.reset()
+    assert len(tracker.tracks) == 0 and tracker.frame_id == 0
+
+
+@pytest.mark.parametrize("tracker_type", ["bytetrack", "botsort"])
+def test_track_streams(tracker_type):
+    """Test that a multi-stream tracker matches one tracker per stream, without associating across streams."""
+    from ultralytics.engine.results import Boxes
+    from ultralytics.trackers.track import TRACKER_MAP
+    from ultralytics.utils import IterableSimpleNamespace
+
+    cfg = IterableSimpleNamespace(**{**YAML.load(ROOT / f"cfg/trackers/{tracker_type}.yaml"), "gmc_method": "none"})
+    single = [TRACKER_MAP[tracker_type](args=cfg, frame_rate=30) for _ in range(3)]
+    multi = TRACKER_MAP[tracker_type](args=cfg, frame_rate=30, streams=3)
+    img = np.zeros((320, 320, 3), dtype=np.uint8)
+    for i in range(6):
+        # identical boxes in streams 0 and 2 must still become separate tracks
+        boxes = [
+            np.array([[10 + 4 * i, 10, 60 + 4 * i, 90, 0.9, 0], [200, 50 + 3 * i, 240, 100 + 3 * i, 0.2, 2]]),
+            np.array([[100, 100 + 5 * i, 150, 160 + 5 * i, 0.7, 1]])[: i % 3],
+            np.array([[10 + 4 * i, 10, 60 + 4 * i, 90, 0.9, 0]]),
+        ]
+        expected = [tracker.update(Boxes(b, (320, 320)), img) for tracker, b in zip(single, boxes)]
+        tracks = multi.update_streams([Boxes(b, (320, 320)) for b in boxes], [img] * 3)
+        assert len(tracks) == 3
+        for x, y in zip(expected, tracks):
+            assert x.shape == y.shape
+            np.testing.assert_allclose(np.delete(x, 4, 1), np.delete(y, 4, 1), atol=1e-4)  # IDs differ across runs
+    assert len(set(multi.tracks.track_id.tolist())) == len(multi.tracks)
+    kept = multi.tracks[multi.tracks.stream != 1].track_id.tolist()
+    multi.reset_streams([1])  # e.g. the source of stream 1 changed
+    assert (multi.tracks.stream != 1).all() and multi.tracks.track_id.tolist() == kept
+
+
+def test_track_gating():
+    """Test that gated sparse association finds the same overlapping pairs and assignments as the dense problem."""
+    from scipy.sparse import coo_matrix
+
+    from ultralytics.trackers.utils import matching
+
+    rng = np.random.default_rng(0)
+    a, b = (rng.uniform(0, 900, (n, 2)) for n in (300, 280))
+    a, b = (np.concatenate([xy, xy + rng.uniform(5, 30, xy.shape)], 1) for xy in (a, b))  # xyxy boxes
+    dists = matching.iou_distance(a, b)
+    pairs = matching.overlap_pairs(a, b)
+    assert sorted(zip(*pairs)) == sorted(zip(*np.nonzero(dists < 1)))
+    sparse = coo_matrix((matching.iou_distance(a, b, pairs), pairs), shape=dists.shape)
+    for thresh in (0.5, 0.8):
+        m1, ua1, ub1 = matching.linear_assignment(dists, thresh=thresh)
+        m2, ua2, ub2 = matching.sparse_linear_assignment(sparse, thresh=thresh)
+        assert np.isclose(dists[tuple(np.asarray(m1).T)].sum(), dists[tuple(m2.T)].sum())
+        assert len(ua1) == len(ua2) and len(ub1) == len(ub2)
+
+
+def test_track_gmc():
+    """Test shared frame pyramids and keyframe-based sparse optical flow motion compensation."""
+    from ultralytics.trackers.utils.gmc import GMC, FramePyramid
+
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (400, 500, 3), dtype=np.uint8), (5, 5), 2)
+    frames = [base[2 * i : 2 * i + 300, 3 * i : 3 * i + 400].copy() for i in range(5)]  # camera moving right/down
+    assert FramePyramid.of(frames[0]).gray(2) is FramePyramid.of(frames[0]).gray(2)
+    assert FramePyramid.of(frames[0]).gray(2).shape == (150, 200)
+    gmc = GMC(method="sparseOptFlow", refresh=0.5)
+    gmc.apply(frames[0])
+    keypoints = gmc.prevKeyPoints
+    for frame in frames[1:]:
+        np.testing.assert_allclose(gmc.apply(frame)[:, 2], [-3, -2], atol=0.5)
+    assert len(gmc.prevKeyPoints) == len(keypoints)  # keyframe keypoints were tracked rather than re-detected
+    np.testing.assert_allclose(np.median(keypoints - gmc.prevKeyPoints, (0, 1)), [6, 4], atol=0.1)  # at half scale
+    gmc = GMC(method="sparseOptFlow", budget=1e-6)
+    for frame in frames * 2 + frames[:1]:
+        gmc.apply(frame)
+    assert gmc.downscale == 4 and not gmc.initializedFirstFrame  # over budget on average, so resolution was halved
+    gmc.budget = 1e6
+    for frame in frames * 2 + frames[:1]:
+        gmc.apply(frame)
+    assert gmc.downscale == 2  # well under budget, so resolution was restored
+    FramePyramid.cache_size = 2
+    pyramids = [FramePyramid.of(frame) for frame in frames]
+    assert len(FramePyramid._cache) == 2 and FramePyramid.of(frames[-1]) is pyramids[-1]
+    FramePyramid.cache_size = 16
+
+
+def test_track_reid_cache():
+    """Test that BOTSORT reuses ReID features of barely moving tracks for up to `reid_cache` frames."""
+    from ultralytics.engine.results import Boxes
+    from ultralytics.trackers.bot_sort import BOTSORT, ReID
+    from ultralytics.utils import IterableSimpleNamespace
+
+    class Encoder(ReID):
+        def __init__(self):
+            self.crops = 0
+
+        def __call__(self, img, dets):
+            self.crops += len(dets)
+            return [np.eye(8)[int(d[0]) % 8] + 0.1 for d in dets]  # feature depends on the box position
+
+    cfg = YAML.load(ROOT / "cfg/trackers/botsort.yaml")
+    tracks = []
+    for cache in 0, 3:
+        tracker = BOTSORT(IterableSimpleNamespace(**{**cfg, "gmc_method": "none"}))
+        tracker.args.with_reid, tracker.encoder, tracker.reid_cache = True, Encoder(), cache
+        tracks.append([])
+        for i in range(8):
+            boxes = np.array([[10 + i, 10, 60 + i, 90, 0.9, 0], [200, 50, 240, 100, 0.8, 2]], dtype=float)
+            tracks[-1].append(tracker.update(Boxes(boxes, (320, 320)), np.zeros((320, 320, 3), dtype=np.uint8)))
+        assert tracker.encoder.crops == (16 if cache == 0 else 4)  # embedded on frames 1 and 5 only with the cache
+    for a, b in zip(*tracks):
+        np.testing.assert_allclose(a, b)
+    tracker = BOTSORT(IterableSimpleNamespace(**{**cfg, "gmc_method": "none"}))
+    tracker.args.with_reid, tracker.encoder, tracker.reid_cache = True, Encoder(), 3
+    for boxes in [[10, 10, 60, 90, 0.9, 0]], [[10, 10, 60, 90, 0.9, 0], [11, 10, 61, 90, 0.8, 0]]:
+        tracker.update(Boxes(np.array(boxes, dtype=float), (320, 320)), np.zeros((320, 320, 3), dtype=np.uint8))
+    assert tracker.encoder.crops == 3  # ambiguous duplicate detections are both embedded
+
+
+@pytest.mark.parametrize("method", ["sparseOptFlow", "orb"])
+def test_track_checkpoint(method):
+    """Test that a BOTSORT tracker restored from a checkpoint continues exactly like the original tracker."""
+    from ultralytics.engine.results import Boxes
+    from ultralytics.trackers.basetrack import BaseTrack, TrackState
+    from ultralytics.trackers.bot_sort import BOTSORT
+    from ultralytics.utils import IterableSimpleNamespace
+
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.integers(0, 255, (400, 500, 3), dtype=np.uint8), (5, 5), 2)
+    frames = [base[2 * i : 2 * i + 300, 3 * i : 3 * i + 400].copy() for i in range(10)]
+    boxes = [np.array([[10 + 2 * i, 10, 60 + 2 * i, 90, 0.9, 0], [200, 50, 240, 100, 0.8, 2]]) for i in range(10)]
+    boxes[3:] = [b[:1] for b in boxes[3:]]  # the second object leaves after three frames
+    cfg = {**YAML.load(ROOT / "cfg/trackers/botsort.yaml"), "gmc_method": method}
+
+    def run(tracker, start):
+        return [tracker.update(Boxes(b, (300, 400)), f) for b, f in zip(boxes[start:], frames[start:])]
+
+    BaseTrack.reset_id()
+    tracker = BOTSORT(IterableSimpleNamespace(**cfg))
+    for b, f in zip(boxes[:5], frames[:5]):
+        tracker.update(Boxes(b, (300, 400)), f)
+    assert (tracker.tracks.state == TrackState.Lost).any()  # the checkpoint holds a lost track
+    file = io.BytesIO()
+    tracker.save(file)
+    state = tracker.state_dict()  # in-memory snapshot, must not change while the tracker keeps running
+    expected = run(tracker, 5)
+
+    for restore in (lambda t: t.load(file), lambda t: t.load_state_dict(state)):
+        BaseTrack.reset_id()
+        restored = BOTSORT(IterableSimpleNamespace(**cfg))
+        file.seek(0)
+        restore(restored)
+        for a, b in zip(expected, run(restored, 5)):
+            np.testing.assert_allclose(a, b)
+
+
 @pytest.mark.parametrize("task,weight,data", TASK_MODEL_DATA)
 def test_val(task: str, weight: str, data: str) -> None:
     """Test the validation mode of the YOLO model."""
@@ -328,6 +644,311 @@ def test_labels_and_crops():
         assert len([f for f in crop_files if im_name in f.name]) == len(r.boxes.data)
 
 
+def test_data_frame_ring():
+    """Test FrameRing buffered and latest-frame hand-off, dropped frame counts and close wakeups."""
+    from ultralytics.data.loaders import FrameRing
+
+    ring = FrameRing((4, 4, 3), capacity=3, hold=2)
+    for i in range(3):
+        ring.slot()[:] = i
+        ring.commit()
+    assert [ring.get()[0, 0, 0] for _ in range(2)] == [0, 1]
+    held = ring.get()
+    for i in range(3, 8):
+        ring.slot(drop=True)[:] = i  # overwrites the newest unread frame once full
+        ring.commit()
+    assert held[0, 0, 0] == 2  # read frames are not overwritten
+    assert ring.get(latest=True)[0, 0, 0] == 7 and ring.dropped == 4
+    ring.close()
+    assert ring.get(timeout=1) is None and ring.slot() is None
+
+
+@pytest.mark.parametrize("decode_workers", [0, 1])
+def test_data_load_streams(decode_workers):
+    """Test that LoadStreams hands out frames that stay intact while further frames are decoded into its ring buffer."""
+    from ultralytics.data.build import load_inference_source
+    from ultralytics.data.loaders import LoadStreams
+
+    video = TMP / f"load_streams{decode_workers}.avi"
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for i in range(10):
+        writer.write(np.full((48, 64, 3), 20 * i, dtype=np.uint8))
+    writer.release()
+    source = TMP / f"load_streams{decode_workers}.streams"
+    source.write_text(str(video))
+    dataset = LoadStreams(str(source), buffer=True, decode_workers=decode_workers)
+    frames = [ims[0] for _, ims, _ in dataset]  # all frames kept, beyond the ring hold
+    assert [round(im.mean() / 20) for im in frames] == list(range(10))
+    dataset = load_inference_source(str(source), buffer=True, decode_workers=decode_workers, views=2)
+    views = [ims[0] for _, ims, _ in zip(range(3), dataset)]
+    assert all(im.base is not None for im in views) and views[-1].mean() == 40  # zero-copy views while valid
+    dataset.close()
+
+
+def test_data_decode_workers():
+    """Test that decoding videos in worker processes returns the same frames as decoding in-process."""
+    from ultralytics.data.loaders import LoadImagesAndVideos
+
+    video = TMP / "decode_workers.avi"
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for i in range(10):
+        writer.write(np.full((48, 64, 3), 20 * i, dtype=np.uint8))
+    writer.release()
+    frames = [[im for _, ims, _ in LoadImagesAndVideos(video, batch=4, decode_workers=n) for im in ims] for n in (0, 1)]
+    assert len(frames[0]) == len(frames[1]) == 10
+    assert all(np.array_equal(a, b) for a, b in zip(*frames))
+    loader = LoadImagesAndVideos([video, video], batch=2, decode_workers=2)
+    next(iter(loader))  # stop early while both videos are still being decoded
+    processes = [d[1] for d in loader.decoders]
+    loader.close()
+    assert not loader.decoders and not any(p.is_alive() for p in processes)
+
+
+def test_data_cache_mmap():
+    """Test that cache='mmap' packs resized images once and returns the same images as uncached loading."""
+    from ultralytics.data.dataset import YOLODataset
+
+    images = TMP / "mmap/images"
+    images.mkdir(parents=True, exist_ok=True)
+    for i, (h, w) in enumerate([(48, 64), (80, 40), (32, 32)]):
+        cv2.imwrite(str(images / f"{i}.png"), np.random.randint(0, 255, (h, w, 3), dtype=np.uint8))
+    kwargs = dict(img_path=images, imgsz=32, augment=False, data={"names": {0: "item"}, "channels": 3})
+    mmap = YOLODataset(cache="mmap", **kwargs)
+    assert mmap.mmap_index is not None and mmap.mmap_file.exists()
+    reloaded = YOLODataset(cache="mmap", rect=True, batch_size=2, **kwargs)  # reuse packed file in another order
+    uncached = YOLODataset(cache=False, rect=True, batch_size=2, **kwargs)
+    for i in range(3):
+        im, hw0, hw = reloaded.load_image(i)
+        im_ref, hw0_ref, hw_ref = uncached.load_image(i)
+        assert np.array_equal(im, im_ref) and hw0 == hw0_ref and hw == hw_ref
+    assert reloaded.mmap_file == mmap.mmap_file
+    assert YOLODataset(cache="mmap", **{**kwargs, "imgsz": 64}).mmap_file != mmap.mmap_file  # own pack per image size
+
+
+def test_data_cache_labels_update():
+    """Test that the labels cache only verifies new or changed files again and drops removed ones."""
+    from unittest.mock import patch
+
+    import ultralytics.data.dataset as dataset
+
+    images, labels = TMP / "cache_update/images", TMP / "cache_update/labels"
+    for d in images, labels:
+        d.mkdir(parents=True, exist_ok=True)
+    for i in range(4):
+        cv2.imwrite(str(images / f"{i}.png"), np.random.randint(0, 255, (32, 32, 3), dtype=np.uint8))
+        (labels / f"{i}.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+    kwargs = dict(img_path=images, imgsz=32, augment=False, data={"names": {0: "a", 1: "b"}, "channels": 3})
+    assert len(dataset.YOLODataset(**kwargs).labels) == 4
+
+    cv2.imwrite(str(images / "4.png"), np.random.randint(0, 255, (32, 32, 3), dtype=np.uint8))  # added
+    (labels / "1.txt").write_text("1 0.5 0.5 0.4 0.4\n1 0.2 0.2 0.1 0.1\n")  # changed
+    (images / "2.png").unlink()  # removed
+    with patch.object(dataset, "verify_image_label", wraps=dataset.verify_image_label) as verify:
+        ds = dataset.YOLODataset(**kwargs)
+        assert sorted(Path(c.args[0][0]).name for c in verify.call_args_list) == ["1.png", "4.png"]
+        assert [Path(lb["im_file"]).name for lb in ds.labels] == ["0.png", "1.png", "3.png", "4.png"]
+        assert ds.labels[1]["cls"].ravel().tolist() == [1, 1]
+        verify.reset_mock()
+        dataset.YOLODataset(**kwargs)
+        verify.assert_not_called()  # unchanged dataset loads the cache as is
+
+
+def test_data_label_store():
+    """Test that LabelStore round-trips labels through memory-mapped columns and reorders and filters them."""
+    import pickle
+
+    from ultralytics.data.utils import LabelStore
+
+    labels = [
+        {
+            "im_file": f"{i}é.jpg",
+            "shape": (32 + i, 64),
+            "cls": np.arange(i, dtype=np.float32).reshape(-1, 1) % 2,
+            "bboxes": np.random.rand(i, 4).astype(np.float32),
+            "segments": [np.random.rand(3 + j, 2).astype(np.float32) for j in range(i)] if i % 2 else [],
+            "keypoints": None,
+        }
+        for i in range(5)
+    ]
+    store = LabelStore.from_labels(labels)
+    store.save(TMP / "labels/train.labels")
+    assert isinstance(store.columns["bboxes"], np.memmap) and len(pickle.dumps(store)) < 1000  # columns not pickled
+    store = pickle.loads(pickle.dumps(store))
+    for lb, x in zip(labels, store):
+        assert x["im_file"] == lb["im_file"] and x["shape"] == lb["shape"] and np.array_equal(x["bboxes"], lb["bboxes"])
+        assert len(x["segments"]) == len(lb["segments"])
+        assert all(np.array_equal(a, b) for a, b in zip(x["segments"], lb["segments"]))
+    reordered = store[[4, 0, 2]]
+    assert reordered.im_files == ["4é.jpg", "0é.jpg", "2é.jpg"] and reordered.shapes[:, 0].tolist() == [36, 32, 34]
+    reordered.update_labels(include_class=[1], single_cls=True)
+    assert reordered[0]["cls"].ravel().tolist() == [0, 0] and len(reordered[0]["bboxes"]) == 2
+
+
+def test_data_shards():
+    """Test converting a YOLO dataset to shards and streaming them with Mosaic, MixUp and CopyPaste through a store."""
+    import io
+
+    from ultralytics.data import build_dataloader
+    from ultralytics.data.converter import convert_yolo_to_shards
+    from ultralytics.data.dataset import YOLOStreamDataset
+    from ultralytics.data.utils import LocalShardStore
+
+    class ObjectStore(LocalShardStore):
+        """Fake object store returning non-seekable in-memory objects."""
+
+        def open(self, name):
+            stream = io.BytesIO(super().open(name).read())
+            stream.seekable = lambda: False
+            return stream
+
+    images, labels = TMP / "shards/images", TMP / "shards/labels"
+    for d in images, labels:
+        d.mkdir(parents=True, exist_ok=True)
+    for i in range(10):
+        cv2.imwrite(str(images / f"{i}.jpg"), np.random.randint(0, 255, (48 + 8 * i, 64, 3), dtype=np.uint8))
+        (labels / f"{i}.txt").write_text(f"{i % 2} 0.2 0.2 0.6 0.2 0.6 0.6 0.2 0.6\n")
+    data = {"names": {0: "a", 1: "b"}, "channels": 3}
+    save_dir = convert_yolo_to_shards(images, data=data, task="segment", shard_size=3)
+    assert len(list(save_dir.glob("*.tar"))) == 4
+
+    hyp = get_cfg(overrides={"mosaic": 1.0, "mixup": 1.0, "copy_paste": 1.0, "copy_paste_mode": "mixup"})
+    dataset = YOLOStreamDataset(ObjectStore(save_dir), imgsz=64, batch_size=4, hyp=hyp, data=data, task="segment")
+    assert len(dataset) == 10 and len(dataset.labels) == 3  # first shard previewed only
+    loader = build_dataloader(dataset, batch=4, workers=0)
+    assert len(loader) == 3
+    for _ in range(2):  # streams again once exhausted
+        batches = list(loader)
+        assert len(batches) == 3 and sum(len(b["img"]) for b in batches) == 10
+        assert batches[0]["img"].shape[-2:] == (64, 64) and batches[0]["masks"].shape[0] == 4
+    dataset = YOLOStreamDataset(LocalShardStore(save_dir), imgsz=64, batch_size=4, hyp=hyp, data=data, task="segment")
+    loader = build_dataloader(dataset, batch=4, workers=2)  # 5 samples per worker, each with a partial last batch
+    assert len(loader) == 4
+    for _ in range(2):  # every epoch holds exactly one pass, without leftovers of the previous one
+        batches = list(loader)
+        files = [f for b in batches for f in b["im_file"]]
+        assert len(batches) == 4 and len(files) == len(set(files)) == 10
+
+
+@pytest.mark.parametrize("overlap_mask", [True, False])
+def test_data_batch_augment(overlap_mask):
+    """Test that batch_augment keeps boxes, masks and keypoints of whole collated batches consistent."""
+    from ultralytics.data.augment import BatchAugment
+    from ultralytics.data.dataset import YOLODataset
+
+    images, labels = TMP / "batch_augment/images", TMP / "batch_augment/labels"
+    for d in images, labels:
+        d.mkdir(parents=True, exist_ok=True)
+    for i in range(4):
+        im, lines = np.full((64, 64, 3), 50, dtype=np.uint8), []
+        for j in range(3):  # non-overlapping rectangles
+            x, y, w, h = 21 * j + 1, 4 + 8 * i, 12 + 2 * j, 16
+            cv2.rectangle(im, (x, y), (x + w - 1, y + h - 1), (200, 200, 200), -1)
+            lines.append("0 " + " ".join(f"{v / 64:.5f}" for v in (x, y, x + w, y, x + w, y + h, x, y + h)))
+        cv2.imwrite(str(images / f"{i}.png"), im)
+        (labels / f"{i}.txt").write_text("\n".join(lines) + "\n")
+    overrides = {"batch_augment": True, "degrees": 20.0, "hsv_h": 0.0, "flipud": 0.5, "overlap_mask": overlap_mask}
+    data = {"names": {0: "a"}, "channels": 3}
+    dataset = YOLODataset(img_path=images, imgsz=64, hyp=get_cfg(overrides=overrides), data=data, task="segment")
+    torch.manual_seed(0)
+    batch = YOLODataset.collate_fn([dataset[i] for i in range(4)])
+    batch["img"] = batch["img"].float()
+    batch = dataset.batch_transforms(batch)
+    assert batch["img"].shape == (4, 3, 64, 64) and len(batch["bboxes"]) == len(batch["cls"]) == len(batch["batch_idx"])
+    for k, (i, box) in enumerate(zip(batch["batch_idx"].long(), batch["bboxes"] * 64)):
+        m = batch["masks"][i] == int((batch["batch_idx"][:k] == i).sum()) + 1 if overlap_mask else batch["masks"][k]
+        ys, xs = torch.nonzero(m, as_tuple=True)
+        if not len(xs):  # thin masks may vanish when scaled down at mask resolution
+            continue
+        extent = torch.stack((xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)) * 4.0
+        assert (extent - ops.xywh2xyxy(box)).abs().max() < 6  # masks are 4x downsampled
+
+    # Flips only: images are mirrored exactly and keypoints swap sides
+    batch = {
+        "img": torch.rand(2, 3, 32, 48) * 255,
+        "bboxes": torch.tensor([[0.25, 0.5, 0.2, 0.4], [0.5, 0.5, 0.5, 0.5]]),
+        "cls": torch.tensor([[1.0], [2.0]]),
+        "batch_idx": torch.tensor([0.0, 1.0]),
+        "keypoints": torch.tensor([[[0.1, 0.2, 1.0], [0.3, 0.4, 1.0]], [[0.5, 0.5, 1.0], [0.6, 0.7, 1.0]]]),
+    }
+    img = batch["img"].clone()
+    augment = BatchAugment(translate=0.0, scale=0.0, hgain=0.0, sgain=0.0, vgain=0.0, fliplr=1.0, flip_idx=[1, 0])
+    batch = augment(batch)
+    assert torch.allclose(batch["img"], img.flip(-1), atol=1e-2)
+    assert torch.allclose(batch["bboxes"][:, 0], torch.tensor([0.75, 0.5]))
+    assert torch.allclose(batch["keypoints"][0, :, :2], torch.tensor([[0.7, 0.4], [0.9, 0.2]]))
+
+
+def test_data_fused_augment():
+    """Test that fused_augment warps mosaic tiles straight into the output with the same labels as the unfused path."""
+    import random
+
+    from ultralytics.data.dataset import YOLODataset
+
+    images, labels = TMP / "fused_augment/images", TMP / "fused_augment/labels"
+    for d in images, labels:
+        d.mkdir(parents=True, exist_ok=True)
+    for i in range(4):
+        im = cv2.GaussianBlur(np.random.randint(0, 255, (48 + 16 * i, 64, 3), dtype=np.uint8), (9, 9), 3)
+        cv2.imwrite(str(images / f"{i}.png"), im)
+        (labels / f"{i}.txt").write_text("0 0.2 0.2 0.6 0.2 0.6 0.6 0.2 0.6\n")
+    results = []
+    for fused in False, True:
+        hyp = get_cfg(overrides={"fused_augment": fused, "degrees": 10.0, "hsv_h": 0.0, "hsv_s": 0.0, "hsv_v": 0.0})
+        data = {"names": {0: "a"}, "channels": 3}
+        dataset = YOLODataset(img_path=images, imgsz=64, hyp=hyp, data=data, task="segment", cache="ram")
+        random.seed(0)
+        results.append([dataset[i] for i in range(4)])
+    for a, b in zip(*results):
+        assert torch.equal(a["bboxes"], b["bboxes"]) and torch.equal(a["masks"], b["masks"])
+        assert (a["img"].int() - b["img"].int()).abs().float().mean() < 1  # only tile seams are blended differently
+
+
+def test_data_collate_prefetch():
+    """Test that collate_fn stacks into worker buffers with per-image batch_idx and DevicePrefetcher keeps batches."""
+    from torch.utils.data import DataLoader
+
+    from ultralytics.data.build import DevicePrefetcher
+    from ultralytics.data.dataset import YOLODataset
+
+    samples = [
+        {
+            "img": torch.randint(0, 255, (3, 32, 32), dtype=torch.uint8),
+            "cls": torch.zeros(n, 1),
+            "bboxes": torch.rand(n, 4),
+            "masks": torch.zeros(1, 8, 8, dtype=torch.uint8),
+            "batch_idx": torch.zeros(n),
+            "im_file": f"{i}.jpg",
+        }
+        for i, n in enumerate((2, 0, 3, 1))
+    ]
+    batch = YOLODataset.collate_fn(samples)
+    assert batch["img"].shape == (4, 3, 32, 32) and batch["masks"].shape == (4, 8, 8)
+    assert batch["batch_idx"].tolist() == [0, 0, 2, 2, 2, 3]
+    assert batch["im_file"] == ("0.jpg", "1.jpg", "2.jpg", "3.jpg")
+    loader = DataLoader(samples, batch_size=2, num_workers=1, collate_fn=YOLODataset.collate_fn)
+    batches = list(DevicePrefetcher(loader, torch.device("cpu")))
+    assert len(batches) == len(loader) == 2
+    assert torch.equal(torch.cat([b["img"] for b in batches]), batch["img"])
+    assert torch.equal(torch.cat([b["bboxes"] for b in batches]), batch["bboxes"])
+    assert batches[1]["batch_idx"].tolist() == [0, 0, 0, 1]
+
+
+def test_data_aspect_ratio_sampler():
+    """Test that AspectRatioBatchSampler shuffles batches within buckets and splits them evenly across ranks."""
+    from ultralytics.data.build import AspectRatioBatchSampler
+
+    buckets = np.repeat(np.arange(3), [10, 7, 4])
+    sampler = AspectRatioBatchSampler(buckets, batch_size=4)
+    epoch0, epoch1 = list(sampler), list(sampler)
+    assert len(epoch0) == len(sampler) == 6 and epoch0 != epoch1  # reshuffled every epoch
+    assert sorted(sum(epoch0, [])) == list(range(len(buckets)))
+    assert all(len(set(buckets[b])) == 1 for b in epoch0)  # one aspect-ratio bucket per batch
+    assert all(len(b) == 4 for b in AspectRatioBatchSampler(buckets, batch_size=4, drop_last=True))
+    ranks = [list(AspectRatioBatchSampler(buckets, 4, num_replicas=4, rank=r)) for r in range(4)]
+    assert all(len(r) == 2 for r in ranks)  # 6 batches padded to 8
+    assert sorted(set(map(tuple, sum(ranks, [])))) == sorted(map(tuple, epoch0))
+
+
 @pytest.mark.skipif(not ONLINE, reason="environment is offline")
 def test_data_utils():
     """Test utility functions in ultralytics/data/utils.py, including dataset stats and auto-splitting."""
@@ -465,6 +1086,74 @@ def test_utils_ops():
     torch.allclose(boxes, xyxyxyxy2xywhr(xywhr2xyxyxyxy(boxes)), rtol=1e-3)
 
 
+@pytest.mark.parametrize("kwargs", [{}, {"multi_label": True}, {"classes": [0, 3]}, {"agnostic": True, "max_det": 10}])
+def test_utils_ops_nms_batched(kwargs):
+    """Test that batched non_max_suppression matches per-image results."""
+    from ultralytics.utils.ops import non_max_suppression
+
+    pred = torch.rand(4, 4 + 8 + 2, 500)  # xywh, 8 classes, 2 mask coefficients
+    pred[:, :2] *= 320
+    pred[:, 2:4] = pred[:, 2:4] * 80 + 2
+    pred[2, 4:12] = 0  # image without detections
+    out, idxs = non_max_suppression(pred.clone(), nc=8, return_idxs=True, **kwargs)
+    for i, p in enumerate(pred):
+        o, idx = non_max_suppression(p[None].clone(), nc=8, return_idxs=True, **kwargs)
+        assert torch.equal(out[i], o[0]) and torch.equal(idxs[i].view(-1), idx[0].view(-1).long())
+    assert len(out[2]) == 0
+
+
+@pytest.mark.parametrize("rotated", [False, True])
+def test_utils_ops_numpy(rotated):
+    """Test that NumPy postprocessing operations match their PyTorch counterparts."""
+    from ultralytics.utils import ops, ops_numpy
+
+    pred = torch.rand(2, 4 + 8 + 1, 400)  # xywh, 8 classes, angle
+    pred[:, :2] *= 320
+    pred[:, 2:4] = pred[:, 2:4] * 80 + 2
+    pred[:, 4:12] **= 3  # spread scores to avoid ties
+    for kwargs in {}, {"multi_label": True}, {"classes": [1, 5], "max_det": 20}:
+        out, idxs = ops.non_max_suppression(pred.clone(), nc=8, rotated=rotated, return_idxs=True, **kwargs)
+        out_np, idxs_np = ops_numpy.non_max_suppression(pred.numpy(), nc=8, rotated=rotated, return_idxs=True, **kwargs)
+        for o, o_np, i, i_np in zip(out, out_np, idxs, idxs_np):
+            assert np.allclose(o.numpy(), o_np, atol=1e-4) and np.array_equal(i.view(-1).numpy(), i_np)
+
+    protos, coefs = torch.randn(32, 80, 80), torch.randn(10, 32)
+    boxes = torch.rand(10, 4) * 160
+    boxes[:, 2:] += boxes[:, :2]
+    args_np = protos.numpy(), coefs.numpy(), boxes.numpy()
+    masks = ops.process_mask(protos, coefs, boxes.clone(), (320, 320), upsample=True)
+    assert np.array_equal(masks.numpy(), ops_numpy.process_mask(*args_np, (320, 320), upsample=True))
+    masks = ops.process_mask_native(protos, coefs, boxes.clone(), (240, 320))
+    assert np.array_equal(masks.numpy(), ops_numpy.process_mask_native(*args_np, (240, 320)))
+
+
+def test_utils_instances():
+    """Test deferred box conversions, padded segments and resampling segments only where they are clipped."""
+    from ultralytics.utils.instance import Instances
+    from ultralytics.utils.ops import resample_segments, segments2boxes, xywh2xyxy
+
+    segments = [np.random.rand(n, 2).astype(np.float32) * 0.5 + 0.25 for n in (3, 40, 7)]
+    segments[2] += 0.5  # crosses the right and bottom border
+    bboxes = segments2boxes(segments).astype(np.float32)
+    instances = Instances(bboxes.copy(), [s.copy() for s in segments], segment_resamples=100)
+    assert instances.segments.shape == (3, 40, 2) and instances.segment_lengths.tolist() == [3, 40, 7]
+    assert (instances.segments[0, 3:] == segments[0][-1]).all()  # padded with the last point
+
+    instances.convert_bbox("xyxy")
+    assert instances._bboxes._data_format == "xywh"  # conversion deferred until boxes are read
+    instances.denormalize(200, 100)
+    instances.add_padding(10, 20)
+    instances.clip(200, 100)
+    expected = xywh2xyxy(bboxes) * (200, 100, 200, 100) + (10, 20, 10, 20)
+    assert np.allclose(instances.bboxes, expected.clip(0, (200, 100, 200, 100)), atol=1e-4)
+    assert instances.segment_lengths.tolist() == [3, 40, 100]  # only the clipped segment is resampled
+    resampled = resample_segments([segments[2] * (200, 100) + (10, 20)], 100)[0].clip(0, (200, 100))
+    assert np.allclose(instances.segments[2, :100], resampled, atol=1e-3)
+
+    instances = Instances.concatenate([instances, Instances(bboxes[:1], segments[:1], normalized=False)])
+    assert instances.segments.shape == (4, 100, 2) and instances.segment_lengths.tolist() == [3, 40, 100, 3]
+
+
 def test_utils_files():
     """Test file handling utilities including file age, date, and paths with spaces."""
     from ultralytics.utils.files import file_age, file_date, get_latest_run, spaces_in_path
@@ -193,6 +193,9 @@ CFG_INT_KEYS = frozenset(
         "mask_ratio",
         "max_det",
         "vid_stride",
+        "stream_views",
+        "decode_workers",
+        "lookahead",
         "line_width",
         "nbs",
         "save_period",
@@ -215,6 +218,7 @@ CFG_BOOL_KEYS = frozenset(
         "plots",
         "show",
         "save_txt",
+        "save_columns",
         "save_conf",
         "save_crop",
         "save_frames",
@@ -224,6 +228,7 @@ CFG_BOOL_KEYS = frozenset(
         "augment",
         "agnostic_nms",
         "retina_masks",
+        "lazy_masks",
         "show_boxes",
         "keras",
         "optimize",
@@ -233,6 +238,10 @@ CFG_BOOL_KEYS = frozenset(
         "nms",
         "profile",
         "multi_scale",
+        "batch_augment",
+        "fused_augment",
+        "pipeline",
+        "numpy_postprocess",
     }
 )
 
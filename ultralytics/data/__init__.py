@@ -9,6 +9,7 @@ from .dataset import (
     YOLOConcatDataset,
     YOLODataset,
     YOLOMultiModalDataset,
+    YOLOStreamDataset,
 )
 
 __all__ = (
@@ -18,6 +19,7 @@ __all__ = (
     "YOLODataset",
     "YOLOMultiModalDataset",
     "YOLOConcatDataset",
+    "YOLOStreamDataset",
     "GroundingDataset",
     "build_yolo_dataset",
     "build_grounding",
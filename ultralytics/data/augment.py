@@ -3,7 +3,7 @@
 import math
 import random
 from copy import deepcopy
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -16,7 +16,7 @@ from ultralytics.utils import LOGGER, IterableSimpleNamespace, colorstr
 from ultralytics.utils.checks import check_version
 from ultralytics.utils.instance import Instances
 from ultralytics.utils.metrics import bbox_ioa
-from ultralytics.utils.ops import segment2box, xywh2xyxy, xyxyxyxy2xywhr
+from ultralytics.utils.ops import xywh2xyxy, xywhr2xyxyxyxy, xyxy2xywh, xyxyxyxy2xywhr
 from ultralytics.utils.torch_utils import TORCHVISION_0_10, TORCHVISION_0_11, TORCHVISION_0_13
 
 DEFAULT_MEAN = (0.0, 0.0, 0.0)
@@ -500,6 +500,7 @@ class Mosaic(BaseMixTransform):
         p (float): Probability of applying the mosaic augmentation. Must be in the range 0-1.
         n (int): The grid size, either 4 (for 2x2) or 9 (for 3x3).
         border (Tuple[int, int]): Border size for width and height.
+        fused (bool): Whether to return the placed tiles for RandomPerspective instead of a composed mosaic image.
 
     Methods:
         get_indexes: Return a list of random indexes from the dataset.
@@ -507,6 +508,8 @@ class Mosaic(BaseMixTransform):
         _mosaic3: Create a 1x3 image mosaic.
         _mosaic4: Create a 2x2 image mosaic.
         _mosaic9: Create a 3x3 image mosaic.
+        _canvas: Create an empty mosaic image or tile list.
+        _paste: Place an image on the mosaic.
         _update_labels: Update labels with padding.
         _cat_labels: Concatenate labels and clips mosaic border instances.
 
@@ -517,7 +520,7 @@ class Mosaic(BaseMixTransform):
         >>> augmented_labels = mosaic_aug(original_labels)
     """
 
-    def __init__(self, dataset, imgsz: int = 640, p: float = 1.0, n: int = 4):
+    def __init__(self, dataset, imgsz: int = 640, p: float = 1.0, n: int = 4, fused: bool = False):
         """
         Initialize the Mosaic augmentation object.
 
@@ -529,6 +532,9 @@ class Mosaic(BaseMixTransform):
             imgsz (int): Image size (height and width) after mosaic pipeline of a single image.
             p (float): Probability of applying the mosaic augmentation. Must be in the range 0-1.
             n (int): The grid size, either 4 (for 2x2) or 9 (for 3x3).
+            fused (bool): If True, skip composing the mosaic image and return the placed tiles under 'mosaic_tiles',
+                which a following RandomPerspective warps straight into its output. Requires RandomPerspective to
+                be the next transform.
 
         Examples:
             >>> from ultralytics.data.augment import Mosaic
@@ -541,7 +547,8 @@ class Mosaic(BaseMixTransform):
         self.imgsz = imgsz
         self.border = (-imgsz // 2, -imgsz // 2)  # width, height
         self.n = n
-        self.buffer_enabled = self.dataset.cache != "ram"
+        self.fused = fused
+        self.buffer_enabled = self.dataset.cache not in {"ram", "mmap"}
 
     def get_indexes(self):
         """
@@ -630,7 +637,7 @@ class Mosaic(BaseMixTransform):
 
             # Place img in img3
             if i == 0:  # center
-                img3 = np.full((s * 3, s * 3, img.shape[2]), 114, dtype=np.uint8)  # base image with 3 tiles
+                img3 = self._canvas(s * 3, img)  # base image with 3 tiles
                 h0, w0 = h, w
                 c = s, s, s + w, s + h  # xmin, ymin, xmax, ymax (base) coordinates
             elif i == 1:  # right
@@ -641,7 +648,7 @@ class Mosaic(BaseMixTransform):
             padw, padh = c[:2]
             x1, y1, x2, y2 = (max(x, 0) for x in c)  # allocate coordinates
 
-            img3[y1:y2, x1:x2] = img[y1 - padh :, x1 - padw :]  # img3[ymin:ymax, xmin:xmax]
+            self._paste(img3, img[y1 - padh :, x1 - padw :], x1, y1)  # img3[ymin:ymax, xmin:xmax]
             # hp, wp = h, w  # height, width previous for next iteration
 
             # Labels assuming imgsz*2 mosaic size
@@ -649,8 +656,7 @@ class Mosaic(BaseMixTransform):
             mosaic_labels.append(labels_patch)
         final_labels = self._cat_labels(mosaic_labels)
 
-        final_labels["img"] = img3[-self.border[0] : self.border[0], -self.border[1] : self.border[1]]
-        return final_labels
+        return self._crop(final_labels, img3)
 
     def _mosaic4(self, labels: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -687,7 +693,7 @@ class Mosaic(BaseMixTransform):
 
             # Place img in img4
             if i == 0:  # top left
-                img4 = np.full((s * 2, s * 2, img.shape[2]), 114, dtype=np.uint8)  # base image with 4 tiles
+                img4 = self._canvas(s * 2, img)  # base image with 4 tiles
                 x1a, y1a, x2a, y2a = max(xc - w, 0), max(yc - h, 0), xc, yc  # xmin, ymin, xmax, ymax (large image)
                 x1b, y1b, x2b, y2b = w - (x2a - x1a), h - (y2a - y1a), w, h  # xmin, ymin, xmax, ymax (small image)
             elif i == 1:  # top right
@@ -700,14 +706,14 @@ class Mosaic(BaseMixTransform):
                 x1a, y1a, x2a, y2a = xc, yc, min(xc + w, s * 2), min(s * 2, yc + h)
                 x1b, y1b, x2b, y2b = 0, 0, min(w, x2a - x1a), min(y2a - y1a, h)
 
-            img4[y1a:y2a, x1a:x2a] = img[y1b:y2b, x1b:x2b]  # img4[ymin:ymax, xmin:xmax]
+            self._paste(img4, img[y1b:y2b, x1b:x2b], x1a, y1a)  # img4[ymin:ymax, xmin:xmax]
             padw = x1a - x1b
             padh = y1a - y1b
 
             labels_patch = self._update_labels(labels_patch, padw, padh)
             mosaic_labels.append(labels_patch)
         final_labels = self._cat_labels(mosaic_labels)
-        final_labels["img"] = img4
+        final_labels["mosaic_tiles" if self.fused else "img"] = img4
         return final_labels
 
     def _mosaic9(self, labels: Dict[str, Any]) -> Dict[str, Any]:
@@ -747,7 +753,7 @@ class Mosaic(BaseMixTransform):
 
             # Place img in img9
             if i == 0:  # center
-                img9 = np.full((s * 3, s * 3, img.shape[2]), 114, dtype=np.uint8)  # base image with 4 tiles
+                img9 = self._canvas(s * 3, img)  # base image with 9 tiles
                 h0, w0 = h, w
                 c = s, s, s + w, s + h  # xmin, ymin, xmax, ymax (base) coordinates
             elif i == 1:  # top
@@ -771,7 +777,7 @@ class Mosaic(BaseMixTransform):
             x1, y1, x2, y2 = (max(x, 0) for x in c)  # allocate coordinates
 
             # Image
-            img9[y1:y2, x1:x2] = img[y1 - padh :, x1 - padw :]  # img9[ymin:ymax, xmin:xmax]
+            self._paste(img9, img[y1 - padh :, x1 - padw :], x1, y1)  # img9[ymin:ymax, xmin:xmax]
             hp, wp = h, w  # height, width previous for next iteration
 
             # Labels assuming imgsz*2 mosaic size
@@ -779,8 +785,63 @@ class Mosaic(BaseMixTransform):
             mosaic_labels.append(labels_patch)
         final_labels = self._cat_labels(mosaic_labels)
 
-        final_labels["img"] = img9[-self.border[0] : self.border[0], -self.border[1] : self.border[1]]
-        return final_labels
+        return self._crop(final_labels, img9)
+
+    def _canvas(self, size: int, img: np.ndarray) -> Union[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Create a grey square mosaic image, or an empty list of tiles in fused mode.
+
+        Args:
+            size (int): Height and width of the mosaic image.
+            img (np.ndarray): First image of the mosaic, used for the channel count.
+
+        Returns:
+            (np.ndarray | List[Tuple[np.ndarray, np.ndarray]]): Mosaic image of shape (size, size, C) filled with 114,
+                or an empty list to collect (image, placement matrix) tiles.
+        """
+        return [] if self.fused else np.full((size, size, img.shape[2]), 114, dtype=np.uint8)
+
+    @staticmethod
+    def _paste(canvas: Union[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]], img: np.ndarray, x: int, y: int):
+        """
+        Place an image with its top-left corner at (x, y) of the mosaic.
+
+        Args:
+            canvas (np.ndarray | List[Tuple[np.ndarray, np.ndarray]]): Mosaic image, or tile list in fused mode.
+            img (np.ndarray): Image region to place.
+            x (int): Left coordinate in the mosaic.
+            y (int): Top coordinate in the mosaic.
+        """
+        if isinstance(canvas, list):  # fused, record the placement for RandomPerspective
+            canvas.append((img, np.array([[1, 0, x], [0, 1, y], [0, 0, 1]], dtype=np.float32)))
+        else:
+            canvas[y : y + img.shape[0], x : x + img.shape[1]] = img
+
+    def _crop(
+        self, labels: Dict[str, Any], canvas: Union[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]
+    ) -> Dict[str, Any]:
+        """
+        Crop a 3x mosaic to the 2x mosaic described by its labels, dropping tile regions outside of it.
+
+        Args:
+            labels (Dict[str, Any]): Concatenated mosaic labels.
+            canvas (np.ndarray | List[Tuple[np.ndarray, np.ndarray]]): 3x mosaic image, or tile list in fused mode.
+
+        Returns:
+            (Dict[str, Any]): Labels with the cropped 'img', or the shifted and cropped 'mosaic_tiles' in fused mode.
+        """
+        b = -self.border[0]  # crop offset, border is (-imgsz // 2, -imgsz // 2)
+        if not isinstance(canvas, list):
+            labels["img"] = canvas[b:-b, b:-b]
+            return labels
+        size, tiles = self.imgsz * 3 - 2 * b, []
+        for img, A in canvas:
+            x, y = int(A[0, 2]) - b, int(A[1, 2]) - b
+            img = img[max(-y, 0) : max(size - y, 0), max(-x, 0) : max(size - x, 0)]
+            if img.size:
+                self._paste(tiles, img, max(x, 0), max(y, 0))
+        labels["mosaic_tiles"] = tiles
+        return labels
 
     @staticmethod
     def _update_labels(labels, padw: int, padh: int) -> Dict[str, Any]:
@@ -1061,9 +1122,12 @@ class RandomPerspective:
         perspective (float): Perspective distortion factor.
         border (Tuple[int, int]): Mosaic border size as (x, y).
         pre_transform (Callable | None): Optional transform to apply before the random perspective.
+        fused (bool): Whether to fold a LetterBox pre_transform into the warp instead of resizing and padding first.
 
     Methods:
+        affine_matrix: Sample the transformation matrix for an image of a given size.
         affine_transform: Apply affine transformations to the input image.
+        warp_tiles: Warp placed image tiles straight into the output image.
         apply_bboxes: Transform bounding boxes using the affine matrix.
         apply_segments: Transform segments and generate new bounding boxes.
         apply_keypoints: Transform keypoints using the affine matrix.
@@ -1088,6 +1152,7 @@ class RandomPerspective:
         perspective: float = 0.0,
         border: Tuple[int, int] = (0, 0),
         pre_transform=None,
+        fused: bool = False,
     ):
         """
         Initialize RandomPerspective object with transformation parameters.
@@ -1104,6 +1169,8 @@ class RandomPerspective:
             border (Tuple[int, int]): Tuple specifying mosaic border (top/bottom, left/right).
             pre_transform (Callable | None): Function/transform to apply to the image before starting the random
                 transformation.
+            fused (bool): If True and pre_transform is a LetterBox, compose its resize and padding with the random
+                transformation so each image is resampled once. Tiles from a fused Mosaic are warped regardless.
 
         Examples:
             >>> transform = RandomPerspective(degrees=10.0, translate=0.1, scale=0.5, shear=5.0)
@@ -1116,35 +1183,33 @@ class RandomPerspective:
         self.perspective = perspective
         self.border = border  # mosaic border
         self.pre_transform = pre_transform
+        self.fused = fused
 
-    def affine_transform(self, img: np.ndarray, border: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray, float]:
+    def affine_matrix(self, h: int, w: int) -> Tuple[np.ndarray, float]:
         """
-        Apply a sequence of affine transformations centered around the image center.
+        Sample a transformation matrix centered around the image center.
 
-        This function performs a series of geometric transformations on the input image, including
-        translation, perspective change, rotation, scaling, and shearing. The transformations are
-        applied in a specific order to maintain consistency.
+        The matrix composes a translation, perspective change, rotation, scaling and shearing, in this order, and
+        maps the image into an output of size `self.size`.
 
         Args:
-            img (np.ndarray): Input image to be transformed.
-            border (Tuple[int, int]): Border dimensions for the transformed image.
+            h (int): Input image height.
+            w (int): Input image width.
 
         Returns:
-            img (np.ndarray): Transformed image.
             M (np.ndarray): 3x3 transformation matrix.
             s (float): Scale factor applied during the transformation.
 
         Examples:
-            >>> import numpy as np
-            >>> img = np.random.rand(100, 100, 3)
-            >>> border = (10, 10)
-            >>> transformed_img, matrix, scale = affine_transform(img, border)
+            >>> transform = RandomPerspective(degrees=10.0)
+            >>> transform.size = (640, 640)
+            >>> M, s = transform.affine_matrix(640, 640)
         """
         # Center
         C = np.eye(3, dtype=np.float32)
 
-        C[0, 2] = -img.shape[1] / 2  # x translation (pixels)
-        C[1, 2] = -img.shape[0] / 2  # y translation (pixels)
+        C[0, 2] = -w / 2  # x translation (pixels)
+        C[1, 2] = -h / 2  # y translation (pixels)
 
         # Perspective
         P = np.eye(3, dtype=np.float32)
@@ -1171,6 +1236,32 @@ class RandomPerspective:
 
         # Combined rotation matrix
         M = T @ S @ R @ P @ C  # order of operations (right to left) is IMPORTANT
+        return M, s
+
+    def affine_transform(self, img: np.ndarray, border: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Apply a sequence of affine transformations centered around the image center.
+
+        This function performs a series of geometric transformations on the input image, including
+        translation, perspective change, rotation, scaling, and shearing. The transformations are
+        applied in a specific order to maintain consistency.
+
+        Args:
+            img (np.ndarray): Input image to be transformed.
+            border (Tuple[int, int]): Border dimensions for the transformed image.
+
+        Returns:
+            img (np.ndarray): Transformed image.
+            M (np.ndarray): 3x3 transformation matrix.
+            s (float): Scale factor applied during the transformation.
+
+        Examples:
+            >>> import numpy as np
+            >>> img = np.random.rand(100, 100, 3)
+            >>> border = (10, 10)
+            >>> transformed_img, matrix, scale = affine_transform(img, border)
+        """
+        M, s = self.affine_matrix(*img.shape[:2])
         # Affine image
         if (border[0] != 0) or (border[1] != 0) or (M != np.eye(3)).any():  # image changed
             if self.perspective:
@@ -1181,6 +1272,47 @@ class RandomPerspective:
                 img = img[..., None]
         return img, M, s
 
+    def warp_tiles(self, tiles: List[Tuple[np.ndarray, np.ndarray]], M: np.ndarray) -> np.ndarray:
+        """
+        Warp image tiles straight into a grey output image, resampling each source pixel once.
+
+        Each tile is warped with M composed with its placement matrix, only into the bounding box of its warped
+        corners, leaving output pixels outside of the tile untouched. Output pixels straddling a tile edge are
+        blended with the output written so far rather than with the neighboring tile.
+
+        Args:
+            tiles (List[Tuple[np.ndarray, np.ndarray]]): Images of shape (H, W, C) and 3x3 matrices placing them
+                into the untransformed image, e.g. a mosaic or a letterboxed image.
+            M (np.ndarray): 3x3 transformation matrix of the untransformed image.
+
+        Returns:
+            (np.ndarray): Transformed image of shape (self.size[1], self.size[0], C).
+
+        Examples:
+            >>> transform = RandomPerspective()
+            >>> transform.size = (640, 640)
+            >>> M, _ = transform.affine_matrix(1280, 1280)
+            >>> img = transform.warp_tiles([(np.zeros((640, 640, 3), dtype=np.uint8), np.eye(3))], M)
+        """
+        w, h = self.size
+        out = np.full((h, w, tiles[0][0].shape[2]), 114, dtype=np.uint8)
+        for img, A in tiles:
+            Mt = M @ A
+            th, tw = img.shape[:2]
+            xy = Mt @ np.array([[-1, tw, tw, -1], [-1, -1, th, th], [1, 1, 1, 1]], dtype=np.float32)
+            xy = xy[:2] / xy[2]  # pixels straddling the tile edges included
+            x1, y1 = np.floor(xy.min(1)).clip(0, (w, h)).astype(int)
+            x2, y2 = np.ceil(xy.max(1) + 1).clip(0, (w, h)).astype(int)
+            if x2 <= x1 or y2 <= y1:  # tile outside of the output
+                continue
+            Mt = np.array([[1, 0, -x1], [0, 1, -y1], [0, 0, 1]], dtype=np.float32) @ Mt  # into output region
+            dst = out[y1:y2, x1:x2] if out.shape[2] > 1 else out[y1:y2, x1:x2, 0]
+            if self.perspective:
+                cv2.warpPerspective(img, Mt, (x2 - x1, y2 - y1), dst=dst, borderMode=cv2.BORDER_TRANSPARENT)
+            else:
+                cv2.warpAffine(img, Mt[:2], (x2 - x1, y2 - y1), dst=dst, borderMode=cv2.BORDER_TRANSPARENT)
+        return out
+
     def apply_bboxes(self, bboxes: np.ndarray, M: np.ndarray) -> np.ndarray:
         """
         Apply affine transformation to bounding boxes.
@@ -1246,7 +1378,24 @@ class RandomPerspective:
         xy = xy @ M.T  # transform
         xy = xy[:, :2] / xy[:, 2:3]
         segments = xy.reshape(n, -1, 2)
-        bboxes = np.stack([segment2box(xy, self.size[0], self.size[1]) for xy in segments], 0)
+        # segment2box() of all segments at once, boxing the points inside the image
+        x, y = segments[..., 0], segments[..., 1]
+        w, h = self.size
+        outside = (x.min(1) < 0).astype(int) + (y.min(1) < 0) + (x.max(1) > w) + (y.max(1) > h)
+        clip = outside >= 3  # clip coordinates if 3 out of 4 sides are outside the image
+        if clip.any():
+            segments[clip] = segments[clip].clip(0, (w, h))
+        inside = (x >= 0) & (y >= 0) & (x <= w) & (y <= h)
+        bboxes = np.stack(
+            (
+                x.min(1, initial=np.inf, where=inside),
+                y.min(1, initial=np.inf, where=inside),
+                x.max(1, initial=-np.inf, where=inside),
+                y.max(1, initial=-np.inf, where=inside),
+            ),
+            1,
+        ).astype(segments.dtype)
+        bboxes[~(inside & (x != 0)).any(1)] = 0.0
         segments[..., 0] = segments[..., 0].clip(bboxes[:, 0:1], bboxes[:, 2:3])
         segments[..., 1] = segments[..., 1].clip(bboxes[:, 1:2], bboxes[:, 3:4])
         return bboxes, segments
@@ -1320,22 +1469,30 @@ class RandomPerspective:
             >>> result = transform(labels)
             >>> assert result["img"].shape[:2] == result["resized_shape"]
         """
+        tiles = labels.pop("mosaic_tiles", None)  # from a fused Mosaic
         if self.pre_transform and "mosaic_border" not in labels:
-            labels = self.pre_transform(labels)
+            if self.fused and isinstance(self.pre_transform, LetterBox):
+                labels, tiles = self._letterbox_tile(labels)
+            else:
+                labels = self.pre_transform(labels)
         labels.pop("ratio_pad", None)  # do not need ratio pad
 
-        img = labels["img"]
         cls = labels["cls"]
         instances = labels.pop("instances")
+        h, w = labels["img"].shape[:2] if tiles is None else labels["resized_shape"]
         # Make sure the coord formats are right
         instances.convert_bbox(format="xyxy")
-        instances.denormalize(*img.shape[:2][::-1])
+        instances.denormalize(w, h)
 
         border = labels.pop("mosaic_border", self.border)
-        self.size = img.shape[1] + border[1] * 2, img.shape[0] + border[0] * 2  # w, h
+        self.size = w + border[1] * 2, h + border[0] * 2  # w, h
         # M is affine matrix
         # Scale for func:`box_candidates`
-        img, M, scale = self.affine_transform(img, border)
+        if tiles is None:
+            img, M, scale = self.affine_transform(labels["img"], border)
+        else:
+            M, scale = self.affine_matrix(h, w)
+            img = self.warp_tiles(tiles, M)
 
         bboxes = self.apply_bboxes(instances.bboxes, M)
 
@@ -1343,11 +1500,22 @@ class RandomPerspective:
         keypoints = instances.keypoints
         # Update bboxes if there are segments.
         if len(segments):
-            bboxes, segments = self.apply_segments(segments, M)
+            # Resample segments whose boxes get within a pixel of the border, their clipped points must follow it
+            outside = (bboxes[:, :2] < 1).any(1) | (bboxes[:, 2:] > np.array(self.size) - 1).any(1)
+            instances.resample_segments(outside)
+            bboxes, segments = self.apply_segments(instances.segments, M)
 
         if keypoints is not None:
             keypoints = self.apply_keypoints(keypoints, M)
-        new_instances = Instances(bboxes, segments, keypoints, bbox_format="xyxy", normalized=False)
+        new_instances = Instances(
+            bboxes,
+            segments,
+            keypoints,
+            bbox_format="xyxy",
+            normalized=False,
+            segment_lengths=instances.segment_lengths,
+            segment_resamples=instances.segment_resamples,
+        )
         # Clip
         new_instances.clip(*self.size)
 
@@ -1363,6 +1531,26 @@ class RandomPerspective:
         labels["resized_shape"] = img.shape[:2]
         return labels
 
+    def _letterbox_tile(self, labels: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Update labels for the LetterBox pre_transform and return the image as a tile placed by its resize and padding.
+
+        Args:
+            labels (Dict[str, Any]): Labels with the loaded 'img'.
+
+        Returns:
+            labels (Dict[str, Any]): Labels with letterboxed instances and 'resized_shape'.
+            tiles (List[Tuple[np.ndarray, np.ndarray]]): The image and the matrix placing it in the letterboxed image.
+        """
+        img = labels["img"]
+        new_shape = labels.pop("rect_shape", self.pre_transform.new_shape)
+        new_unpad, ratio, (top, bottom, left, right) = self.pre_transform._geometry(img.shape[:2], new_shape)
+        labels = self.pre_transform._update_labels(labels, ratio, left, top)
+        rx, ry = new_unpad[0] / img.shape[1], new_unpad[1] / img.shape[0]  # resize ratios of pixel centers
+        A = np.array([[rx, 0, left + rx / 2 - 0.5], [0, ry, top + ry / 2 - 0.5], [0, 0, 1]], dtype=np.float32)
+        labels["resized_shape"] = (new_unpad[1] + top + bottom, new_unpad[0] + left + right)
+        return labels, [(img if img.ndim == 3 else img[..., None], A)]
+
     @staticmethod
     def box_candidates(
         box1: np.ndarray,
@@ -1681,6 +1869,47 @@ class LetterBox:
         img = labels.get("img") if image is None else image
         shape = img.shape[:2]  # current shape [height, width]
         new_shape = labels.pop("rect_shape", self.new_shape)
+        new_unpad, ratio, (top, bottom, left, right) = self._geometry(shape, new_shape)
+
+        if shape[::-1] != new_unpad:  # resize
+            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
+            if img.ndim == 2:
+                img = img[..., None]
+
+        h, w, c = img.shape
+        if c == 3:
+            img = cv2.copyMakeBorder(img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+        else:  # multispectral
+            pad_img = np.full((h + top + bottom, w + left + right, c), fill_value=114, dtype=img.dtype)
+            pad_img[top : top + h, left : left + w] = img
+            img = pad_img
+
+        if labels.get("ratio_pad"):
+            labels["ratio_pad"] = (labels["ratio_pad"], (left, top))  # for evaluation
+
+        if len(labels):
+            labels = self._update_labels(labels, ratio, left, top)
+            labels["img"] = img
+            labels["resized_shape"] = new_shape
+            return labels
+        else:
+            return img
+
+    def _geometry(
+        self, shape: Tuple[int, int], new_shape: Union[int, Tuple[int, int]]
+    ) -> Tuple[Tuple[int, int], Tuple[float, float], Tuple[int, int, int, int]]:
+        """
+        Compute the resize and padding applied to an image of a given shape.
+
+        Args:
+            shape (Tuple[int, int]): Source image shape (height, width).
+            new_shape (int | Tuple[int, int]): Target shape (height, width).
+
+        Returns:
+            new_unpad (Tuple[int, int]): Resized image size (width, height) before padding.
+            ratio (Tuple[float, float]): Scaling ratios (width, height).
+            pad (Tuple[int, int, int, int]): Padding (top, bottom, left, right) in pixels.
+        """
         if isinstance(new_shape, int):
             new_shape = (new_shape, new_shape)
 
@@ -1704,31 +1933,46 @@ class LetterBox:
             dw /= 2  # divide padding into 2 sides
             dh /= 2
 
-        if shape[::-1] != new_unpad:  # resize
-            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
-            if img.ndim == 2:
-                img = img[..., None]
-
         top, bottom = int(round(dh - 0.1)) if self.center else 0, int(round(dh + 0.1))
         left, right = int(round(dw - 0.1)) if self.center else 0, int(round(dw + 0.1))
-        h, w, c = img.shape
-        if c == 3:
-            img = cv2.copyMakeBorder(img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
-        else:  # multispectral
-            pad_img = np.full((h + top + bottom, w + left + right, c), fill_value=114, dtype=img.dtype)
-            pad_img[top : top + h, left : left + w] = img
-            img = pad_img
+        return new_unpad, ratio, (top, bottom, left, right)
 
-        if labels.get("ratio_pad"):
-            labels["ratio_pad"] = (labels["ratio_pad"], (left, top))  # for evaluation
+    def batch(self, images: List[np.ndarray], out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Letterbox a batch of images into a single (N, H, W, C) array.
 
-        if len(labels):
-            labels = self._update_labels(labels, ratio, left, top)
-            labels["img"] = img
-            labels["resized_shape"] = new_shape
-            return labels
-        else:
-            return img
+        Each image is resized straight into its slot of the output array and only the padding borders are filled, so
+        the batch is assembled with one write per pixel instead of a resize, a padded copy and a stack.
+
+        Args:
+            images (List[np.ndarray]): Images of shape (H, W, C) with a common channel count and dtype.
+            out (np.ndarray, optional): Preallocated output array, used if its shape and dtype match the batch.
+
+        Returns:
+            (np.ndarray | None): Letterboxed batch of shape (N, H, W, C), or None if the images do not letterbox to a
+                common shape.
+
+        Examples:
+            >>> letterbox = LetterBox(new_shape=(640, 640))
+            >>> batch = letterbox.batch([np.zeros((480, 640, 3), dtype=np.uint8)] * 4)
+            >>> batch.shape
+            (4, 640, 640, 3)
+        """
+        geometry = [self._geometry(im.shape[:2], self.new_shape) for im in images]
+        shapes = {(u[1] + top + bottom, u[0] + left + right) for u, _, (top, bottom, left, right) in geometry}
+        if len(shapes) != 1 or len({(im.shape[2], im.dtype) for im in images}) != 1:
+            return None
+        shape = (len(images), *shapes.pop(), images[0].shape[2])
+        if out is None or out.shape != shape or out.dtype != images[0].dtype:
+            out = np.empty(shape, dtype=images[0].dtype)
+        for im, dst, ((w, h), _, (top, bottom, left, right)) in zip(images, out, geometry):
+            dst[:top] = dst[top + h :] = 114  # pad borders only, the image region is written by the resize
+            dst[top : top + h, :left] = dst[top : top + h, left + w :] = 114
+            if im.shape[:2] == (h, w):
+                dst[top : top + h, left : left + w] = im
+            else:
+                cv2.resize(im, (w, h), dst=dst[top : top + h, left : left + w], interpolation=cv2.INTER_LINEAR)
+        return out
 
     @staticmethod
     def _update_labels(labels: Dict[str, Any], ratio: Tuple[float, float], padw: float, padh: float) -> Dict[str, Any]:
@@ -2515,6 +2759,295 @@ class RandomLoadText:
         return labels
 
 
+class BatchAugment:
+    """
+    Apply random perspective, HSV and flip augmentations to whole collated batches with batched tensor operations.
+
+    This class is an alternative backend for the RandomPerspective, RandomHSV and RandomFlip stages of `v8_transforms`.
+    It runs on the training device after `collate_fn`, so dataloader workers only load, mosaic and mix images. Every
+    image gets its own random perspective matrix with the flips folded in, which warps the image and its instance
+    masks with a single `grid_sample` call and maps boxes, oriented boxes and keypoints. Instances are then filtered
+    with the same candidate rules as RandomPerspective, keeping classes, batch indices, keypoints and overlap mask
+    indices consistent.
+
+    Attributes:
+        degrees (float): Maximum absolute degree range for random rotations.
+        translate (float): Maximum translation as a fraction of the image size.
+        scale (float): Scaling factor range, e.g., scale=0.1 means 0.9-1.1.
+        shear (float): Maximum shear angle in degrees.
+        perspective (float): Perspective distortion factor.
+        hgain (float): Maximum variation for hue.
+        sgain (float): Maximum variation for saturation.
+        vgain (float): Maximum variation for value.
+        flipud (float): Probability of flipping an image vertically.
+        fliplr (float): Probability of flipping an image horizontally.
+        flip_idx (List[int] | None): Index mapping for flipping keypoints.
+        mask_ratio (int): Downsample ratio of the instance masks relative to the images.
+        mask_overlap (bool): Whether each image's masks are stored as a single overlap mask of instance indices.
+
+    Methods:
+        affine_matrices: Sample per-image perspective matrices including flips.
+        warp: Warp a batch of images or masks with per-image perspective matrices.
+        apply_points: Transform points with per-point perspective matrices.
+        apply_hsv: Randomly adjust the hue, saturation and value of a batch of RGB images.
+        __call__: Augment a collated batch and update its labels.
+
+    Examples:
+        >>> augment = BatchAugment(degrees=10.0, translate=0.1, scale=0.5, fliplr=0.5)
+        >>> batch = YOLODataset.collate_fn([dataset[0], dataset[1]])
+        >>> batch["img"] = batch["img"].float()
+        >>> batch = augment(batch)
+    """
+
+    def __init__(
+        self,
+        degrees: float = 0.0,
+        translate: float = 0.1,
+        scale: float = 0.5,
+        shear: float = 0.0,
+        perspective: float = 0.0,
+        hgain: float = 0.5,
+        sgain: float = 0.5,
+        vgain: float = 0.5,
+        flipud: float = 0.0,
+        fliplr: float = 0.5,
+        flip_idx: Optional[List[int]] = None,
+        mask_ratio: int = 4,
+        mask_overlap: bool = True,
+    ):
+        """
+        Initialize the BatchAugment object with the RandomPerspective, RandomHSV and RandomFlip parameters.
+
+        Args:
+            degrees (float): Degree range for random rotations.
+            translate (float): Fraction of total width and height for random translation.
+            scale (float): Scaling factor interval, e.g., a scale factor of 0.5 allows a resize between 50%-150%.
+            shear (float): Shear intensity (angle in degrees).
+            perspective (float): Perspective distortion factor.
+            hgain (float): Maximum variation for hue. Should be in the range [0, 1].
+            sgain (float): Maximum variation for saturation. Should be in the range [0, 1].
+            vgain (float): Maximum variation for value. Should be in the range [0, 1].
+            flipud (float): Probability of flipping an image vertically.
+            fliplr (float): Probability of flipping an image horizontally.
+            flip_idx (List[int] | None): Index mapping for flipping keypoints, if any.
+            mask_ratio (int): Downsample ratio of the instance masks relative to the images.
+            mask_overlap (bool): Whether masks are overlap masks holding 1-based instance indices per image.
+
+        Examples:
+            >>> augment = BatchAugment(degrees=10.0, translate=0.2, scale=0.9, flip_idx=[1, 0, 3, 2])
+        """
+        self.degrees = degrees
+        self.translate = translate
+        self.scale = scale
+        self.shear = shear
+        self.perspective = perspective
+        self.hgain = hgain
+        self.sgain = sgain
+        self.vgain = vgain
+        self.flipud = flipud
+        self.fliplr = fliplr
+        self.flip_idx = flip_idx
+        self.mask_ratio = mask_ratio
+        self.mask_overlap = mask_overlap
+
+    def affine_matrices(self, n: int, h: int, w: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Sample a perspective matrix per image, composed as in RandomPerspective.affine_transform followed by flips.
+
+        Args:
+            n (int): Number of images.
+            h (int): Image height in pixels.
+            w (int): Image width in pixels.
+
+        Returns:
+            M (torch.Tensor): Transformation matrices with shape (n, 3, 3) mapping input to output pixel coordinates.
+            s (torch.Tensor): Scale factor of each image with shape (n,).
+            swap (torch.Tensor): Boolean tensor of shape (n,), True where an odd number of flips swaps keypoint sides.
+
+        Examples:
+            >>> M, s, swap = BatchAugment(degrees=10.0).affine_matrices(4, 640, 640)
+        """
+
+        def uniform(low, high):
+            return torch.empty(n, dtype=torch.float64).uniform_(low, high)
+
+        eye = torch.eye(3, dtype=torch.float64).repeat(n, 1, 1)
+        C, P, R, S, T, Fl = (eye.clone() for _ in range(6))
+        C[:, 0, 2], C[:, 1, 2] = -w / 2, -h / 2  # center
+        P[:, 2, 0] = uniform(-self.perspective, self.perspective)  # x perspective (about y)
+        P[:, 2, 1] = uniform(-self.perspective, self.perspective)  # y perspective (about x)
+        a = uniform(-self.degrees, self.degrees) * math.pi / 180
+        s = uniform(1 - self.scale, 1 + self.scale)
+        R[:, 0, 0], R[:, 0, 1] = s * a.cos(), s * a.sin()  # same as cv2.getRotationMatrix2D(a, (0, 0), s)
+        R[:, 1, 0], R[:, 1, 1] = -s * a.sin(), s * a.cos()
+        S[:, 0, 1] = (uniform(-self.shear, self.shear) * math.pi / 180).tan()  # x shear
+        S[:, 1, 0] = (uniform(-self.shear, self.shear) * math.pi / 180).tan()  # y shear
+        T[:, 0, 2] = uniform(0.5 - self.translate, 0.5 + self.translate) * w
+        T[:, 1, 2] = uniform(0.5 - self.translate, 0.5 + self.translate) * h
+        ud, lr = torch.rand(n) < self.flipud, torch.rand(n) < self.fliplr
+        Fl[ud, 1, 1], Fl[ud, 1, 2] = -1, h
+        Fl[lr, 0, 0], Fl[lr, 0, 2] = -1, w
+        M = Fl @ T @ S @ R @ P @ C  # order of operations (right to left) is IMPORTANT
+        return M.float(), s.float(), ud ^ lr
+
+    @staticmethod
+    def warp(x: torch.Tensor, M: torch.Tensor, mode: str = "bilinear", fill: float = 0.0) -> torch.Tensor:
+        """
+        Warp each image of a batch with its own perspective matrix, keeping the image size.
+
+        Pixel centers lie at half-integer coordinates, so flips and integer translations resample exactly.
+
+        Args:
+            x (torch.Tensor): Float images or masks with shape (N, C, H, W).
+            M (torch.Tensor): Matrices with shape (N, 3, 3) mapping input to output pixel coordinates of `x`.
+            mode (str): Interpolation mode passed to `grid_sample`, 'bilinear' for images and 'nearest' for masks.
+            fill (float): Value of output pixels that map outside the input.
+
+        Returns:
+            (torch.Tensor): Warped tensor with the same shape as `x`.
+        """
+        n, _, h, w = x.shape
+        Minv = torch.linalg.inv(M.double()).to(x.device, torch.float32)
+        ys, xs = torch.meshgrid(
+            torch.arange(h, device=x.device) + 0.5, torch.arange(w, device=x.device) + 0.5, indexing="ij"
+        )
+        xy = torch.stack((xs, ys, torch.ones_like(xs)), -1).view(1, h * w, 3) @ Minv.transpose(1, 2)
+        grid = (xy[..., :2] / xy[..., 2:]) / xy.new_tensor([w, h]) * 2 - 1
+        out = F.grid_sample(x - fill, grid.view(n, h, w, 2), mode=mode, padding_mode="zeros", align_corners=False)
+        return out + fill
+
+    @staticmethod
+    def apply_points(xy: torch.Tensor, M: torch.Tensor) -> torch.Tensor:
+        """
+        Transform points in pixel coordinates with per-row perspective matrices.
+
+        Args:
+            xy (torch.Tensor): Points with shape (N, P, 2).
+            M (torch.Tensor): Matrices with shape (N, 3, 3), one for each row of points.
+
+        Returns:
+            (torch.Tensor): Transformed points with shape (N, P, 2).
+        """
+        xy = torch.cat((xy, xy.new_ones(*xy.shape[:-1], 1)), -1) @ M.transpose(1, 2)
+        return xy[..., :2] / xy[..., 2:]
+
+    def apply_hsv(self, img: torch.Tensor) -> torch.Tensor:
+        """
+        Randomly adjust the hue, saturation and value of each image with gains drawn as in RandomHSV.
+
+        Args:
+            img (torch.Tensor): RGB images with shape (N, 3, H, W) and values in [0, 255].
+
+        Returns:
+            (torch.Tensor): Adjusted images with the same shape and range.
+        """
+        r = (torch.rand(len(img), 3) * 2 - 1) * torch.tensor([self.hgain, self.sgain, self.vgain])  # random gains
+        r = r.to(img.device, img.dtype)[..., None, None]
+        x = img / 255
+        val, argmax = x.max(1)
+        delta = val - x.min(1).values
+        dc = delta.clamp(min=1e-8)
+        red, green, blue = x.unbind(1)
+        hue = torch.where(
+            argmax == 0,
+            ((green - blue) / dc) % 6,
+            torch.where(argmax == 1, (blue - red) / dc + 2, (red - green) / dc + 4),
+        )
+        hue = (hue / 6 + r[:, 0]) % 1
+        sat = (delta / val.clamp(min=1e-8) * (r[:, 1] + 1)).clamp(0, 1)
+        val = (val * (r[:, 2] + 1)).clamp(0, 1)
+        k = (hue[:, None] * 6 + img.new_tensor([5, 3, 1]).view(1, 3, 1, 1)) % 6
+        rgb = val[:, None] * (1 - sat[:, None] * torch.minimum(k, 4 - k).clamp(0, 1))
+        return rgb * 255
+
+    def __call__(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Augment a collated batch and update its boxes, classes, keypoints and masks accordingly.
+
+        Args:
+            batch (Dict[str, Any]): Batch from `collate_fn` with 'img' as float tensor in [0, 255] and shape
+                (N, C, H, W), normalized 'bboxes' in xywh or xywhr format, 'cls' and 'batch_idx', and optionally
+                normalized 'keypoints' and 'masks'.
+
+        Returns:
+            (Dict[str, Any]): The batch with augmented images and labels. Masks are moved to the image device.
+
+        Examples:
+            >>> batch = YOLODataset.collate_fn([dataset[0], dataset[1]])
+            >>> batch["img"] = batch["img"].float()
+            >>> batch = BatchAugment(degrees=10.0)(batch)
+        """
+        img = batch["img"]
+        n, c, h, w = img.shape
+        M, s, swap = self.affine_matrices(n, h, w)
+        img = self.warp(img, M, fill=114.0)
+        if c == 3 and (self.hgain or self.sgain or self.vgain):
+            img = self.apply_hsv(img)
+        batch["img"] = img
+
+        i = batch["batch_idx"].long()
+        Mi = M[i]
+        bboxes = batch["bboxes"]
+        obb = bboxes.shape[-1] == 5
+        keep = torch.zeros(len(i), dtype=torch.bool)
+        if len(i):
+            size = bboxes.new_tensor([w, h, w, h])
+            if obb:
+                corners = xywhr2xyxyxyxy(torch.cat((bboxes[:, :4] * size, bboxes[:, 4:]), -1))
+            else:
+                corners = xywh2xyxy(bboxes * size)[:, [0, 1, 2, 3, 0, 3, 2, 1]].view(-1, 4, 2)
+            before = torch.cat((corners.amin(1), corners.amax(1)), -1) * s[i, None]  # same scale as after
+            corners = self.apply_points(corners, Mi)
+            corners[..., 0], corners[..., 1] = corners[..., 0].clamp(0, w), corners[..., 1].clamp(0, h)
+            after = torch.cat((corners.amin(1), corners.amax(1)), -1)
+            keep = torch.from_numpy(
+                RandomPerspective.box_candidates(
+                    box1=before.T.numpy(),
+                    box2=after.T.numpy(),
+                    area_thr=0.01 if obb or "masks" in batch else 0.10,
+                )
+            )
+            if obb:
+                new = xyxyxyxy2xywhr(corners[keep].reshape(-1, 8)).reshape(-1, 5)
+                batch["bboxes"] = torch.cat((new[:, :4] / size, new[:, 4:]), -1)
+            else:
+                batch["bboxes"] = xyxy2xywh(after[keep]) / size
+
+        if "keypoints" in batch and len(i):
+            kpts = batch["keypoints"].clone()
+            xy = self.apply_points(kpts[..., :2] * kpts.new_tensor([w, h]), Mi)
+            if kpts.shape[-1] == 3:  # set out of bounds visibility to zero
+                kpts[..., 2][(xy[..., 0] < 0) | (xy[..., 0] > w) | (xy[..., 1] < 0) | (xy[..., 1] > h)] = 0.0
+            kpts[..., 0], kpts[..., 1] = xy[..., 0].clamp(0, w) / w, xy[..., 1].clamp(0, h) / h
+            if self.flip_idx is not None:
+                kpts[swap[i]] = kpts[swap[i]][:, self.flip_idx]
+            batch["keypoints"] = kpts[keep]
+
+        if "masks" in batch:
+            masks = batch["masks"].to(img.device)
+            r = torch.tensor([self.mask_ratio, self.mask_ratio, 1.0])
+            Mm = M / r[:, None] * r  # same transform in mask pixel coordinates
+            if self.mask_overlap:
+                warped = self.warp(masks[:, None].float(), Mm, mode="nearest")[:, 0].round().long()
+                # Renumber the 1-based instance indices of each overlap mask after dropping filtered instances
+                counts = torch.bincount(i, minlength=n)
+                local = torch.arange(len(i)) - (counts.cumsum(0) - counts)[i]
+                kept = keep.long().cumsum(0)
+                new = kept - (kept - keep.long())[(counts.cumsum(0) - counts)[i]]
+                lut = torch.zeros(n, int(counts.max()) + 1 if len(i) else 1, dtype=torch.long)
+                lut[i, local + 1] = torch.where(keep, new, 0)
+                lut = lut.to(img.device)
+                masks = lut.view(-1)[warped + torch.arange(n, device=img.device).view(-1, 1, 1) * lut.shape[1]]
+                batch["masks"] = masks.to(batch["masks"].dtype)
+            elif len(masks):
+                warped = self.warp(masks[:, None].float(), Mm[i], mode="nearest")[:, 0]
+                batch["masks"] = warped[keep.to(img.device)].to(masks.dtype)
+
+        batch["cls"] = batch["cls"][keep]
+        batch["batch_idx"] = batch["batch_idx"][keep]
+        return batch
+
+
 def v8_transforms(dataset, imgsz: int, hyp: IterableSimpleNamespace, stretch: bool = False):
     """
     Apply a series of image transformations for training.
@@ -2539,15 +3072,19 @@ def v8_transforms(dataset, imgsz: int, hyp: IterableSimpleNamespace, stretch: bo
         >>> transforms = v8_transforms(dataset, imgsz=640, hyp=hyp)
         >>> augmented_data = transforms(dataset[0])
     """
-    mosaic = Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic)
+    # Fused warping needs RandomPerspective right after Mosaic, flip CopyPaste pastes onto the mosaic image between them
+    fused = getattr(hyp, "fused_augment", False) and not (hyp.copy_paste and hyp.copy_paste_mode == "flip")
+    mosaic = Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic, fused=fused)
+    batch_augment = getattr(hyp, "batch_augment", False)  # perspective, HSV and flips applied by BatchAugment
     affine = RandomPerspective(
-        degrees=hyp.degrees,
-        translate=hyp.translate,
-        scale=hyp.scale,
-        shear=hyp.shear,
-        perspective=hyp.perspective,
+        degrees=0.0 if batch_augment else hyp.degrees,
+        translate=0.0 if batch_augment else hyp.translate,
+        scale=0.0 if batch_augment else hyp.scale,
+        shear=0.0 if batch_augment else hyp.shear,
+        perspective=0.0 if batch_augment else hyp.perspective,
         pre_transform=None if stretch else LetterBox(new_shape=(imgsz, imgsz)),
-    )
+        fused=fused,
+    )  # only crops mosaic borders and letterboxes when batch_augment
 
     pre_transform = Compose([mosaic, affine])
     if hyp.copy_paste_mode == "flip":
@@ -2556,7 +3093,7 @@ def v8_transforms(dataset, imgsz: int, hyp: IterableSimpleNamespace, stretch: bo
         pre_transform.append(
             CopyPaste(
                 dataset,
-                pre_transform=Compose([Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic), affine]),
+                pre_transform=Compose([Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic, fused=fused), affine]),
                 p=hyp.copy_paste,
                 mode=hyp.copy_paste_mode,
             )
@@ -2570,17 +3107,53 @@ def v8_transforms(dataset, imgsz: int, hyp: IterableSimpleNamespace, stretch: bo
         elif flip_idx and (len(flip_idx) != kpt_shape[0]):
             raise ValueError(f"data.yaml flip_idx={flip_idx} length must be equal to kpt_shape[0]={kpt_shape[0]}")
 
-    return Compose(
+    transforms = Compose(
         [
             pre_transform,
             MixUp(dataset, pre_transform=pre_transform, p=hyp.mixup),
             CutMix(dataset, pre_transform=pre_transform, p=hyp.cutmix),
             Albumentations(p=1.0),
-            RandomHSV(hgain=hyp.hsv_h, sgain=hyp.hsv_s, vgain=hyp.hsv_v),
-            RandomFlip(direction="vertical", p=hyp.flipud, flip_idx=flip_idx),
-            RandomFlip(direction="horizontal", p=hyp.fliplr, flip_idx=flip_idx),
         ]
-    )  # transforms
+    )
+    if not batch_augment:
+        transforms.append(RandomHSV(hgain=hyp.hsv_h, sgain=hyp.hsv_s, vgain=hyp.hsv_v))
+        transforms.append(RandomFlip(direction="vertical", p=hyp.flipud, flip_idx=flip_idx))
+        transforms.append(RandomFlip(direction="horizontal", p=hyp.fliplr, flip_idx=flip_idx))
+    return transforms
+
+
+def v8_batch_transforms(dataset, hyp: IterableSimpleNamespace) -> BatchAugment:
+    """
+    Build the batched augmentation stage that replaces the per-sample perspective, HSV and flip transforms.
+
+    Call after `v8_transforms`, which disables flips for keypoint datasets without a 'flip_idx'.
+
+    Args:
+        dataset (Dataset): The dataset object containing image data and annotations.
+        hyp (IterableSimpleNamespace): Hyperparameters controlling the transformations.
+
+    Returns:
+        (BatchAugment): Transform applied to whole collated training batches.
+
+    Examples:
+        >>> transforms = v8_transforms(dataset, imgsz=640, hyp=hyp)
+        >>> batch_transforms = v8_batch_transforms(dataset, hyp)
+    """
+    return BatchAugment(
+        degrees=hyp.degrees,
+        translate=hyp.translate,
+        scale=hyp.scale,
+        shear=hyp.shear,
+        perspective=hyp.perspective,
+        hgain=hyp.hsv_h,
+        sgain=hyp.hsv_s,
+        vgain=hyp.hsv_v,
+        flipud=hyp.flipud,
+        fliplr=hyp.fliplr,
+        flip_idx=dataset.data.get("flip_idx") or None,
+        mask_ratio=hyp.mask_ratio,
+        mask_overlap=hyp.overlap_mask,
+    )
 
 
 # Classification augmentations -----------------------------------------------------------------------------------------
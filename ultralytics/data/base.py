@@ -13,10 +13,22 @@ import cv2
 import numpy as np
 from torch.utils.data import Dataset
 
-from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS, check_file_speeds
+from ultralytics.data.utils import (
+    FORMATS_HELP_MSG,
+    HELP_URL,
+    IMG_FORMATS,
+    LabelStore,
+    check_file_speeds,
+    get_hash,
+    load_dataset_cache_file,
+    save_dataset_cache_file,
+)
 from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
 from ultralytics.utils.patches import imread
 
+MMAP_CACHE_VERSION = "1.0.0"  # packed *.mmap image cache version
+RECT_BUCKET_BATCHES = 4  # batches per aspect-ratio bucket in rect training, shuffled batches are drawn from a bucket
+
 
 class BaseDataset(Dataset):
     """
@@ -47,10 +59,12 @@ class BaseDataset(Dataset):
         im_hw0 (list): List of original image dimensions (h, w).
         im_hw (list): List of resized image dimensions (h, w).
         npy_files (List[Path]): List of numpy file paths.
-        cache (str): Cache images to RAM or disk during training.
+        mmap_file (Path | None): Path to the packed memory-mapped image cache used by cache='mmap'.
+        cache (str): Cache images to RAM, disk or a packed memory-mapped file during training.
         transforms (callable): Image transformation function.
-        batch_shapes (np.ndarray): Batch shapes for rectangular training.
-        batch (np.ndarray): Batch index of each image.
+        batch_transforms (callable | None): Transformation applied by the trainer to whole collated batches.
+        batch_shapes (np.ndarray): Shapes of the aspect-ratio buckets for rectangular training.
+        batch (np.ndarray): Aspect-ratio bucket index of each image.
 
     Methods:
         get_img_files: Read image files from the specified path.
@@ -58,9 +72,10 @@ class BaseDataset(Dataset):
         load_image: Load an image from the dataset.
         cache_images: Cache images to memory or disk.
         cache_images_to_disk: Save an image as an *.npy file for faster loading.
+        cache_images_to_mmap: Pack all resized images into a single memory-mapped file.
         check_cache_disk: Check image caching requirements vs available disk space.
         check_cache_ram: Check image caching requirements vs available memory.
-        set_rectangle: Set the shape of bounding boxes as rectangles.
+        set_rectangle: Group images into aspect-ratio buckets with rectangular shapes.
         get_image_and_label: Get and return label information from the dataset.
         update_labels_info: Custom label format method to be implemented by subclasses.
         build_transforms: Build transformation pipeline to be implemented by subclasses.
@@ -90,7 +105,7 @@ class BaseDataset(Dataset):
         Args:
             img_path (str | List[str]): Path to the folder containing images or list of image paths.
             imgsz (int): Image size for resizing.
-            cache (bool | str): Cache images to RAM or disk during training.
+            cache (bool | str): Cache images to RAM, disk or a packed memory-mapped file ('mmap') during training.
             augment (bool): If True, data augmentation is applied.
             hyp (Dict[str, Any]): Hyperparameters to apply data augmentation.
             prefix (str): Prefix to print in log messages.
@@ -122,15 +137,17 @@ class BaseDataset(Dataset):
         self.pad = pad
         if self.rect:
             assert self.batch_size is not None
-            self.set_rectangle()
+            self.set_rectangle(self.batch_size * RECT_BUCKET_BATCHES if augment else self.batch_size)
 
         # Buffer thread for mosaic images
         self.buffer = []  # buffer size = batch size
         self.max_buffer_length = min((self.ni, self.batch_size * 8, 1000)) if self.augment else 0
 
-        # Cache images (options are cache = True, False, None, "ram", "disk")
+        # Cache images (options are cache = True, False, None, "ram", "disk", "mmap")
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
         self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
+        self.mmap_file = None  # named after a hash of the images and image size by cache_images_to_mmap
+        self.mmap, self.mmap_index = None, None  # packed image buffer (opened lazily per worker) and its index
         self.cache = cache.lower() if isinstance(cache, str) else "ram" if cache is True else None
         if self.cache == "ram" and self.check_cache_ram():
             if hyp.deterministic:
@@ -141,8 +158,11 @@ class BaseDataset(Dataset):
             self.cache_images()
         elif self.cache == "disk" and self.check_cache_disk():
             self.cache_images()
+        elif self.cache == "mmap":
+            self.cache_images_to_mmap()
 
         # Transforms
+        self.batch_transforms = None  # applied to whole collated batches by the trainer, set by build_transforms
         self.transforms = self.build_transforms(hyp=hyp) # 加载数据预处理、数据增广等操作
 
     def get_img_files(self, img_path: Union[str, List[str]]) -> List[str]:
@@ -190,6 +210,8 @@ class BaseDataset(Dataset):
         Args:
             include_class (List[int], optional): List of classes to include. If None, all classes are included.
         """
+        if isinstance(self.labels, LabelStore):  # columnar labels are filtered on access
+            return self.labels.update_labels(include_class, self.single_cls)
         include_class_array = np.array(include_class).reshape(1, -1)
         for i in range(len(self.labels)):
             if include_class is not None:
@@ -223,6 +245,12 @@ class BaseDataset(Dataset):
         Raises:
             FileNotFoundError: If the image file is not found.
         """
+        if self.mmap_index is not None and rect_mode:  # packed memory-mapped cache, zero-copy view
+            if self.mmap is None:
+                self.mmap = np.memmap(self.mmap_file, dtype=np.uint8, mode="c")  # copy-on-write, never modifies file
+            offset, h, w, c, h0, w0 = self.mmap_index[i].tolist()
+            return self.mmap[offset : offset + h * w * c].reshape(h, w, c), (h0, w0), (h, w)
+
         im, f, fn = self.ims[i], self.im_files[i], self.npy_files[i]
         if im is None:  # not cached in RAM
             if fn.exists():  # load npy
@@ -283,6 +311,69 @@ class BaseDataset(Dataset):
         if not f.exists():
             np.save(f.as_posix(), imread(self.im_files[i]), allow_pickle=False)
 
+    def cache_images_to_mmap(self) -> None:
+        """
+        Pack all resized images into a single memory-mapped file with an offset/shape index.
+
+        The packed file is written once next to the image directory, named after a hash of the image files, image size
+        and channels, so every dataset and split gets its own file that is reused while they are unchanged. Dataloader
+        workers and DDP ranks then read images as zero-copy views through the OS page cache instead of holding a private
+        copy each (cache='ram') or loading one *.npy file per image (cache='disk').
+        """
+        files = sorted(self.im_files)
+        h = get_hash(files + [str(self.imgsz), str(self.channels)])
+        d = Path(self.im_files[0]).parent
+        f = self.mmap_file = d.parent / f"{d.name}.{h[:16]}.mmap"
+        index_file = f.parent / f"{f.name}.index"
+        try:
+            cache = load_dataset_cache_file(index_file)
+            assert cache["version"] == MMAP_CACHE_VERSION  # matches current version
+            assert cache["hash"] == h  # identical hash
+            assert f.stat().st_size == cache["nbytes"]  # complete packed file
+        except (FileNotFoundError, AssertionError, AttributeError, KeyError, ModuleNotFoundError):
+            if not self.check_cache_disk():
+                return
+            cache = self._write_mmap(f, index_file, files, h)
+            if cache is None:
+                return
+        else:
+            LOGGER.info(f"{self.prefix}Using packed image cache {f} ({cache['nbytes'] / (1 << 30):.1f}GB)")
+        position = {x: j for j, x in enumerate(cache["files"])}
+        self.mmap_index = cache["index"][[position[x] for x in self.im_files]]  # (offset, h, w, c, h0, w0) per image
+
+    def _write_mmap(self, f: Path, index_file: Path, files: List[str], h: str) -> Optional[Dict[str, Any]]:
+        """Write resized images of files sequentially into packed file f and save its index, returning the index."""
+        b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
+        index = np.zeros((len(files), 6), dtype=np.int64)  # offset, h, w, c, h0, w0
+        position = {x: j for j, x in enumerate(self.im_files)}
+        tmp = f.parent / f"{f.name}.{os.getpid()}.tmp"  # unique per process, renamed once complete
+        try:
+            with open(tmp, "wb") as file, ThreadPool(NUM_THREADS) as pool:
+                results = pool.imap(lambda x: self.load_image(position[x]), files)
+                pbar = TQDM(enumerate(results), total=len(files), disable=LOCAL_RANK > 0)
+                for j, (im, hw0, hw) in pbar:
+                    index[j] = b, *im.shape, *hw0
+                    file.write(np.ascontiguousarray(im).data)
+                    b += im.nbytes
+                    pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB mmap)"
+                pbar.close()
+            os.replace(tmp, f)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            self.cache = None
+            LOGGER.warning(f"{self.prefix}Skipping packed image cache {f}, not writeable: {e}")
+            return None
+        finally:  # release images buffered by load_image() while packing
+            self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
+            self.buffer.clear()
+        cache = {"hash": h, "files": files, "index": index, "nbytes": b}
+        save_dataset_cache_file(self.prefix, index_file, cache, MMAP_CACHE_VERSION)
+        return cache
+
+    def __getstate__(self):
+        """Return the picklable state of the dataset, dropping the memory map so each worker reopens it lazily."""
+        return {**self.__dict__, "mmap": None}
+
     def check_cache_disk(self, safety_margin: float = 0.5) -> bool:
         """
         Check if there's enough disk space for caching images.
@@ -349,16 +440,23 @@ class BaseDataset(Dataset):
             return False
         return True
 
-    def set_rectangle(self) -> None:
-        """Set the shape of bounding boxes for YOLO detections as rectangles."""
-        bi = np.floor(np.arange(self.ni) / self.batch_size).astype(int)  # batch index
-        nb = bi[-1] + 1  # number of batches
+    def set_rectangle(self, bucket_size: Optional[int] = None) -> None:
+        """
+        Sort images by aspect ratio and set a rectangular training shape for each bucket of neighbouring images.
+
+        Args:
+            bucket_size (int, optional): Number of images sharing a shape, defaults to the batch size. Larger buckets
+                let a shuffling batch sampler draw different batches of one shape every epoch.
+        """
+        bi = np.floor(np.arange(self.ni) / (bucket_size or self.batch_size)).astype(int)  # bucket index
+        nb = bi[-1] + 1  # number of buckets
 
-        s = np.array([x.pop("shape") for x in self.labels])  # hw
+        columnar = isinstance(self.labels, LabelStore)
+        s = self.labels.shapes if columnar else np.array([x.pop("shape") for x in self.labels])  # hw
         ar = s[:, 0] / s[:, 1]  # aspect ratio
         irect = ar.argsort()
         self.im_files = [self.im_files[i] for i in irect]
-        self.labels = [self.labels[i] for i in irect]
+        self.labels = self.labels[irect] if columnar else [self.labels[i] for i in irect]
         ar = ar[irect]
 
         # Set training image shapes
@@ -372,7 +470,7 @@ class BaseDataset(Dataset):
                 shapes[i] = [1, 1 / mini]
 
         self.batch_shapes = np.ceil(np.array(shapes) * self.imgsz / self.stride + self.pad).astype(int) * self.stride
-        self.batch = bi  # batch index of image
+        self.batch = bi  # bucket index of image
 
     def __getitem__(self, index: int) -> Dict[str, Any]:
         """Return transformed label information for given index."""
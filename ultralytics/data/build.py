@@ -1,5 +1,6 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import math
 import os
 import random
 from pathlib import Path
@@ -8,10 +9,10 @@ from typing import Any, Dict, Iterator
 import numpy as np
 import torch
 from PIL import Image
-from torch.utils.data import dataloader, distributed
+from torch.utils.data import IterableDataset, dataloader, distributed
 
 from ultralytics.cfg import IterableSimpleNamespace
-from ultralytics.data.dataset import GroundingDataset, YOLODataset, YOLOMultiModalDataset
+from ultralytics.data.dataset import GroundingDataset, YOLODataset, YOLOMultiModalDataset, YOLOStreamDataset
 from ultralytics.data.loaders import (
     LOADERS,
     LoadImagesAndVideos,
@@ -22,7 +23,7 @@ from ultralytics.data.loaders import (
     SourceTypes,
     autocast_list,
 )
-from ultralytics.data.utils import IMG_FORMATS, PIN_MEMORY, VID_FORMATS
+from ultralytics.data.utils import IMG_FORMATS, PIN_MEMORY, SHARDS_MANIFEST, VID_FORMATS
 from ultralytics.utils import RANK, colorstr
 from ultralytics.utils.checks import check_file
 
@@ -59,13 +60,21 @@ class InfiniteDataLoader(dataloader.DataLoader):
         self.iterator = super().__iter__()
 
     def __len__(self) -> int:
-        """Return the length of the batch sampler's sampler."""
+        """Return the length of the batch sampler's sampler, or the number of batches per epoch of iterable datasets."""
+        if isinstance(self.dataset, IterableDataset):  # every worker streams an equal split with its own last batch
+            nw = max(self.num_workers, 1)
+            n = math.ceil(len(self.dataset) / nw)  # samples per worker
+            return nw * (n // self.batch_size if self.drop_last else math.ceil(n / self.batch_size))
         return len(self.batch_sampler.sampler)
 
     def __iter__(self) -> Iterator:
         """Create an iterator that yields indefinitely from the underlying iterator."""
         for _ in range(len(self)):
-            yield next(self.iterator)
+            try:
+                yield next(self.iterator)
+            except StopIteration:  # iterable dataset exhausted, stream it again
+                self.reset()
+                yield next(self.iterator)
 
     def __del__(self):
         """Ensure that workers are properly terminated when the dataloader is deleted."""
@@ -105,6 +114,138 @@ class _RepeatSampler:
             yield from iter(self.sampler)
 
 
+class AspectRatioBatchSampler:
+    """
+    Batch sampler that shuffles images within aspect-ratio buckets and yields batches of a single rectangular shape.
+
+    Every epoch the images of each bucket are shuffled and split into batches, and the batches of all buckets are
+    shuffled together. Like DistributedSampler, all ranks draw the same permutation and take every num_replicas-th
+    batch, repeating batches so that each rank yields the same number of them.
+
+    Attributes:
+        buckets (List[np.ndarray]): Dataset indices of each aspect-ratio bucket.
+        batch_size (int): Number of images per batch.
+        drop_last (bool): Whether to drop the last incomplete batch of each bucket.
+        num_replicas (int): Number of distributed processes.
+        rank (int): Rank of the current process.
+        seed (int): Random seed shared by all ranks.
+        epoch (int): Epoch of the next permutation, advanced on every iteration.
+
+    Examples:
+        >>> sampler = AspectRatioBatchSampler(dataset.batch, batch_size=16)
+        >>> dataloader = InfiniteDataLoader(dataset, batch_sampler=sampler, collate_fn=dataset.collate_fn)
+    """
+
+    def __init__(
+        self,
+        buckets: np.ndarray,
+        batch_size: int,
+        drop_last: bool = False,
+        num_replicas: int = 1,
+        rank: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Initialize the sampler from the aspect-ratio bucket index of every image.
+
+        Args:
+            buckets (np.ndarray): Bucket index of each dataset image, i.e. BaseDataset.batch in rect mode.
+            batch_size (int): Number of images per batch.
+            drop_last (bool, optional): Whether to drop the last incomplete batch of each bucket.
+            num_replicas (int, optional): Number of distributed processes.
+            rank (int, optional): Rank of the current process.
+            seed (int, optional): Random seed, must be the same on all ranks.
+        """
+        buckets = np.asarray(buckets)
+        self.buckets = [np.flatnonzero(buckets == b) for b in np.unique(buckets)]
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed
+        self.epoch = 0
+        n = sum(len(b) // batch_size if drop_last else math.ceil(len(b) / batch_size) for b in self.buckets)
+        self.num_batches = math.ceil(n / num_replicas)  # per rank
+
+    def __len__(self) -> int:
+        """Return the number of batches per epoch on this rank."""
+        return self.num_batches
+
+    def __iter__(self) -> Iterator:
+        """Yield the lists of dataset indices of one epoch of shuffled batches for this rank."""
+        rng = np.random.default_rng(self.seed + self.epoch)
+        self.epoch += 1
+        batches = []
+        for bucket in self.buckets:
+            bucket = rng.permutation(bucket)
+            n = len(bucket) // self.batch_size * self.batch_size if self.drop_last else len(bucket)
+            batches.extend(bucket[i : i + self.batch_size].tolist() for i in range(0, n, self.batch_size))
+        batches = [batches[i] for i in rng.permutation(len(batches))]
+        total = self.num_batches * self.num_replicas
+        batches = (batches * self.num_replicas)[:total]  # pad by repeating batches to split evenly across ranks
+        yield from batches[self.rank : total : self.num_replicas]
+
+    def set_epoch(self, epoch: int):
+        """Set the epoch of the next permutation, as DistributedSampler.set_epoch."""
+        self.epoch = epoch
+
+
+class DevicePrefetcher:
+    """
+    Iterate over a dataloader with the images of each batch moved to a device, copying the next batch ahead of time.
+
+    On CUDA the next batch is copied from the pinned dataloader output with a non-blocking transfer on a side stream
+    while the current step runs, so the host-to-device copy overlaps with compute. On other devices batches are moved
+    when they are yielded. Only the 'img' tensor is moved, labels stay on the host for CPU-side target building.
+
+    Attributes:
+        loader (Iterable): Dataloader yielding batch dictionaries.
+        device (torch.device): Device to move the images to.
+        stream (torch.cuda.Stream | None): Side stream for the copies, None on devices other than CUDA.
+
+    Examples:
+        >>> for batch in DevicePrefetcher(dataloader, torch.device("cuda:0")):
+        ...     loss = model(batch["img"].float() / 255)  # batch["img"] is already on cuda:0
+    """
+
+    def __init__(self, loader, device: torch.device):
+        """Initialize the prefetcher for a dataloader and the device its batches are used on."""
+        self.loader = loader
+        self.device = torch.device(device)
+        self.stream = torch.cuda.Stream(self.device) if self.device.type == "cuda" else None
+
+    def __len__(self) -> int:
+        """Return the number of batches of the dataloader."""
+        return len(self.loader)
+
+    def __iter__(self) -> Iterator:
+        """Yield the batches of the dataloader, copying each next batch to the device while the current one is used."""
+        if self.stream is None:
+            for batch in self.loader:
+                if isinstance(batch, dict) and isinstance(batch.get("img"), torch.Tensor):
+                    batch["img"] = batch["img"].to(self.device, non_blocking=True)
+                yield batch
+            return
+        loader = iter(self.loader)
+        batch = self._preload(loader)
+        while batch is not None:
+            current = torch.cuda.current_stream(self.device)
+            current.wait_stream(self.stream)  # the copy of this batch has finished before it is used
+            if isinstance(batch, dict) and isinstance(batch.get("img"), torch.Tensor) and batch["img"].is_cuda:
+                batch["img"].record_stream(current)  # memory allocated on the side stream is used on this one
+            next_batch = self._preload(loader)
+            yield batch
+            batch = next_batch
+
+    def _preload(self, loader: Iterator):
+        """Return the next batch of the loader with its images copied to the device on the side stream, or None."""
+        batch = next(loader, None)
+        if isinstance(batch, dict) and isinstance(batch.get("img"), torch.Tensor):
+            with torch.cuda.stream(self.stream):
+                batch["img"] = batch["img"].to(self.device, non_blocking=True)
+        return batch
+
+
 def seed_worker(worker_id: int):  # noqa
     """Set dataloader worker seed for reproducibility across worker processes."""
     worker_seed = torch.initial_seed() % 2**32
@@ -124,6 +265,8 @@ def build_yolo_dataset(
 ):
     """Build and return a YOLO dataset based on configuration parameters."""
     dataset = YOLOMultiModalDataset if multi_modal else YOLODataset
+    if isinstance(img_path, (str, Path)) and (Path(img_path) / SHARDS_MANIFEST).is_file():
+        dataset = YOLOStreamDataset  # directory of *.tar shards
     return dataset(
         img_path=img_path,
         imgsz=cfg.imgsz,
@@ -182,7 +325,7 @@ def build_dataloader(dataset, batch: int, workers: int, shuffle: bool = True, ra
         dataset (Dataset): Dataset to load data from.
         batch (int): Batch size for the dataloader.
         workers (int): Number of worker threads for loading data.
-        shuffle (bool, optional): Whether to shuffle the dataset.
+        shuffle (bool, optional): Whether to shuffle the dataset, rect datasets shuffle within aspect-ratio buckets.
         rank (int, optional): Process rank in distributed training. -1 for single-GPU training.
         drop_last (bool, optional): Whether to drop the last incomplete batch.
 
@@ -197,20 +340,35 @@ def build_dataloader(dataset, batch: int, workers: int, shuffle: bool = True, ra
     batch = min(batch, len(dataset))
     nd = torch.cuda.device_count()  # number of CUDA devices
     nw = min(os.cpu_count() // max(nd, 1), workers)  # number of workers
-    sampler = None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
+    iterable = isinstance(dataset, IterableDataset)  # shuffles and splits itself across ranks
+    if shuffle and getattr(dataset, "rect", False) and not iterable:  # shuffled rect training, batch per bucket
+        batches = dict(
+            batch_sampler=AspectRatioBatchSampler(
+                dataset.batch,
+                batch,
+                drop_last=drop_last,
+                num_replicas=1 if rank == -1 else torch.distributed.get_world_size(),
+                rank=max(rank, 0),
+            )
+        )
+    else:
+        sampler = None if rank == -1 or iterable else distributed.DistributedSampler(dataset, shuffle=shuffle)
+        batches = dict(
+            batch_size=batch,
+            shuffle=shuffle and sampler is None and not iterable,
+            sampler=sampler,
+            drop_last=drop_last,
+        )
     generator = torch.Generator()
     generator.manual_seed(6148914691236517205 + RANK)
     return InfiniteDataLoader(
         dataset=dataset,
-        batch_size=batch,
-        shuffle=shuffle and sampler is None,
         num_workers=nw,
-        sampler=sampler,
         pin_memory=PIN_MEMORY,
         collate_fn=getattr(dataset, "collate_fn", None),
         worker_init_fn=seed_worker,
         generator=generator,
-        drop_last=drop_last,
+        **batches,
     )
 
 
@@ -261,7 +419,15 @@ def check_source(source):
     return source, webcam, screenshot, from_img, in_memory, tensor
 
 
-def load_inference_source(source=None, batch: int = 1, vid_stride: int = 1, buffer: bool = False, channels: int = 3):
+def load_inference_source(
+    source=None,
+    batch: int = 1,
+    vid_stride: int = 1,
+    buffer: bool = False,
+    channels: int = 3,
+    decode_workers: int = 0,
+    views: int = 0,
+):
     """
     Load an inference source for object detection and apply necessary transformations.
 
@@ -271,6 +437,8 @@ def load_inference_source(source=None, batch: int = 1, vid_stride: int = 1, buff
         vid_stride (int, optional): The frame interval for video sources.
         buffer (bool, optional): Whether stream frames will be buffered.
         channels (int, optional): The number of input channels for the model.
+        decode_workers (int, optional): Number of worker processes decoding stream and video frames into shared memory.
+        views (int, optional): Return stream frames as ring buffer views valid for this many further reads, 0 to copy.
 
     Returns:
         (Dataset): A dataset object for the specified input source with attached source_type attribute.
@@ -291,13 +459,17 @@ def load_inference_source(source=None, batch: int = 1, vid_stride: int = 1, buff
     elif in_memory:
         dataset = source
     elif stream:
-        dataset = LoadStreams(source, vid_stride=vid_stride, buffer=buffer, channels=channels)
+        dataset = LoadStreams(
+            source, vid_stride=vid_stride, buffer=buffer, channels=channels, decode_workers=decode_workers, views=views
+        )
     elif screenshot:
         dataset = LoadScreenshots(source, channels=channels)
     elif from_img:
         dataset = LoadPilAndNumpy(source, channels=channels)
     else:
-        dataset = LoadImagesAndVideos(source, batch=batch, vid_stride=vid_stride, channels=channels)
+        dataset = LoadImagesAndVideos(
+            source, batch=batch, vid_stride=vid_stride, channels=channels, decode_workers=decode_workers
+        )
 
     # Attach source types to the dataset
     setattr(dataset, "source_type", source_type)
@@ -6,7 +6,7 @@ import shutil
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 import cv2
 import numpy as np
@@ -618,9 +618,10 @@ def yolo_bbox2segment(
 
     LOGGER.info("Detection labels detected, generating segment labels by SAM model!")
     sam_model = SAM(sam_model)
-    for label in TQDM(dataset.labels, total=len(dataset.labels), desc="Generating segment labels"):
+    labels = list(dataset.labels)
+    for label in TQDM(labels, total=len(labels), desc="Generating segment labels"):
         h, w = label["shape"]
-        boxes = label["bboxes"]
+        boxes = label["bboxes"].copy()
         if len(boxes) == 0:  # skip empty labels
             continue
         boxes[:, [0, 2]] *= w
@@ -631,7 +632,7 @@ def yolo_bbox2segment(
 
     save_dir = Path(save_dir) if save_dir else Path(im_dir).parent / "labels-segment"
     save_dir.mkdir(parents=True, exist_ok=True)
-    for label in dataset.labels:
+    for label in labels:
         texts = []
         lb_name = Path(label["im_file"]).with_suffix(".txt").name
         txt_file = save_dir / lb_name
@@ -754,3 +755,93 @@ def convert_to_multispectral(path: Union[str, Path], n_channels: int = 10, repla
         multispectral = f(target_wavelengths)
         cv2.imwritemulti(str(output_path), np.clip(multispectral, 0, 255).astype(np.uint8).transpose(2, 0, 1))
         LOGGER.info(f"Converted {output_path}")
+
+
+def convert_yolo_to_shards(
+    img_path: Union[str, Path],
+    save_dir: Optional[Union[str, Path]] = None,
+    data: Optional[Dict] = None,
+    task: str = "detect",
+    shard_size: int = 1000,
+) -> Path:
+    """
+    Convert a YOLO images/labels directory tree into *.tar shards for streamed training with YOLOStreamDataset.
+
+    Each image-label pair is verified once here, exactly as YOLODataset.cache_labels() does on every new dataset, and
+    written as an encoded image plus a JSON label record into consecutive shards of shard_size samples. A shards.json
+    manifest records the shards and their sample counts so datasets can be sized without scanning any shard.
+
+    Args:
+        img_path (str | Path): Directory of images with labels in the sibling 'labels' directory.
+        save_dir (str | Path, optional): Output directory, defaults to '<img_path>-shards' next to img_path.
+        data (dict, optional): Dataset configuration dictionary with 'names' and, for pose datasets, 'kpt_shape'.
+        task (str): Task type, one of 'detect', 'segment', 'pose', or 'obb'.
+        shard_size (int): Number of samples per shard.
+
+    Returns:
+        (Path): Directory containing the shards and their manifest.
+
+    Examples:
+        >>> from ultralytics.data.converter import convert_yolo_to_shards
+        >>> convert_yolo_to_shards("coco8/images/train", data={"names": {0: "person"}})
+    """
+    import io
+    import tarfile
+    from itertools import repeat
+    from multiprocessing.pool import ThreadPool
+
+    from ultralytics.data.utils import (
+        IMG_FORMATS,
+        SHARDS_MANIFEST,
+        SHARDS_VERSION,
+        img2label_paths,
+        verify_image_label,
+    )
+
+    img_path = Path(img_path)
+    save_dir = Path(save_dir or img_path.parent / f"{img_path.name}-shards")
+    save_dir.mkdir(parents=True, exist_ok=True)
+    data = data or {"names": {0: "item"}}
+    keypoint = task == "pose"
+    nkpt, ndim = data.get("kpt_shape", (0, 0))
+    im_files = sorted(str(x) for x in img_path.rglob("*.*") if x.suffix[1:].lower() in IMG_FORMATS)
+
+    def add(tar, name, b):
+        """Add the bytes b to tar as file name."""
+        info = tarfile.TarInfo(name)
+        info.size = len(b)
+        tar.addfile(info, io.BytesIO(b))
+
+    shards, tar, n, nc = [], None, 0, 0  # shards, open shard, samples written, corrupt samples
+    with ThreadPool(NUM_THREADS) as pool:
+        args = (repeat(""), repeat(keypoint), repeat(len(data["names"])), repeat(nkpt), repeat(ndim), repeat(False))
+        results = pool.imap(verify_image_label, zip(im_files, img2label_paths(im_files), *args))
+        for im_file, lb, shape, segments, keypoints, *_, nc_f, msg in TQDM(results, total=len(im_files)):
+            nc += nc_f
+            if not im_file:
+                LOGGER.warning(msg)
+                continue
+            if tar is None or shards[-1]["samples"] == shard_size:  # start a new shard
+                if tar is not None:
+                    tar.close()
+                shards.append({"name": f"shard-{len(shards):06d}.tar", "samples": 0})
+                tar = tarfile.open(save_dir / shards[-1]["name"], "w")
+            label = {
+                "im_file": str(Path(im_file).relative_to(img_path)),
+                "shape": list(shape),
+                "cls": lb[:, 0].tolist(),
+                "bboxes": lb[:, 1:].tolist(),
+                "segments": [s.tolist() for s in segments],
+                "keypoints": None if keypoints is None else keypoints.tolist(),
+            }
+            add(tar, f"{n:09d}.json", json.dumps(label).encode())
+            add(tar, f"{n:09d}{Path(im_file).suffix.lower()}", Path(im_file).read_bytes())
+            shards[-1]["samples"] += 1
+            n += 1
+    if tar is not None:
+        tar.close()
+
+    manifest = {"version": SHARDS_VERSION, "samples": n, "shards": shards}
+    (save_dir / SHARDS_MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    LOGGER.info(f"Converted {n} images ({nc} corrupt skipped) into {len(shards)} shards in {save_dir}")
+    return save_dir
@@ -1,21 +1,24 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import json
+import math
+import os
+import random
 from collections import defaultdict
-from itertools import repeat
+from itertools import islice, repeat
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
 import torch
 from PIL import Image
-from torch.utils.data import ConcatDataset
+from torch.utils.data import ConcatDataset, IterableDataset
 
-from ultralytics.utils import LOCAL_RANK, LOGGER, NUM_THREADS, TQDM, colorstr
+from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, RANK, TQDM, colorstr, is_dir_writeable
 from ultralytics.utils.instance import Instances
-from ultralytics.utils.ops import resample_segments, segments2boxes
+from ultralytics.utils.ops import segments2boxes
 from ultralytics.utils.torch_utils import TORCHVISION_0_18
 
 from .augment import (
@@ -25,23 +28,52 @@ from .augment import (
     RandomLoadText,
     classify_augmentations,
     classify_transforms,
+    v8_batch_transforms,
     v8_transforms,
 )
 from .base import BaseDataset
 from .converter import merge_multi_segment
 from .utils import (
     HELP_URL,
+    LabelStore,
+    LocalShardStore,
     check_file_speeds,
+    get_fingerprints,
     get_hash,
     img2label_paths,
     load_dataset_cache_file,
+    load_shards_manifest,
+    read_shard,
     save_dataset_cache_file,
     verify_image,
     verify_image_label,
 )
 
 # Ultralytics dataset *.cache version, >= 1.0.0 for Ultralytics YOLO models
-DATASET_CACHE_VERSION = "1.0.3"
+DATASET_CACHE_VERSION = "1.0.5"
+WORLD_SIZE = int(os.getenv("WORLD_SIZE", 1))  # DDP world size, streamed datasets split their shards across ranks
+
+
+def _collate_buffer(elem: torch.Tensor, size: Tuple[int, ...]) -> Optional[torch.Tensor]:
+    """
+    Return a preallocated output tensor for collating a batch inside a dataloader worker, or None in the main process.
+
+    Inside a worker the batch is stacked straight into a shared-memory tensor, so it reaches the main process without
+    an extra copy into shared memory and is then copied once into pinned memory by the dataloader's pin thread. Workers
+    cannot write into a pinned buffer themselves, as pinned memory belongs to the CUDA context of the main process, and
+    the pin thread's pinned batches come from PyTorch's caching host allocator, which reuses freed pinned blocks.
+
+    Args:
+        elem (torch.Tensor): A sample tensor setting the dtype and device of the buffer.
+        size (Tuple[int, ...]): Shape of the collated batch.
+
+    Returns:
+        (torch.Tensor | None): Uninitialized shared-memory tensor of the given size, None outside of a worker.
+    """
+    if torch.utils.data.get_worker_info() is None:
+        return None
+    storage = elem._typed_storage()._new_shared(math.prod(size), device=elem.device)
+    return elem.new(storage).resize_(size)
 
 
 class YOLODataset(BaseDataset):
@@ -87,32 +119,50 @@ class YOLODataset(BaseDataset):
         assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
         super().__init__(*args, channels=self.data["channels"], **kwargs)
 
-    def cache_labels(self, path: Path = Path("./labels.cache")) -> Dict:
+    def cache_labels(
+        self,
+        path: Path = Path("./labels.cache"),
+        fingerprints: Optional[List[Tuple[int, ...]]] = None,
+        cache: Optional[Dict] = None,
+    ) -> Dict:
         """
         Cache dataset labels, check images and read shapes.
 
+        Only files that are new or whose fingerprint changed since the given cache was saved are verified, the labels
+        and results of all other files are copied from the cache.
+
         Args:
             path (Path): Path where to save the cache file.
+            fingerprints (List[tuple], optional): Fingerprints of the image and label files, computed if not given.
+            cache (dict, optional): Previous cache of this dataset to patch, if any.
 
         Returns:
             (dict): Dictionary containing cached labels and related information.
         """
-        x = {"labels": []}
+        x = {"labels": [], "fingerprints": {}, "files": {}}
         nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
-        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
-        total = len(self.im_files)
         nkpt, ndim = self.data.get("kpt_shape", (0, 0))
         if self.use_keypoints and (nkpt <= 0 or ndim not in {2, 3}):
             raise ValueError(
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
+        if fingerprints is None:
+            fingerprints = get_fingerprints(self.im_files, self.label_files)
+        cache = cache or {"labels": [], "fingerprints": {}, "files": {}}
+        labels = {lb["im_file"]: lb for lb in cache["labels"]}
+        verify = [i for i, (f, fp) in enumerate(zip(self.im_files, fingerprints)) if cache["fingerprints"].get(f) != fp]
+        im_files, label_files = [self.im_files[i] for i in verify], [self.label_files[i] for i in verify]
+        if cache["fingerprints"]:
+            desc = f"{self.prefix}Updating {path.parent / path.stem} with {len(verify)} new or changed files..."
+        else:
+            desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
         with ThreadPool(NUM_THREADS) as pool:
             results = pool.imap(
                 func=verify_image_label,
                 iterable=zip(
-                    self.im_files,
-                    self.label_files,
+                    im_files,
+                    label_files,
                     repeat(self.prefix),
                     repeat(self.use_keypoints),
                     repeat(len(self.data["names"])),
@@ -121,37 +171,53 @@ class YOLODataset(BaseDataset):
                     repeat(self.single_cls),
                 ),
             )
-            pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
+            pbar = TQDM(zip(im_files, results), desc=desc, total=len(im_files))
+            for f, (im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg) in pbar:
                 nm += nm_f
                 nf += nf_f
                 ne += ne_f
                 nc += nc_f
+                labels.pop(f, None)
                 if im_file:
-                    x["labels"].append(
-                        {
-                            "im_file": im_file,
-                            "shape": shape,
-                            "cls": lb[:, 0:1],  # n, 1
-                            "bboxes": lb[:, 1:],  # n, 4
-                            "segments": segments,
-                            "keypoints": keypoint,
-                            "normalized": True,
-                            "bbox_format": "xywh",
-                        }
-                    )
-                if msg:
-                    msgs.append(msg)
+                    labels[f] = {
+                        "im_file": im_file,
+                        "shape": shape,
+                        "cls": lb[:, 0:1],  # n, 1
+                        "bboxes": lb[:, 1:],  # n, 4
+                        "segments": segments,
+                        "keypoints": keypoint,
+                        "normalized": True,
+                        "bbox_format": "xywh",
+                    }
+                cache["files"][f] = nm_f, nf_f, ne_f, nc_f, msg
                 pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
             pbar.close()
+        for i, fp in zip(verify, get_fingerprints(im_files, label_files)):  # after any corrupt JPEG restores
+            fingerprints[i] = fp
+
+        # Merge verified files with the unchanged files of the previous cache
+        nm, nf, ne, nc = 0, 0, 0, 0
+        for f, fp in zip(self.im_files, fingerprints):
+            nm_f, nf_f, ne_f, nc_f, msg = x["files"][f] = cache["files"][f]
+            x["fingerprints"][f] = fp
+            nm += nm_f
+            nf += nf_f
+            ne += ne_f
+            nc += nc_f
+            if f in labels:
+                x["labels"].append(labels[f])
+            if msg:
+                msgs.append(msg)
 
         if msgs:
             LOGGER.info("\n".join(msgs))
         if nf == 0:
             LOGGER.warning(f"{self.prefix}No labels found in {path}. {HELP_URL}")
-        x["hash"] = get_hash(self.label_files + self.im_files)
         x["results"] = nf, nm, ne, nc, len(self.im_files)
         x["msgs"] = msgs  # warnings
+        x["labels"] = LabelStore.from_labels(x["labels"])
+        if is_dir_writeable(path.parent):
+            x["labels"].save(path.with_suffix(".labels"))  # memory-mapped label columns, the cache only references
         save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
         return x
 
@@ -166,12 +232,15 @@ class YOLODataset(BaseDataset):
         """
         self.label_files = img2label_paths(self.im_files) # 根据图片路径得到对应的label路径
         cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
+        fingerprints = get_fingerprints(self.im_files, self.label_files)
         try:
             cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
             assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
-            assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
-        except (FileNotFoundError, AssertionError, AttributeError):
-            cache, exists = self.cache_labels(cache_path), False  # run cache ops
+            cache["labels"].open()  # memory-map label columns
+        except (FileNotFoundError, AssertionError, AttributeError, ValueError):
+            cache, exists = None, False
+        if not exists or cache["fingerprints"] != dict(zip(self.im_files, fingerprints)):  # files added or changed
+            cache = self.cache_labels(cache_path, fingerprints, cache)  # run cache ops on new and changed files only
 
         # Display cache
         nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
@@ -182,25 +251,24 @@ class YOLODataset(BaseDataset):
                 LOGGER.info("\n".join(cache["msgs"]))  # display warnings
 
         # Read cache
-        [cache.pop(k) for k in ("hash", "version", "msgs")]  # remove items
+        [cache.pop(k) for k in ("fingerprints", "files", "version", "msgs")]  # remove items
         labels = cache["labels"]
         if not labels:
             raise RuntimeError(
                 f"No valid images found in {cache_path}. Images with incorrectly formatted labels are ignored. {HELP_URL}"
             )
-        self.im_files = [lb["im_file"] for lb in labels]  # update im_files
+        self.im_files = labels.im_files  # update im_files
 
         # Check if the dataset is all boxes or all segments
-        lengths = ((len(lb["cls"]), len(lb["bboxes"]), len(lb["segments"])) for lb in labels)
-        len_cls, len_boxes, len_segments = (sum(x) for x in zip(*lengths))
+        len_cls = len_boxes = len(labels.columns["cls"])
+        len_segments = int(np.count_nonzero(np.diff(labels.columns["segment_offsets"])))  # instances with segments
         if len_segments and len_boxes != len_segments:
             LOGGER.warning(
                 f"Box and segment counts should be equal, but got len(segments) = {len_segments}, "
                 f"len(boxes) = {len_boxes}. To resolve this only boxes will be used and all segments will be removed. "
                 "To avoid this please supply either a detect or segment dataset, not a detect-segment mixed dataset."
             )
-            for lb in labels:
-                lb["segments"] = []
+            labels.use_segments = False
         if len_cls == 0:
             LOGGER.warning(f"Labels are missing or empty in {cache_path}, training may not work correctly. {HELP_URL}")
         return labels
@@ -220,6 +288,8 @@ class YOLODataset(BaseDataset):
             hyp.mixup = hyp.mixup if self.augment and not self.rect else 0.0
             hyp.cutmix = hyp.cutmix if self.augment and not self.rect else 0.0
             transforms = v8_transforms(self, self.imgsz, hyp)
+            if getattr(hyp, "batch_augment", False):
+                self.batch_transforms = v8_batch_transforms(self, hyp)
         else:
             transforms = Compose([LetterBox(new_shape=(self.imgsz, self.imgsz), scaleup=False)])
         transforms.append(
@@ -272,15 +342,17 @@ class YOLODataset(BaseDataset):
 
         # NOTE: do NOT resample oriented boxes
         segment_resamples = 100 if self.use_obb else 1000
-        if len(segments) > 0:
-            # make sure segments interpolate correctly if original length is greater than segment_resamples
-            max_len = max(len(s) for s in segments)
-            segment_resamples = (max_len + 1) if segment_resamples < max_len else segment_resamples
-            # list[np.array(segment_resamples, 2)] * num_samples
-            segments = np.stack(resample_segments(segments, n=segment_resamples), axis=0)
-        else:
+        if len(segments) == 0:
             segments = np.zeros((0, segment_resamples, 2), dtype=np.float32)
-        label["instances"] = Instances(bboxes, segments, keypoints, bbox_format=bbox_format, normalized=normalized)
+        # segments are padded into one array and only resampled where they get clipped
+        label["instances"] = Instances(
+            bboxes,
+            segments,
+            keypoints,
+            bbox_format=bbox_format,
+            normalized=normalized,
+            segment_resamples=segment_resamples,
+        )
         return label
 
     @staticmethod
@@ -295,25 +367,226 @@ class YOLODataset(BaseDataset):
             (dict): Collated batch with stacked tensors.
         """
         new_batch = {}
-        batch = [dict(sorted(b.items())) for b in batch]  # make sure the keys are in the same order
-        keys = batch[0].keys()
-        values = list(zip(*[list(b.values()) for b in batch]))
-        for i, k in enumerate(keys):
-            value = values[i]
+        for k in sorted(batch[0]):  # keys in a fixed order, looked up per sample instead of re-sorting every sample
+            value = tuple(b[k] for b in batch)
             if k in {"img", "text_feats"}:
-                value = torch.stack(value, 0)
+                value = torch.stack(value, 0, out=_collate_buffer(value[0], (len(value), *value[0].shape)))
             elif k == "visuals":
                 value = torch.nn.utils.rnn.pad_sequence(value, batch_first=True)
-            if k in {"masks", "keypoints", "bboxes", "cls", "segments", "obb"}:
-                value = torch.cat(value, 0)
+            elif k == "batch_idx":  # add target image index for build_targets() in a single op
+                counts = torch.tensor([len(v) for v in value])
+                value = torch.cat(value, 0) + torch.arange(len(value), dtype=value[0].dtype).repeat_interleave(counts)
+            elif k in {"masks", "keypoints", "bboxes", "cls", "segments", "obb"}:
+                shape = value[0].shape[1:]
+                same = all(v.shape[1:] == shape for v in value)  # cat also accepts legacy empty (0,) tensors
+                out = _collate_buffer(value[0], (sum(map(len, value)), *shape)) if same else None
+                value = torch.cat(value, 0, out=out)
             new_batch[k] = value
-        new_batch["batch_idx"] = list(new_batch["batch_idx"])
-        for i in range(len(new_batch["batch_idx"])):
-            new_batch["batch_idx"][i] += i  # add target image index for build_targets()
-        new_batch["batch_idx"] = torch.cat(new_batch["batch_idx"], 0)
         return new_batch
 
 
+class YOLOStreamDataset(YOLODataset, IterableDataset):
+    """
+    Iterable YOLODataset variant that streams samples from *.tar shards instead of scanning an images/labels tree.
+
+    Shards written by converter.convert_yolo_to_shards() are split across DDP ranks and dataloader workers, read
+    sequentially from a local directory or any object store with an open(name) method, and shuffled through a buffer
+    of decoded samples. Every split streams the same number of samples, so all workers and ranks yield the same number
+    of batches per epoch. The buffer takes the place of BaseDataset's image buffer, so Mosaic, MixUp, CutMix and
+    CopyPaste draw their extra images from it unchanged.
+
+    Attributes:
+        store (LocalShardStore): Object store serving the shards and their manifest.
+        shards (List[str]): Names of the shards used by this dataset.
+        shard_samples (List[int]): Number of samples in each used shard.
+        ni (int): Number of samples in the used shards.
+        labels (List[Dict]): Labels of the samples in the shuffle buffer, those of the first shard before iteration.
+        buffer (List[int]): Indices of the filled shuffle buffer slots.
+        max_buffer_length (int): Number of samples held in the shuffle buffer.
+
+    Methods:
+        __iter__: Yield transformed samples from this worker's shards in shuffled order.
+        load_image: Return the decoded image of a shuffle buffer slot.
+        get_image_and_label: Return label information for a shuffle buffer slot.
+
+    Examples:
+        >>> dataset = YOLOStreamDataset(img_path="path/to/shards", data={"names": {0: "person"}}, task="detect")
+        >>> sample = next(iter(dataset))
+    """
+
+    def __init__(
+        self,
+        img_path: Union[str, Path, Any],
+        imgsz: int = 640,
+        cache: Union[bool, str] = False,
+        augment: bool = True,
+        hyp: Dict[str, Any] = DEFAULT_CFG,
+        prefix: str = "",
+        rect: bool = False,
+        batch_size: int = 16,
+        stride: int = 32,
+        pad: float = 0.0,
+        single_cls: bool = False,
+        classes: Optional[List[int]] = None,
+        fraction: float = 1.0,
+        data: Optional[Dict] = None,
+        task: str = "detect",
+        buffer_size: Optional[int] = None,
+    ):
+        """
+        Initialize the YOLOStreamDataset from the manifest of a sharded dataset without reading the shards.
+
+        Args:
+            img_path (str | Path | Any): Directory of shards, or an object store with an open(name) method.
+            imgsz (int): Image size for resizing.
+            cache (bool | str): Unused, samples are streamed and never cached.
+            augment (bool): If True, data augmentation and shuffling are applied.
+            hyp (Dict[str, Any]): Hyperparameters to apply data augmentation.
+            prefix (str): Prefix to print in log messages.
+            rect (bool): Unused, streamed batches can not be grouped by aspect ratio.
+            batch_size (int): Size of batches.
+            stride (int): Stride used in the model.
+            pad (float): Padding value.
+            single_cls (bool): If True, single class training is used.
+            classes (List[int], optional): List of included classes.
+            fraction (float): Fraction of shards to utilize.
+            data (dict, optional): Dataset configuration dictionary.
+            task (str): Task type, one of 'detect', 'segment', 'pose', or 'obb'.
+            buffer_size (int, optional): Shuffle buffer size, defaults to min(batch_size * 8, 1000) when augmenting.
+        """
+        IterableDataset.__init__(self)
+        self.use_segments = task == "segment"
+        self.use_keypoints = task == "pose"
+        self.use_obb = task == "obb"
+        self.data = data
+        assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
+        if cache:
+            LOGGER.warning(f"{prefix}cache={cache} is not supported for streamed shard datasets, not caching images")
+        self.img_path = img_path
+        self.store = img_path if hasattr(img_path, "open") else LocalShardStore(img_path)
+        self.imgsz = imgsz
+        self.augment = augment
+        self.single_cls = single_cls
+        self.include_class = None if classes is None else np.array(classes).reshape(1, -1)
+        self.prefix = prefix
+        self.channels = self.data["channels"]
+        self.cv2_flag = cv2.IMREAD_GRAYSCALE if self.channels == 1 else cv2.IMREAD_COLOR
+        self.rect, self.cache, self.mmap_index = False, None, None
+        self.batch_size = batch_size
+        self.stride = stride
+        self.pad = pad
+
+        manifest = load_shards_manifest(self.store)
+        shards = manifest["shards"][: max(round(len(manifest["shards"]) * fraction), 1)]
+        self.shards = [x["name"] for x in shards]
+        self.shard_samples = [x["samples"] for x in shards]
+        self.ni = sum(self.shard_samples)
+        self.max_buffer_length = (buffer_size or min(batch_size * 8, 1000)) if augment else 1  # 1 keeps shard order
+        self.labels = [self._label(lb) for lb, _ in read_shard(self.store, self.shards[0])]
+        self.im_files = [lb["im_file"] for lb in self.labels]
+        self.ims, self.im_hw0, self.im_hw, self.buffer = [], [], [], []
+        LOGGER.info(f"{self.prefix}Streaming {self.ni} images in {len(self.shards)} shards from {self.store}")
+        self.batch_transforms = None
+        self.transforms = self.build_transforms(hyp=hyp)
+
+    def _label(self, x: Dict) -> Dict:
+        """Convert a JSON label record of a shard into a YOLODataset label dictionary."""
+        cls = np.array(x["cls"], dtype=np.float32).reshape(-1, 1)
+        bboxes = np.array(x["bboxes"], dtype=np.float32).reshape(-1, 4)
+        segments = [np.array(s, dtype=np.float32) for s in x["segments"]]
+        keypoints = x["keypoints"]
+        if keypoints is not None:
+            keypoints = np.array(keypoints, dtype=np.float32).reshape(-1, self.data["kpt_shape"][0], 3)
+        if self.include_class is not None:
+            j = (cls == self.include_class).any(1)
+            cls, bboxes = cls[j], bboxes[j]
+            segments = [s for s, keep in zip(segments, j) if keep] if segments else segments
+            keypoints = None if keypoints is None else keypoints[j]
+        if self.single_cls:
+            cls[:, 0] = 0
+        return {
+            "im_file": x["im_file"],
+            "shape": tuple(x["shape"]),
+            "cls": cls,
+            "bboxes": bboxes,
+            "segments": segments,
+            "keypoints": keypoints,
+            "normalized": True,
+            "bbox_format": "xywh",
+        }
+
+    def _set(self, i: int, x: Dict, b: bytes) -> None:
+        """Decode and resize the encoded image b with JSON label x into shuffle buffer slot i."""
+        im = cv2.imdecode(np.frombuffer(b, np.uint8), self.cv2_flag)  # BGR
+        h0, w0 = im.shape[:2]  # orig hw
+        r = self.imgsz / max(h0, w0)  # resize long side to imgsz while maintaining aspect ratio
+        if r != 1:
+            w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+            im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        if im.ndim == 2:
+            im = im[..., None]
+        if i == len(self.buffer):  # new slot
+            self.buffer.append(i)
+            for slots in (self.labels, self.ims, self.im_hw0, self.im_hw):
+                slots.append(None)
+        self.labels[i], self.ims[i], self.im_hw0[i], self.im_hw[i] = self._label(x), im, (h0, w0), im.shape[:2]
+
+    def _samples(self) -> Iterator[Tuple[Dict, bytes]]:
+        """
+        Yield the (label, encoded image) samples of the split assigned to this DDP rank and dataloader worker.
+
+        Splits are equal runs of consecutive samples across shard boundaries, so splits differ by no more than one
+        sample whatever the shard sizes. The last splits wrap around to the first samples to pad every split to the
+        same size, like DistributedSampler. The shard ranges of a split are visited in random order when augmenting.
+        """
+        worker = torch.utils.data.get_worker_info()
+        nw, w = (worker.num_workers, worker.id) if worker else (1, 0)
+        n, i = WORLD_SIZE * nw, max(RANK, 0) * nw + w  # number of splits, index of this split
+        m = math.ceil(self.ni / n)  # samples per split
+        lo = i * m % self.ni
+        spans = [(lo, min(lo + m, self.ni))] + ([(0, lo + m - self.ni)] if lo + m > self.ni else [])
+        parts, a = [], 0  # (shard, first sample, stop sample) ranges of this split
+        for shard, k in zip(self.shards, self.shard_samples):
+            parts.extend((shard, max(s, a) - a, min(e, a + k) - a) for s, e in spans if max(s, a) < min(e, a + k))
+            a += k
+        if self.augment:
+            random.shuffle(parts)
+        for shard, start, stop in parts:
+            yield from islice(read_shard(self.store, shard), start, stop)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Yield transformed samples of this worker's shards once, in shuffled order when augmenting."""
+        self.labels, self.ims, self.im_hw0, self.im_hw, self.buffer = [], [], [], [], []
+        for x, b in self._samples():
+            if len(self.buffer) < self.max_buffer_length:  # fill buffer
+                self._set(len(self.buffer), x, b)
+                continue
+            i = random.randrange(len(self.buffer))
+            sample = self[i]
+            self._set(i, x, b)
+            yield sample
+        while self.buffer:  # drain buffer
+            i = random.randrange(len(self.buffer))
+            sample = self[i]
+            j = self.buffer.pop()
+            last = self.labels.pop(), self.ims.pop(), self.im_hw0.pop(), self.im_hw.pop()
+            if i != j:  # move the last slot into the yielded slot i
+                self.labels[i], self.ims[i], self.im_hw0[i], self.im_hw[i] = last
+            yield sample
+
+    def load_image(self, i: int, rect_mode: bool = True) -> Tuple[np.ndarray, Tuple[int, int], Tuple[int, int]]:
+        """Return the decoded image, original and resized (h, w) of shuffle buffer slot i."""
+        return self.ims[i], self.im_hw0[i], self.im_hw[i]
+
+    def get_image_and_label(self, index: int) -> Dict[str, Any]:
+        """Return label information for shuffle buffer slot index, wrapping dataset-wide indices of mix transforms."""
+        return super().get_image_and_label(index % len(self.buffer))
+
+    def __len__(self) -> int:
+        """Return the number of samples streamed per epoch by each DDP rank, before padding to the worker splits."""
+        return math.ceil(self.ni / WORLD_SIZE)
+
+
 class YOLOMultiModalDataset(YOLODataset):
     """
     Dataset class for loading object detection and/or segmentation labels in YOLO format with multi-modal support.
@@ -2,12 +2,12 @@
 
 import glob
 import math
+import multiprocessing
 import os
-import time
 import urllib
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Thread
 from typing import Any, List, Optional, Tuple, Union
 
 import cv2
@@ -49,6 +49,290 @@ class SourceTypes:
     tensor: bool = False
 
 
+class FrameRing:
+    """
+    Fixed-capacity ring buffer of video frames backed by one preallocated array.
+
+    A producer decodes frames straight into ring slots and a consumer reads them back as views, so frames are handed
+    over without copies or per-frame allocations. Producer and consumer wake each other through a condition variable
+    instead of polling. Rings created with a multiprocessing context live in shared memory and can be passed to a
+    decode worker process.
+
+    Attributes:
+        data (np.ndarray): Frame storage of shape (capacity + hold, H, W, C).
+        state (np.ndarray): Ring counters (head, tail, dropped, closed).
+        capacity (int): Maximum number of unread frames.
+        hold (int): Number of most recently read frames protected from being overwritten.
+        shm (SharedMemory | None): Shared memory block backing `state` and `data` for multiprocess rings.
+        head (int): Total number of frames written.
+        tail (int): Total number of frames read or dropped.
+        dropped (int): Number of frames overwritten or skipped before being read.
+        closed (bool): Whether the ring has been closed.
+
+    Methods:
+        slot: Return the writable slot for the next frame, waiting for space or dropping the newest unread frame.
+        commit: Publish the frame written to the current slot.
+        get: Return the next unread frame, or the latest one, as a view into the ring.
+        close: Mark the ring closed and wake up waiting readers.
+        unlink: Free the shared memory block of a multiprocess ring.
+
+    Examples:
+        >>> ring = FrameRing((480, 640, 3), capacity=4)
+        >>> ring.slot()[:] = 114
+        >>> ring.commit()
+        >>> ring.get().shape
+        (480, 640, 3)
+
+    Notes:
+        Frames returned by `get` stay valid until `hold` further frames have been read or skipped.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], capacity: int = 30, hold: int = 1, dtype=np.uint8, ctx=None):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            shape (Tuple[int, ...]): Frame shape (H, W, C).
+            capacity (int): Maximum number of unread frames.
+            hold (int): Number of most recently read frames protected from being overwritten, at least 1 so the frame
+                being read is never written to.
+            dtype (np.dtype): Frame data type.
+            ctx (multiprocessing.context.BaseContext, optional): Multiprocessing context, allocates the ring in shared
+                memory for use across processes if given.
+        """
+        self.shape = (capacity + max(hold, 1), *shape)
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self.hold = max(hold, 1)
+        if ctx is None:
+            self.shm = None
+            self.cond = Condition()
+            self.state = np.zeros(4, dtype=np.int64)
+            self.data = np.zeros(self.shape, dtype=self.dtype)
+        else:
+            from multiprocessing import shared_memory
+
+            self.shm = shared_memory.SharedMemory(create=True, size=32 + int(np.prod(self.shape)) * self.dtype.itemsize)
+            self.cond = ctx.Condition()
+            self._attach()
+            self.state[:] = 0
+
+    def _attach(self):
+        """Map the counters and frame storage onto the shared memory block."""
+        self.state = np.ndarray((4,), dtype=np.int64, buffer=self.shm.buf[:32])
+        self.data = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf[32:])
+
+    def __getstate__(self):
+        """Return the picklable state of a multiprocess ring, sent to decode workers when they are started."""
+        if self.shm is None:
+            raise TypeError("only FrameRing objects created with a multiprocessing context can be pickled")
+        return {k: v for k, v in self.__dict__.items() if k not in {"state", "data"}}
+
+    def __setstate__(self, state):
+        """Restore a multiprocess ring in a decode worker by attaching to its shared memory block."""
+        self.__dict__.update(state)
+        self._attach()
+
+    @property
+    def head(self) -> int:
+        """Return the total number of frames written."""
+        return int(self.state[0])
+
+    @property
+    def tail(self) -> int:
+        """Return the total number of frames read or dropped."""
+        return int(self.state[1])
+
+    @property
+    def dropped(self) -> int:
+        """Return the number of frames overwritten or skipped before being read."""
+        return int(self.state[2])
+
+    @property
+    def closed(self) -> bool:
+        """Return whether the ring has been closed."""
+        return bool(self.state[3])
+
+    def slot(self, drop: bool = False) -> Optional[np.ndarray]:
+        """
+        Return the writable slot for the next frame.
+
+        Args:
+            drop (bool): Overwrite the newest unread frame if the ring is full, otherwise wait until a frame is read.
+
+        Returns:
+            (np.ndarray | None): Writable view of the next slot, or None if the ring was closed while waiting.
+        """
+        state = self.state  # head, tail, dropped, closed
+        with self.cond:
+            while state[0] - state[1] >= self.capacity and not state[3]:
+                if drop:  # overwrite the newest unread frame, read frames are never touched
+                    state[0] -= 1
+                    state[2] += 1
+                else:
+                    self.cond.wait()
+            return None if state[3] else self.data[state[0] % len(self.data)]
+
+    def commit(self):
+        """Publish the frame written to the current slot and wake up waiting readers."""
+        with self.cond:
+            self.state[0] += 1
+            self.cond.notify_all()
+
+    def get(self, latest: bool = False, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Return the next unread frame as a view into the ring.
+
+        Args:
+            latest (bool): Return the most recent frame and drop all older unread frames.
+            timeout (float, optional): Maximum seconds to wait for a frame.
+
+        Returns:
+            (np.ndarray | None): Frame view, or None if no frame arrived within the timeout or the ring is closed.
+        """
+        state = self.state  # head, tail, dropped, closed
+        with self.cond:
+            if not self.cond.wait_for(lambda: state[0] > state[1] or state[3], timeout) or state[0] == state[1]:
+                return None
+            if latest:
+                state[2] += state[0] - state[1] - 1
+                state[1] = state[0] - 1
+            im = self.data[state[1] % len(self.data)]
+            state[1] += 1
+            self.cond.notify_all()
+        return im
+
+    def close(self):
+        """Mark the ring closed and wake up waiting readers and writers."""
+        with self.cond:
+            self.state[3] = 1
+            self.cond.notify_all()
+
+    def unlink(self):
+        """Free the shared memory block of a multiprocess ring once all workers using it have stopped."""
+        if self.shm is not None:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:  # already unlinked
+                pass
+
+
+def decode_context():
+    """Return the multiprocessing context for decode worker processes, forking from a preloaded server if possible."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])  # workers start without re-importing torch and OpenCV
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def retrieve(cap: cv2.VideoCapture, im: np.ndarray, gray: bool = False) -> bool:
+    """
+    Decode the last grabbed frame of a video capture in place into a ring buffer slot.
+
+    Args:
+        cap (cv2.VideoCapture): Video capture with a grabbed frame.
+        im (np.ndarray): Destination slot of shape (H, W, C), frames of another size are resized into it.
+        gray (bool): Convert the frame to single-channel grayscale.
+
+    Returns:
+        (bool): Whether a frame was decoded.
+    """
+    success, frame = cap.retrieve(None if gray else im)  # decode in place into the slot
+    if success and gray:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)[..., None]
+    if success and not np.shares_memory(frame, im):  # grayscale or frame size changed
+        if frame.shape == im.shape:
+            im[:] = frame
+        else:
+            cv2.resize(frame, im.shape[1::-1], dst=im)
+    return success
+
+
+def read_stream(
+    cap: cv2.VideoCapture,
+    ring: FrameRing,
+    frames: float,
+    vid_stride: int = 1,
+    gray: bool = False,
+    drop: bool = True,
+    stream: Optional[Union[str, int]] = None,
+):
+    """
+    Read frames from a video capture and decode them in place into a ring buffer until the ring is closed.
+
+    Args:
+        cap (cv2.VideoCapture): Opened video capture, positioned after the frames already in the ring.
+        ring (FrameRing): Ring buffer to decode frames into, closed when reading stops.
+        frames (float): Maximum number of frames to read, `inf` for live streams.
+        vid_stride (int): Video frame-rate stride.
+        gray (bool): Convert frames to single-channel grayscale.
+        drop (bool): Overwrite the newest unread frame when the ring is full instead of waiting for the reader.
+        stream (str | int, optional): Source to re-open the capture from if the stream becomes unresponsive.
+    """
+    n = 0  # frame number
+    try:
+        while not ring.closed and cap.isOpened() and n < frames:
+            n += 1
+            cap.grab()  # .read() = .grab() followed by .retrieve()
+            if n % vid_stride == 0:
+                im = ring.slot(drop=drop)  # waits while a buffered ring is full
+                if im is None:
+                    break
+                if not retrieve(cap, im, gray):
+                    im[:] = 0
+                    LOGGER.warning("Video stream unresponsive, please check your IP camera connection.")
+                    cap.open(stream)  # re-open stream if signal was lost
+                ring.commit()
+    finally:
+        ring.close()
+
+
+def decode_streams(jobs: List[Tuple[Union[str, int], FrameRing, float]], vid_stride: int, gray: bool, drop: bool):
+    """
+    Capture and decode video streams in a decode worker process, one reader thread per stream.
+
+    Args:
+        jobs (List[Tuple[str | int, FrameRing, float]]): Source, shared memory ring buffer and maximum number of frames
+            of each stream. The first frame of every source is already in its ring and is skipped.
+        vid_stride (int): Video frame-rate stride.
+        gray (bool): Convert frames to single-channel grayscale.
+        drop (bool): Overwrite the newest unread frame when a ring is full instead of waiting for the reader.
+    """
+    threads = []
+    for source, ring, frames in jobs:
+        cap = cv2.VideoCapture(source)
+        cap.grab()  # first frame was read when the stream was opened
+        args = (cap, ring, frames, vid_stride, gray, drop, source)
+        threads.append(Thread(target=read_stream, args=args, daemon=True))
+        threads[-1].start()
+    for thread in threads:
+        thread.join()
+
+
+def decode_video(path: str, ring: FrameRing, vid_stride: int = 1, gray: bool = False):
+    """
+    Decode a video file into a ring buffer in a decode worker process, waiting for the reader when the ring is full.
+
+    Args:
+        path (str): Video file path.
+        ring (FrameRing): Shared memory ring buffer to decode frames into, closed at the end of the video.
+        vid_stride (int): Video frame-rate stride.
+        gray (bool): Convert frames to single-channel grayscale.
+    """
+    cap = cv2.VideoCapture(path)
+    try:
+        while not ring.closed and all(cap.grab() for _ in range(vid_stride)):
+            im = ring.slot()
+            if im is None:
+                break
+            if retrieve(cap, im, gray):
+                ring.commit()
+    finally:
+        cap.release()
+        ring.close()
+
+
 class LoadStreams:
     """
     Stream Loader for various types of video streams.
@@ -62,7 +346,7 @@ class LoadStreams:
         buffer (bool): Whether to buffer input streams.
         running (bool): Flag to indicate if the streaming thread is running.
         mode (str): Set to 'stream' indicating real-time capture.
-        imgs (List[List[np.ndarray]]): List of image frames for each stream.
+        imgs (List[FrameRing]): Frame ring buffer for each stream.
         fps (List[float]): List of FPS for each stream.
         frames (List[int]): List of total frames for each stream.
         threads (List[Thread]): List of threads for each stream.
@@ -70,6 +354,8 @@ class LoadStreams:
         caps (List[cv2.VideoCapture]): List of cv2.VideoCapture objects for each stream.
         bs (int): Batch size for processing.
         cv2_flag (int): OpenCV flag for image reading (grayscale or RGB).
+        dropped (List[int]): Number of frames dropped for each stream because they were not read in time.
+        views (int): Number of further reads returned frames stay valid for if handed out as ring views, 0 for copies.
 
     Methods:
         update: Read stream frames in daemon thread.
@@ -88,10 +374,20 @@ class LoadStreams:
     Notes:
         - The class uses threading to efficiently load frames from multiple streams simultaneously.
         - It automatically handles YouTube links, converting them to the best available stream URL.
-        - The class implements a buffer system to manage frame storage and retrieval.
+        - Frames are decoded into a preallocated ring buffer per stream and copied out of it when read. With
+          `views=n` they are returned as views into the ring instead, valid until n further frames have been read
+          from the same stream, so consumers must not keep frames for longer than that.
     """
 
-    def __init__(self, sources: str = "file.streams", vid_stride: int = 1, buffer: bool = False, channels: int = 3):
+    def __init__(
+        self,
+        sources: str = "file.streams",
+        vid_stride: int = 1,
+        buffer: bool = False,
+        channels: int = 3,
+        decode_workers: int = 0,
+        views: int = 0,
+    ):
         """
         Initialize stream loader for multiple video sources, supporting various stream types.
 
@@ -100,6 +396,10 @@ class LoadStreams:
             vid_stride (int): Video frame-rate stride.
             buffer (bool): Whether to buffer input streams.
             channels (int): Number of image channels (1 for grayscale, 3 for RGB).
+            decode_workers (int): Number of worker processes to capture and decode streams in, sharing frames through
+                shared memory. Streams are decoded on threads of this process if 0.
+            views (int): Return frames as zero-copy views into the ring buffers that stay valid for this many further
+                reads, i.e. the depth of the consuming pipeline. Frames are copied out of the ring buffers if 0.
         """
         torch.backends.cudnn.benchmark = True  # faster for fixed-size inference
         self.buffer = buffer  # buffer input streams
@@ -107,6 +407,7 @@ class LoadStreams:
         self.mode = "stream"
         self.vid_stride = vid_stride  # video frame-rate stride
         self.cv2_flag = cv2.IMREAD_GRAYSCALE if channels == 1 else cv2.IMREAD_COLOR  # grayscale or RGB
+        self.views = views  # frames are copied out of the ring buffers if 0
 
         sources = Path(sources).read_text().rsplit() if os.path.isfile(sources) else [sources]
         n = len(sources)
@@ -115,7 +416,9 @@ class LoadStreams:
         self.frames = [0] * n
         self.threads = [None] * n
         self.caps = [None] * n  # video capture objects
-        self.imgs = [[] for _ in range(n)]  # images
+        self.imgs = [None] * n  # frame ring buffers
+        self.workers = []  # decode worker processes
+        ctx = decode_context() if decode_workers > 0 else None
         self.shape = [[] for _ in range(n)]  # image shapes
         self.sources = [ops.clean_str(x).replace(os.sep, "_") for x in sources]  # clean source names for later
         for i, s in enumerate(sources):  # index, source
@@ -145,43 +448,47 @@ class LoadStreams:
             im = cv2.cvtColor(im, cv2.COLOR_BGR2GRAY)[..., None] if self.cv2_flag == cv2.IMREAD_GRAYSCALE else im
             if not success or im is None:
                 raise ConnectionError(f"{st}Failed to read images from {s}")
-            self.imgs[i].append(im)
+            capacity = 30 if self.buffer else 1  # <=30-image buffer, or the latest frame only
+            self.imgs[i] = FrameRing(im.shape, capacity=capacity, hold=max(views, 1), ctx=ctx)
+            self.imgs[i].slot()[:] = im
+            self.imgs[i].commit()
             self.shape[i] = im.shape
-            self.threads[i] = Thread(target=self.update, args=([i, self.caps[i], s]), daemon=True)
             LOGGER.info(f"{st}Success ✅ ({self.frames[i]} frames of shape {w}x{h} at {self.fps[i]:.2f} FPS)")
-            self.threads[i].start()
+            if ctx is None:
+                self.threads[i] = Thread(target=self.update, args=([i, self.caps[i], s]), daemon=True)
+                self.threads[i].start()
+            else:
+                self.caps[i].release()  # reopened by the decode worker
+                self.threads[i] = s  # source, replaced by its worker process below
+        if ctx is not None:
+            gray, n_workers = self.cv2_flag == cv2.IMREAD_GRAYSCALE, min(decode_workers, n)
+            for k in range(n_workers):
+                jobs = [(self.threads[i], self.imgs[i], self.frames[i] - 1) for i in range(k, n, n_workers)]
+                args = (jobs, self.vid_stride, gray, not self.buffer)
+                self.workers.append(ctx.Process(target=decode_streams, args=args, daemon=True))
+                self.workers[-1].start()
+            self.threads = [self.workers[i % n_workers] for i in range(n)]
         LOGGER.info("")  # newline
 
     def update(self, i: int, cap: cv2.VideoCapture, stream: str):
-        """Read stream frames in daemon thread and update image buffer."""
-        n, f = 0, self.frames[i]  # frame number, frame array
-        while self.running and cap.isOpened() and n < (f - 1):
-            if len(self.imgs[i]) < 30:  # keep a <=30-image buffer
-                n += 1
-                cap.grab()  # .read() = .grab() followed by .retrieve()
-                if n % self.vid_stride == 0:
-                    success, im = cap.retrieve()
-                    im = (
-                        cv2.cvtColor(im, cv2.COLOR_BGR2GRAY)[..., None] if self.cv2_flag == cv2.IMREAD_GRAYSCALE else im
-                    )
-                    if not success:
-                        im = np.zeros(self.shape[i], dtype=np.uint8)
-                        LOGGER.warning("Video stream unresponsive, please check your IP camera connection.")
-                        cap.open(stream)  # re-open stream if signal was lost
-                    if self.buffer:
-                        self.imgs[i].append(im)
-                    else:
-                        self.imgs[i] = [im]
-            else:
-                time.sleep(0.01)  # wait until the buffer is empty
+        """Read stream frames in daemon thread and decode them into the stream's ring buffer."""
+        gray = self.cv2_flag == cv2.IMREAD_GRAYSCALE
+        read_stream(cap, self.imgs[i], self.frames[i] - 1, self.vid_stride, gray, drop=not self.buffer, stream=stream)
 
     def close(self):
         """Terminate stream loader, stop threads, and release video capture resources."""
         self.running = False  # stop flag for Thread
+        rings = [ring for ring in self.imgs if ring is not None]  # streams that failed to open have no ring
+        for ring in rings:
+            ring.close()  # wake up threads waiting for buffer space
         for thread in self.threads:
-            if thread.is_alive():
+            if hasattr(thread, "is_alive") and thread.is_alive():  # threads are sources until workers are started
                 thread.join(timeout=5)  # Add timeout
+        for ring in rings:
+            ring.unlink()  # free shared memory of decode worker rings
         for cap in self.caps:  # Iterate through the stored VideoCapture objects
+            if cap is None:
+                continue
             try:
                 cap.release()  # release video capture
             except Exception as e:
@@ -197,28 +504,22 @@ class LoadStreams:
         self.count += 1
 
         images = []
-        for i, x in enumerate(self.imgs):
-            # Wait until a frame is available in each buffer
-            while not x:
-                if not self.threads[i].is_alive():
+        for i, ring in enumerate(self.imgs):
+            # Wait until a frame is available in each buffer, taking the first buffered frame or the latest one
+            while (im := ring.get(latest=not self.buffer, timeout=1 / min(self.fps))) is None:
+                if ring.closed or not self.threads[i].is_alive():
                     self.close()
                     raise StopIteration
-                time.sleep(1 / min(self.fps))
-                x = self.imgs[i]
-                if not x:
-                    LOGGER.warning(f"Waiting for stream {i}")
-
-            # Get and remove the first frame from imgs buffer
-            if self.buffer:
-                images.append(x.pop(0))
-
-            # Get the last frame, and clear the rest from the imgs buffer
-            else:
-                images.append(x.pop(-1) if x else np.zeros(self.shape[i], dtype=np.uint8))
-                x.clear()
+                LOGGER.warning(f"Waiting for stream {i}")
+            images.append(im if self.views else im.copy())  # copy before the slot is reused for upcoming frames
 
         return self.sources, images, [""] * self.bs
 
+    @property
+    def dropped(self) -> List[int]:
+        """Return the number of frames dropped for each stream because they were not read in time."""
+        return [ring.dropped for ring in self.imgs]
+
     def __len__(self) -> int:
         """Return the number of video streams in the LoadStreams object."""
         return self.bs  # 1E12 frames = 32 streams at 30 FPS for 30 years
@@ -324,12 +625,16 @@ class LoadImagesAndVideos:
         count (int): Counter for iteration, initialized at 0 during __iter__().
         ni (int): Number of images.
         cv2_flag (int): OpenCV flag for image reading (grayscale or RGB).
+        decode_workers (int): Number of videos decoded ahead in worker processes, 0 to decode in this process.
+        decoders (List[tuple]): Shared memory ring buffer, worker process, FPS and frame count of each video being
+            decoded ahead, starting with the current video.
 
     Methods:
         __init__: Initialize the LoadImagesAndVideos object.
         __iter__: Returns an iterator object for VideoStream or ImageFolder.
         __next__: Returns the next batch of images or video frames along with their paths and metadata.
         _new_video: Creates a new video capture object for the given path.
+        close: Stops decode worker processes, frees their shared memory and releases the video capture.
         __len__: Returns the number of batches in the object.
 
     Examples:
@@ -344,7 +649,14 @@ class LoadImagesAndVideos:
         - Can read from a text file containing paths to images and videos.
     """
 
-    def __init__(self, path: Union[str, Path, List], batch: int = 1, vid_stride: int = 1, channels: int = 3):
+    def __init__(
+        self,
+        path: Union[str, Path, List],
+        batch: int = 1,
+        vid_stride: int = 1,
+        channels: int = 3,
+        decode_workers: int = 0,
+    ):
         """
         Initialize dataloader for images and videos, supporting various input formats.
 
@@ -353,6 +665,8 @@ class LoadImagesAndVideos:
             batch (int): Batch size for processing.
             vid_stride (int): Video frame-rate stride.
             channels (int): Number of image channels (1 for grayscale, 3 for RGB).
+            decode_workers (int): Number of worker processes decoding the current and upcoming videos ahead of
+                iteration, sharing frames through shared memory. Videos are decoded in this process if 0.
         """
         parent = None
         if isinstance(path, str) and Path(path).suffix == ".txt":  # *.txt file with img/vid/dir on each line
@@ -390,6 +704,10 @@ class LoadImagesAndVideos:
         self.vid_stride = vid_stride  # video frame-rate stride
         self.bs = batch
         self.cv2_flag = cv2.IMREAD_GRAYSCALE if channels == 1 else cv2.IMREAD_COLOR  # grayscale or RGB
+        self.decode_workers = decode_workers
+        self.decoders = []
+        self._ctx = decode_context() if decode_workers > 0 and nv else None
+        self._ahead = ni  # index of the next video to start decoding
         if any(videos):
             self._new_video(videos[0])  # new video
         else:
@@ -413,7 +731,22 @@ class LoadImagesAndVideos:
                     raise StopIteration
 
             path = self.files[self.count]
-            if self.video_flag[self.count]:
+            if self.video_flag[self.count] and self.decode_workers:
+                self.mode = "video"
+                ring, process = self.decoders[0][:2]
+                while (im0 := ring.get(timeout=1)) is None and not ring.closed and process.is_alive():
+                    pass  # wait for the worker process to decode the next frame
+                if im0 is not None:
+                    self.frame += 1
+                    paths.append(path)
+                    imgs.append(im0.copy())  # copy out of shared memory, the slot is reused for upcoming frames
+                    info.append(f"video {self.count + 1}/{self.nf} (frame {self.frame}/{self.frames}) {path}: ")
+                if im0 is None or self.frame == self.frames:  # end of video
+                    self._close_decoder()
+                    self.count += 1
+                    if self.count < self.nf:
+                        self._new_video(self.files[self.count])
+            elif self.video_flag[self.count]:
                 self.mode = "video"
                 if not self.cap or not self.cap.isOpened():
                     self._new_video(path)
@@ -475,12 +808,57 @@ class LoadImagesAndVideos:
     def _new_video(self, path: str):
         """Create a new video capture object for the given path and initialize video-related attributes."""
         self.frame = 0
+        if self.decode_workers:
+            self._decode_ahead()
+            self.cap = None
+            self.fps, self.frames = self.decoders[0][2:]
+            return
         self.cap = cv2.VideoCapture(path)
         self.fps = int(self.cap.get(cv2.CAP_PROP_FPS))
         if not self.cap.isOpened():
             raise FileNotFoundError(f"Failed to open video {path}")
         self.frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT) / self.vid_stride)
 
+    def _decode_ahead(self):
+        """Start decode worker processes for the upcoming videos until `decode_workers` videos are being decoded."""
+        gray = self.cv2_flag == cv2.IMREAD_GRAYSCALE
+        while len(self.decoders) < self.decode_workers and self._ahead < self.nf:
+            path = self.files[self._ahead]
+            self._ahead += 1
+            cap = cv2.VideoCapture(path)
+            if not cap.isOpened():
+                raise FileNotFoundError(f"Failed to open video {path}")
+            fps, frames = int(cap.get(cv2.CAP_PROP_FPS)), int(cap.get(cv2.CAP_PROP_FRAME_COUNT) / self.vid_stride)
+            shape = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 1 if gray else 3
+            cap.release()
+            ring = FrameRing(shape, capacity=8, hold=1, ctx=self._ctx)
+            process = self._ctx.Process(target=decode_video, args=(path, ring, self.vid_stride, gray), daemon=True)
+            process.start()
+            self.decoders.append((ring, process, fps, frames))
+
+    def _close_decoder(self):
+        """Stop the decode worker of the current video and free its shared memory."""
+        ring, process = self.decoders.pop(0)[:2]
+        ring.close()  # wakes up a worker waiting for buffer space
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+        ring.unlink()
+
+    def close(self):
+        """Stop all decode worker processes, free their shared memory and release the video capture."""
+        while self.decoders:
+            self._close_decoder()
+        if self.cap:
+            self.cap.release()
+
+    def __del__(self):
+        """Ensure decode workers are stopped and their shared memory is freed when the loader is deleted."""
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def __len__(self) -> int:
         """Return the number of files (images and videos) in the dataset."""
         return math.ceil(self.nf / self.bs)  # number of batches
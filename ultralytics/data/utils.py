@@ -4,12 +4,14 @@ import json
 import os
 import random
 import subprocess
+import tarfile
 import time
 import zipfile
+from copy import copy
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from tarfile import is_tarfile
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -39,6 +41,8 @@ IMG_FORMATS = {"bmp", "dng", "jpeg", "jpg", "mpo", "png", "tif", "tiff", "webp",
 VID_FORMATS = {"asf", "avi", "gif", "m4v", "mkv", "mov", "mp4", "mpeg", "mpg", "ts", "wmv", "webm"}  # video suffixes
 PIN_MEMORY = str(os.getenv("PIN_MEMORY", not MACOS)).lower() == "true"  # global pin_memory for dataloaders
 FORMATS_HELP_MSG = f"Supported formats are:\nimages: {IMG_FORMATS}\nvideos: {VID_FORMATS}"
+SHARDS_MANIFEST = "shards.json"  # manifest listing the *.tar shards of a sharded dataset and their sample counts
+SHARDS_VERSION = "1.0.0"  # sharded dataset format version
 
 
 def img2label_paths(img_paths: List[str]) -> List[str]:
@@ -138,6 +142,24 @@ def get_hash(paths: List[str]) -> str:
     return h.hexdigest()  # return hash
 
 
+def get_fingerprints(im_files: List[str], label_files: List[str]) -> List[Tuple[int, ...]]:
+    """Return the (size, mtime) of each image and label file pair as a fingerprint, with -1 for missing files."""
+
+    def fingerprint(files: Tuple[str, str]) -> Tuple[int, ...]:
+        """Return the concatenated (size, mtime) of an image and label file pair."""
+        fp = []
+        for f in files:
+            try:
+                s = os.stat(f)
+                fp += [s.st_size, s.st_mtime_ns]
+            except OSError:
+                fp += [-1, -1]
+        return tuple(fp)
+
+    with ThreadPool(NUM_THREADS) as pool:
+        return pool.map(fingerprint, zip(im_files, label_files), chunksize=256)
+
+
 def exif_size(img: Image.Image) -> Tuple[int, int]:
     """Return exif-corrected PIL size."""
     s = img.size  # (width, height)
@@ -798,3 +820,205 @@ def save_dataset_cache_file(prefix: str, path: Path, x: Dict, version: str):
         LOGGER.info(f"{prefix}New cache created: {path}")
     else:
         LOGGER.warning(f"{prefix}Cache directory {path.parent} is not writeable, cache not saved.")
+
+
+class LabelStore:
+    """
+    Columnar store of YOLO dataset labels, memory-mapped from *.npy files next to the dataset *.cache file.
+
+    Labels of all images are kept as a few concatenated arrays with offset indices instead of one dictionary of small
+    arrays per image, so loading them and forking them into dataloader workers touches no per-image Python objects and
+    workers share the mapped pages. Indexing returns the usual label dictionary of one image holding read-only views.
+
+    Attributes:
+        path (Path | None): Directory of the memory-mapped *.npy columns, None while the columns are held in memory.
+        index (np.ndarray | None): Column row of each label, set when labels are reordered for rectangular training.
+        include_class (np.ndarray | None): Classes to keep, all classes if None.
+        single_cls (bool): Whether all instances are returned as class 0.
+        use_segments (bool): Whether segments are returned, disabled for mixed box and segment datasets.
+
+    Methods:
+        from_labels: Build a store from a list of per-image label dictionaries.
+        save: Write the columns into a directory and memory-map them from there.
+        open: Memory-map the columns of a saved store.
+        update_labels: Filter instances to the included classes and optionally set all classes to 0.
+
+    Examples:
+        >>> labels = LabelStore.from_labels([{"im_file": "1.jpg", "shape": (480, 640), "cls": cls, "bboxes": boxes}])
+        >>> labels.save(Path("path/to/labels/train.labels"))
+        >>> labels[0]["bboxes"]  # read-only view into the memory-mapped bboxes column
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """Initialize the store from columns as built by LabelStore.from_labels()."""
+        self.columns = columns
+        self.names = tuple(columns)
+        self.path = None
+        self.index = None
+        self.include_class = None
+        self.single_cls = False
+        self.use_segments = True
+
+    @classmethod
+    def from_labels(cls, labels: List[Dict]) -> "LabelStore":
+        """Build a store from a list of per-image label dictionaries as returned by verify_image_label()."""
+        n = np.array([len(lb["cls"]) for lb in labels], dtype=np.int64)  # instances per image
+        points = np.array(  # segment points per instance, 0 for images without segments
+            [len(s) for lb in labels for s in (lb["segments"] or [[]] * len(lb["cls"]))], dtype=np.int64
+        )
+        files = [lb["im_file"].encode() for lb in labels]
+        columns = {
+            "files": np.frombuffer(b"".join(files), dtype=np.uint8),
+            "file_offsets": np.concatenate(([0], np.cumsum([len(f) for f in files], dtype=np.int64))),
+            "shapes": np.array([lb["shape"] for lb in labels], dtype=np.int64).reshape(-1, 2),
+            "instance_offsets": np.concatenate(([0], np.cumsum(n))),
+            "cls": np.concatenate([lb["cls"] for lb in labels] + [np.zeros((0, 1))]).astype(np.float32),
+            "bboxes": np.concatenate([lb["bboxes"] for lb in labels] + [np.zeros((0, 4))]).astype(np.float32),
+            "segment_offsets": np.concatenate(([0], np.cumsum(points))),
+            "segments": np.concatenate([s for lb in labels for s in lb["segments"]] + [np.zeros((0, 2))]),
+        }
+        columns["segments"] = columns["segments"].astype(np.float32)
+        if labels and labels[0]["keypoints"] is not None:
+            columns["keypoints"] = np.concatenate([lb["keypoints"] for lb in labels]).astype(np.float32)
+        return cls(columns)
+
+    def save(self, path: Path) -> None:
+        """Write the columns as *.npy files into directory path and memory-map them from there."""
+        path.mkdir(parents=True, exist_ok=True)
+        for f in path.glob("*.npy"):
+            if f.stem not in self.names:
+                f.unlink()  # stale column of a previous store
+        for name in self.names:
+            tmp = path / f"{name}.{os.getpid()}.tmp"  # replace, not overwrite, files other processes may have mapped
+            with open(tmp, "wb") as file:
+                np.save(file, np.ascontiguousarray(self.columns[name]), allow_pickle=False)
+            os.replace(tmp, path / f"{name}.npy")
+        self.path, self.columns = path, None
+        self.open()
+
+    def open(self) -> None:
+        """Memory-map the columns of a saved store, raising FileNotFoundError if they are missing or incomplete."""
+        if self.columns is None:
+            self.columns = {x: np.load(self.path / f"{x}.npy", mmap_mode="r") for x in self.names}
+            if len(self.columns["file_offsets"]) != len(self.columns["instance_offsets"]):
+                raise FileNotFoundError(f"incomplete label columns in {self.path}")
+
+    def update_labels(self, include_class: Optional[List[int]], single_cls: bool) -> None:
+        """Filter instances to include_class, all classes if None, and set all classes to 0 if single_cls."""
+        self.include_class = None if include_class is None else np.array(include_class).reshape(1, -1)
+        self.single_cls = single_cls
+
+    @property
+    def shapes(self) -> np.ndarray:
+        """Return the (h, w) shape of each image."""
+        self.open()
+        return self.columns["shapes"] if self.index is None else self.columns["shapes"][self.index]
+
+    @property
+    def im_files(self) -> List[str]:
+        """Return the image file of each label."""
+        self.open()
+        b, offsets = self.columns["files"].tobytes(), self.columns["file_offsets"].tolist()
+        files = [b[x:y].decode() for x, y in zip(offsets[:-1], offsets[1:])]
+        return files if self.index is None else [files[i] for i in self.index.tolist()]
+
+    def __len__(self) -> int:
+        """Return the number of labels."""
+        self.open()
+        return len(self.columns["shapes"]) if self.index is None else len(self.index)
+
+    def __getitem__(self, i: Union[int, List[int], np.ndarray]) -> Union[Dict[str, Any], "LabelStore"]:
+        """Return the label dictionary of image i, or a reordered store for a list or array of indices."""
+        self.open()
+        if not isinstance(i, (int, np.integer)):  # reorder
+            store = copy(self)
+            store.index = np.asarray(i if self.index is None else self.index[i], dtype=np.int64)
+            return store
+        i = int(i if self.index is None else self.index[i])
+        c = self.columns
+        a, b = c["instance_offsets"][i : i + 2].tolist()
+        cls, bboxes = np.asarray(c["cls"][a:b]), np.asarray(c["bboxes"][a:b])
+        keypoints = np.asarray(c["keypoints"][a:b]) if "keypoints" in c else None
+        offsets = c["segment_offsets"][a : b + 1].tolist()
+        segments = [np.asarray(c["segments"][x:y]) for x, y in zip(offsets[:-1], offsets[1:])]
+        if not self.use_segments or offsets[0] == offsets[-1]:  # no segments
+            segments = []
+        if self.include_class is not None:
+            j = (cls == self.include_class).any(1)
+            cls, bboxes = cls[j], bboxes[j]
+            segments = [s for s, keep in zip(segments, j) if keep]
+            keypoints = None if keypoints is None else keypoints[j]
+        if self.single_cls:
+            cls = np.zeros_like(cls)
+        return {
+            "im_file": c["files"][slice(*c["file_offsets"][i : i + 2].tolist())].tobytes().decode(),
+            "shape": tuple(c["shapes"][i].tolist()),
+            "cls": cls,
+            "bboxes": bboxes,
+            "segments": segments,
+            "keypoints": keypoints,
+            "normalized": True,
+            "bbox_format": "xywh",
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the label dictionaries of all images."""
+        return (self[i] for i in range(len(self)))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return the picklable state of the store, dropping memory-mapped columns so they are mapped again on use."""
+        return {**self.__dict__, "columns": None} if self.path else self.__dict__
+
+
+class LocalShardStore:
+    """
+    Object-store interface serving the files of a sharded dataset from a local directory.
+
+    Streamed datasets only call open() with names relative to the dataset root, so any object with the same method,
+    i.e. one wrapping an S3, GCS or HTTP client, can be passed in place of a local directory.
+
+    Attributes:
+        root (Path): Directory containing the shards and their manifest.
+
+    Examples:
+        >>> store = LocalShardStore("path/to/shards")
+        >>> manifest = load_shards_manifest(store)
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """Initialize the store for the directory root."""
+        self.root = Path(root)
+
+    def open(self, name: str) -> BinaryIO:
+        """Open the file name relative to the store root as a binary stream."""
+        return open(self.root / name, "rb")
+
+    def __str__(self) -> str:
+        """Return the store root."""
+        return str(self.root)
+
+
+def load_shards_manifest(store) -> Dict:
+    """Load and check the manifest of a sharded dataset from store."""
+    with store.open(SHARDS_MANIFEST) as f:
+        manifest = json.loads(f.read())
+    version = manifest["version"]
+    assert version == SHARDS_VERSION, f"unsupported sharded dataset version {version} in {store}"
+    return manifest
+
+
+def read_shard(store, name: str) -> Iterator[Tuple[Dict, bytes]]:
+    """
+    Stream the (label, encoded image) samples of the *.tar shard name from store.
+
+    The shard is read sequentially in a single pass, so store.open() may return a non-seekable network stream.
+    """
+    pending = {}  # members of samples with only their label or image read so far
+    with store.open(name) as f, tarfile.open(fileobj=f, mode="r|") as tar:
+        for member in tar:
+            if member.isfile():
+                key, _, suffix = member.name.rpartition(".")
+                pending.setdefault(key, {})[suffix == "json"] = tar.extractfile(member).read()
+                if len(pending[key]) == 2:  # label and image
+                    x = pending.pop(key)
+                    yield json.loads(x[True]), x[False]
@@ -587,17 +587,22 @@ class Model(torch.nn.Module):
             >>> results = model.track(source="path/to/video.mp4", show=True)
             >>> for r in results:
             ...     print(r.boxes.id)  # print tracking IDs
+            >>> results = model.track(source="path/to/video.mp4", lookahead=4, batch=32)  # offline, same IDs
 
         Notes:
             - This method sets a default confidence threshold of 0.1 for ByteTrack-based tracking.
             - The tracking mode is explicitly set in the keyword arguments.
-            - Batch size is set to 1 for tracking in videos.
+            - Batch size is set to 1 for tracking in videos, or 16 for offline tracking with `lookahead`. Frames are
+              always applied to the tracker in order, so both modes produce the same track IDs.
         """
         if not hasattr(self.predictor, "trackers"):
             from ultralytics.trackers import register_tracker
 
             register_tracker(self, persist)
         kwargs["conf"] = kwargs.get("conf") or 0.1  # ByteTrack-based method needs low confidence predictions as input
+        if kwargs.get("lookahead"):  # offline tracking, detect batches on worker threads ahead of the tracker
+            kwargs["pipeline"] = True
+            kwargs["batch"] = kwargs.get("batch") or 16
         kwargs["batch"] = kwargs.get("batch") or 1  # batch-size 1 for tracking in videos
         kwargs["mode"] = "track"
         return self.predict(source=source, stream=stream, **kwargs)
@@ -33,8 +33,10 @@ Usage - formats:
 """
 
 import platform
+import queue
 import re
 import threading
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
@@ -49,7 +51,7 @@ from ultralytics.nn.autobackend import AutoBackend
 from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
 from ultralytics.utils.checks import check_imgsz, check_imshow
 from ultralytics.utils.files import increment_path
-from ultralytics.utils.torch_utils import select_device, smart_inference_mode
+from ultralytics.utils.torch_utils import TORCH_1_9, select_device, smart_inference_mode
 
 STREAM_WARNING = """
 inference results will accumulate in RAM unless `stream=True` is passed, causing potential out-of-memory
@@ -90,14 +92,21 @@ class BasePredictor:
         callbacks (Dict[str, List[callable]]): Callback functions for different events.
         txt_path (Path): Path to save text results.
         _lock (threading.Lock): Lock for thread-safe inference.
+        _stage (threading.local): Per-thread stage state, holding the batch each pipeline worker is processing.
+        _frame (int | None): Source frame count captured with the current batch in pipelined mode.
+        _buffer (tuple): Reusable uint8 letterbox batch buffer and the CUDA event of its last non-blocking upload.
 
     Methods:
         preprocess: Prepare input image before inference.
+        letterbox_batch: Letterbox a list of images into one reusable uint8 batch buffer.
+        normalize_batch: Upload a uint8 batch buffer and convert it to a normalized model input.
         inference: Run inference on a given image.
         postprocess: Process raw predictions into structured results.
         predict_cli: Run prediction for command line interface.
         setup_source: Set up input source and inference mode.
         stream_inference: Stream inference on input source.
+        pipeline_inference: Run decode, preprocess, inference and postprocess as overlapping stages.
+        write_batch: Attach speeds to batch results and visualize, save and log them.
         setup_model: Initialize and configure the model.
         write_results: Write inference results to files.
         save_predicted_images: Save prediction visualizations.
@@ -135,10 +144,14 @@ class BasePredictor:
         self.device = None
         self.dataset = None
         self.vid_writer = {}  # dict of {save_path: video_writer, ...}
+        self.sink = None  # columnar results writer if save_columns=True
         self.plotted_img = None
         self.source_type = None
         self.seen = 0
         self.windows = []
+        self._stage = threading.local()  # per-thread batch for pipeline stage workers
+        self._frame = None
+        self._buffer = None, None  # reusable letterbox batch buffer and its pending upload event
         self.batch = None
         self.results = None
         self.transforms = None
@@ -147,6 +160,16 @@ class BasePredictor:
         self._lock = threading.Lock()  # for automatic thread-safe inference
         callbacks.add_integration_callbacks(self)
 
+    @property
+    def batch(self):
+        """Return the current batch, resolved per worker thread when running with `pipeline=True`."""
+        return getattr(self._stage, "batch", self._batch)
+
+    @batch.setter
+    def batch(self, batch):
+        """Set the current batch."""
+        self._batch = batch
+
     def preprocess(self, im: Union[torch.Tensor, List[np.ndarray]]) -> torch.Tensor:
         """
         Prepare input image before inference.
@@ -158,6 +181,10 @@ class BasePredictor:
             (torch.Tensor): Preprocessed image tensor of shape (N, 3, H, W).
         """
         not_tensor = not isinstance(im, torch.Tensor)
+        if not_tensor and type(self).pre_transform is BasePredictor.pre_transform:
+            buffer = self.letterbox_batch(im)
+            if buffer is not None:
+                return self.normalize_batch(buffer)
         if not_tensor:
             im = np.stack(self.pre_transform(im))
             if im.shape[-1] == 3:
@@ -191,15 +218,72 @@ class BasePredictor:
         Returns:
             (List[np.ndarray]): List of transformed images.
         """
+        letterbox = self.get_letterbox(im)
+        return [letterbox(image=x) for x in im]
+
+    def get_letterbox(self, im: List[np.ndarray]) -> LetterBox:
+        """Return the LetterBox transform for a list of images, using minimum rectangles only for same-shape batches."""
         same_shapes = len({x.shape for x in im}) == 1
-        letterbox = LetterBox(
+        return LetterBox(
             self.imgsz,
             auto=same_shapes
             and self.args.rect
             and (self.model.pt or (getattr(self.model, "dynamic", False) and not self.model.imx)),
             stride=self.model.stride,
         )
-        return [letterbox(image=x) for x in im]
+
+    def letterbox_batch(self, im: List[np.ndarray]) -> Optional[torch.Tensor]:
+        """
+        Letterbox a list of images into one reusable uint8 batch buffer.
+
+        The buffer is allocated once per batch shape, pinned when the model runs on CUDA, and reused for every batch of
+        the same shape so that frames are resized straight into their upload slot.
+
+        Args:
+            im (List[np.ndarray]): List of images with shape [(H, W, C) x N].
+
+        Returns:
+            (torch.Tensor | None): Batch buffer of shape (N, H, W, C), or None if the images cannot share a buffer.
+        """
+        if not all(isinstance(x, np.ndarray) and x.ndim == 3 and x.dtype == np.uint8 for x in im):
+            return None
+        buffer, event = self._buffer
+        if event is not None:
+            event.synchronize()  # previous non-blocking upload from the buffer must finish before it is overwritten
+        out = self.get_letterbox(im).batch(im, out=None if buffer is None else buffer.numpy())
+        if out is None:
+            return None
+        if buffer is None or tuple(buffer.shape) != out.shape:
+            buffer = torch.from_numpy(out)
+            if self.device.type == "cuda":
+                buffer = buffer.pin_memory()
+        self._buffer = buffer, None
+        return buffer
+
+    def normalize_batch(self, buffer: torch.Tensor) -> torch.Tensor:
+        """
+        Upload a uint8 (N, H, W, C) batch buffer and convert it to a normalized (N, C, H, W) model input.
+
+        The buffer is copied to the device once as uint8, then the BGR to RGB flip, BHWC to BCHW layout change, dtype
+        cast and division by 255 are done in a single on-device pass per channel.
+
+        Args:
+            buffer (torch.Tensor): Letterboxed BGR images of shape (N, H, W, C) with dtype uint8.
+
+        Returns:
+            (torch.Tensor): Preprocessed image tensor of shape (N, C, H, W).
+        """
+        x = buffer.to(self.device, non_blocking=True).permute(0, 3, 1, 2)  # BHWC to BCHW view
+        if x.device != buffer.device:
+            event = torch.cuda.Event() if self.device.type == "cuda" else None
+            if event is not None:
+                event.record()
+            self._buffer = buffer, event
+        im = torch.empty(x.shape, dtype=torch.half if self.model.fp16 else torch.float, device=self.device)
+        c = x.shape[1]
+        for i in range(c):
+            torch.div(x[:, c - 1 - i] if c == 3 else x[:, i], 255, out=im[:, i])  # BGR to RGB, 0-255 to 0.0-1.0
+        return im
 
     def postprocess(self, preds, img, orig_imgs):
         """Post-process predictions for an image and return them."""
@@ -261,7 +345,9 @@ class BasePredictor:
             batch=self.args.batch,
             vid_stride=self.args.vid_stride,
             buffer=self.args.stream_buffer,
+            views=self.args.stream_views,
             channels=getattr(self.model, "ch", 3),
+            decode_workers=self.args.decode_workers,
         )
         self.source_type = self.dataset.source_type
         if not getattr(self, "stream", True) and (
@@ -302,6 +388,10 @@ class BasePredictor:
             # Check if save_dir/ label file exists
             if self.args.save or self.args.save_txt:
                 (self.save_dir / "labels" if self.args.save_txt else self.save_dir).mkdir(parents=True, exist_ok=True)
+            if self.args.save_columns:
+                from ultralytics.engine.results import ResultsSink
+
+                self.sink = ResultsSink(self.save_dir / "columns")
 
             # Warmup model
             if not self.done_warmup:
@@ -317,47 +407,54 @@ class BasePredictor:
                 ops.Profile(device=self.device),
             )
             self.run_callbacks("on_predict_start")
-            for self.batch in self.dataset:
-                self.run_callbacks("on_predict_batch_start")
-                paths, im0s, s = self.batch
-
-                # Preprocess
-                with profilers[0]:
-                    im = self.preprocess(im0s)
-
-                # Inference
-                with profilers[1]:
-                    preds = self.inference(im, *args, **kwargs)
-                    if self.args.embed:
-                        yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
-                        continue
-
-                # Postprocess
-                with profilers[2]:
-                    self.results = self.postprocess(preds, im, im0s)
-                self.run_callbacks("on_predict_postprocess_end")
-
-                # Visualize, save, write results
-                n = len(im0s)
-                try:
-                    for i in range(n):
-                        self.seen += 1
-                        self.results[i].speed = {
-                            "preprocess": profilers[0].dt * 1e3 / n,
-                            "inference": profilers[1].dt * 1e3 / n,
-                            "postprocess": profilers[2].dt * 1e3 / n,
-                        }
-                        if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
-                            s[i] += self.write_results(i, Path(paths[i]), im, s)
-                except StopIteration:
-                    break
-
-                # Print batch results
-                if self.args.verbose:
-                    LOGGER.info("\n".join(s))
-
-                self.run_callbacks("on_predict_batch_end")
-                yield from self.results
+            batches = None
+            try:
+                if self.args.pipeline and not self.args.embed:
+                    batches = self.pipeline_inference(*args, lookahead=self.args.lookahead, **kwargs)
+                    for self.batch, self._frame, im, self.results, dt in batches:
+                        self.run_callbacks("on_predict_batch_start")
+                        for p, k in zip(profilers, ("preprocess", "inference", "postprocess")):
+                            p.t += dt[k]
+                        self.run_callbacks("on_predict_postprocess_end")
+                        if not self.write_batch(im, {k: v * 1e3 for k, v in dt.items()}):
+                            break
+                        yield from self.results
+                    self._frame = None
+                else:
+                    for self.batch in self.dataset:
+                        self.run_callbacks("on_predict_batch_start")
+                        paths, im0s, s = self.batch
+
+                        # Preprocess
+                        with profilers[0]:
+                            im = self.preprocess(im0s)
+
+                        # Inference
+                        with profilers[1]:
+                            preds = self.inference(im, *args, **kwargs)
+                            if self.args.embed:
+                                yield from [preds] if isinstance(preds, torch.Tensor) else preds  # embedding tensors
+                                continue
+
+                        # Postprocess
+                        with profilers[2]:
+                            self.results = self.postprocess(preds, im, im0s)
+                        self.run_callbacks("on_predict_postprocess_end")
+
+                        # Visualize, save, write results
+                        speed = {k: p.dt * 1e3 for k, p in zip(("preprocess", "inference", "postprocess"), profilers)}
+                        if not self.write_batch(im, speed):
+                            break
+                        yield from self.results
+            finally:
+                if batches is not None:
+                    batches.close()  # stop pipeline workers before their source is closed
+                close = getattr(self.dataset, "close", None)
+                if close:  # stop decoders and free their shared memory also on early break or error
+                    close()
+                if self.sink:  # write the buffered results and stop the writer thread
+                    self.sink.close()
+                    self.sink = None
 
         # Release assets
         for v in self.vid_writer.values():
@@ -374,12 +471,168 @@ class BasePredictor:
                 f"Speed: %.1fms preprocess, %.1fms inference, %.1fms postprocess per image at shape "
                 f"{(min(self.args.batch, self.seen), getattr(self.model, 'ch', 3), *im.shape[2:])}" % t
             )
-        if self.args.save or self.args.save_txt or self.args.save_crop:
+        if self.args.save or self.args.save_txt or self.args.save_crop or self.args.save_columns:
             nl = len(list(self.save_dir.glob("labels/*.txt")))  # number of labels
             s = f"\n{nl} label{'s' * (nl > 1)} saved to {self.save_dir / 'labels'}" if self.args.save_txt else ""
+            if self.args.save_columns:
+                s += f"\nColumnar results saved to {self.save_dir / 'columns'}"
             LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
         self.run_callbacks("on_predict_end")
 
+    def write_batch(self, im: torch.Tensor, speed: Dict[str, float]) -> bool:
+        """
+        Attach speeds to the current batch results, then visualize, save and log them.
+
+        Args:
+            im (torch.Tensor): Preprocessed image tensor of the current batch.
+            speed (Dict[str, float]): Batch times in milliseconds keyed by stage, divided evenly across the images.
+
+        Returns:
+            (bool): False if the user requested to stop, True otherwise.
+        """
+        paths, im0s, s = self.batch
+        n = len(im0s)
+        try:
+            for i in range(n):
+                self.seen += 1
+                self.results[i].speed = {k: v / n for k, v in speed.items()}
+                if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
+                    s[i] += self.write_results(i, Path(paths[i]), im, s)
+        except StopIteration:
+            return False
+
+        if self.sink:
+            self.sink.append(self.results)
+
+        # Print batch results
+        if self.args.verbose:
+            LOGGER.info("\n".join(s))
+
+        self.run_callbacks("on_predict_batch_end")
+        return True
+
+    def pipeline_inference(self, *args, maxsize: int = 2, lookahead: int = 0, **kwargs):
+        """
+        Run source decoding, preprocess, inference and postprocess as overlapping stages on worker threads.
+
+        Each stage has one worker connected to the next by a bounded queue, so batches leave the pipeline in source
+        order while the CPU stages overlap with model inference. Throughput approaches that of the slowest stage rather
+        than the sum of all stages. Worker exceptions are re-raised in the calling thread.
+
+        Args:
+            *args (Any): Additional arguments for the inference method.
+            maxsize (int): Maximum number of batches waiting in each queue between stages.
+            lookahead (int): Maximum number of post-processed batches waiting for the consumer, e.g. a tracker that
+                applies detections in frame order, if larger than maxsize.
+            **kwargs (Any): Additional keyword arguments for the inference method.
+
+        Yields:
+            batch (tuple): Source batch of (paths, im0s, s).
+            frame (int | None): Source frame count at the time the batch was decoded.
+            im (torch.Tensor): Preprocessed image tensor.
+            results (List[Results]): Post-processed results.
+            dt (Dict[str, float]): Batch times in seconds for the 'decode', 'preprocess', 'inference' and
+                'postprocess' stages, and total time the stages spent waiting on their input queue ('queue').
+        """
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=maxsize) for _ in range(3)] + [queue.Queue(maxsize=max(maxsize, lookahead))]
+
+        def put(q, item):
+            """Put item on queue q, giving up if the pipeline is stopped."""
+            while not stop.is_set():
+                try:
+                    return q.put(item, timeout=0.1)
+                except queue.Full:
+                    pass
+
+        def get(q, item=None):
+            """Get the next item from queue q, adding the time spent waiting to its 'queue' time."""
+            t = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    item = q.get(timeout=0.1)
+                    break
+                except queue.Empty:
+                    pass
+            if isinstance(item, dict):
+                item["dt"]["queue"] += time.perf_counter() - t
+            return item
+
+        def decode():
+            """Decode source batches into the first queue."""
+            try:
+                it = iter(self.dataset)
+                while not stop.is_set():
+                    t = time.perf_counter()
+                    batch = next(it, None)
+                    if batch is None:
+                        break
+                    dt = dict(decode=time.perf_counter() - t, preprocess=0.0, inference=0.0, postprocess=0.0, queue=0.0)
+                    put(queues[0], {"batch": batch, "frame": getattr(self.dataset, "count", None), "dt": dt})
+                put(queues[0], None)
+            except Exception as e:
+                put(queues[0], e)
+
+        def stage(name, fn, src, dst):
+            """Apply fn to every item from queue src and forward it to queue dst, timing the work under name."""
+            profile = ops.Profile(device=self.device)
+            grad_mode = (torch.inference_mode if TORCH_1_9 else torch.no_grad)()  # grad mode is thread-local
+            while not stop.is_set():
+                item = get(src)
+                if isinstance(item, dict):
+                    try:
+                        self._stage.batch = item["batch"]
+                        with profile, grad_mode:
+                            fn(item)
+                        item["dt"][name] = profile.dt
+                    except Exception as e:
+                        item = e
+                put(dst, item)
+                if not isinstance(item, dict):  # end of source or error
+                    break
+
+        def preprocess(item):
+            """Preprocess stage."""
+            item["im"] = self.preprocess(item["batch"][1])
+
+        def copy(x):
+            """Copy an output out of the bound buffer that the next batch overwrites."""
+            return x.clone() if isinstance(x, torch.Tensor) else x.copy()
+
+        def inference(item):
+            """Inference stage."""
+            preds = self.inference(item["im"], *args, **kwargs)
+            if self.model.engine or (self.model.onnx and not getattr(self.model, "dynamic", False)):  # IO bindings
+                preds = [copy(x) for x in preds] if isinstance(preds, (list, tuple)) else copy(preds)
+            item["preds"] = preds
+            item["feats"] = getattr(self, "_feats", None)  # written by forward hooks on this thread, e.g. for ReID
+
+        def postprocess(item):
+            """Postprocess stage."""
+            self._stage.feats = item.pop("feats")
+            item["results"] = self.postprocess(item.pop("preds"), item["im"], item["batch"][1])
+
+        workers = [threading.Thread(target=decode, daemon=True)] + [
+            threading.Thread(target=stage, args=(name, fn, queues[i], queues[i + 1]), daemon=True)
+            for i, (name, fn) in enumerate(
+                (("preprocess", preprocess), ("inference", inference), ("postprocess", postprocess))
+            )
+        ]
+        for w in workers:
+            w.start()
+        try:
+            while True:
+                item = get(queues[-1])
+                if isinstance(item, Exception):
+                    raise item
+                if item is None:
+                    break
+                yield item["batch"], item["frame"], item["im"], item["results"], item["dt"]
+        finally:
+            stop.set()
+            for w in workers:
+                w.join(timeout=1)
+
     def setup_model(self, model, verbose: bool = True):
         """
         Initialize YOLO model with given parameters and set it to evaluation mode.
@@ -396,6 +649,7 @@ class BasePredictor:
             fp16=self.args.half,
             fuse=True,
             verbose=verbose,
+            numpy_outputs=self.args.numpy_postprocess,
         )
 
         self.device = self.model.device  # update device
@@ -422,7 +676,7 @@ class BasePredictor:
             im = im[None]  # expand for batch dim
         if self.source_type.stream or self.source_type.from_img or self.source_type.tensor:  # batch_size >= 1
             string += f"{i}: "
-            frame = self.dataset.count
+            frame = self.dataset.count if self._frame is None else self._frame
         else:
             match = re.search(r"frame (\d+)/", s[i])
             frame = int(match[1]) if match else None  # 0 if frame undetermined
@@ -6,7 +6,7 @@ Usage: See https://docs.ultralytics.com/modes/predict/
 """
 
 from copy import deepcopy
-from functools import lru_cache
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -14,7 +14,7 @@ import numpy as np
 import torch
 
 from ultralytics.data.augment import LetterBox
-from ultralytics.utils import LOGGER, DataExportMixin, SimpleClass, ops
+from ultralytics.utils import LOGGER, DataExportMixin, SimpleClass, ops, ops_numpy
 from ultralytics.utils.plotting import Annotator, colors, save_one_box
 
 
@@ -258,7 +258,8 @@ class Results(SimpleClass, DataExportMixin):
             path (str): The path to the image file.
             names (dict): A dictionary of class names.
             boxes (torch.Tensor | None): A 2D tensor of bounding box coordinates for each detection.
-            masks (torch.Tensor | None): A 3D tensor of detection masks, where each mask is a binary image.
+            masks (torch.Tensor | Masks | None): A 3D tensor of detection masks, where each mask is a binary image, or
+                lazily assembled masks created with `Masks.from_protos`.
             probs (torch.Tensor | None): A 1D tensor of probabilities of each class for classification task.
             keypoints (torch.Tensor | None): A 2D tensor of keypoint coordinates for each detection.
             obb (torch.Tensor | None): A 2D tensor of oriented bounding box coordinates for each detection.
@@ -280,7 +281,9 @@ class Results(SimpleClass, DataExportMixin):
         self.orig_img = orig_img
         self.orig_shape = orig_img.shape[:2]
         self.boxes = Boxes(boxes, self.orig_shape) if boxes is not None else None  # native size boxes
-        self.masks = Masks(masks, self.orig_shape) if masks is not None else None  # native size or imgsz masks
+        self.masks = (  # native size or imgsz masks
+            masks if isinstance(masks, Masks) or masks is None else Masks(masks, self.orig_shape)
+        )
         self.probs = Probs(probs) if probs is not None else None
         self.keypoints = Keypoints(keypoints, self.orig_shape) if keypoints is not None else None
         self.obb = OBB(obb, self.orig_shape) if obb is not None else None
@@ -355,7 +358,7 @@ class Results(SimpleClass, DataExportMixin):
         if boxes is not None:
             self.boxes = Boxes(ops.clip_boxes(boxes, self.orig_shape), self.orig_shape)
         if masks is not None:
-            self.masks = Masks(masks, self.orig_shape)
+            self.masks = masks if isinstance(masks, Masks) else Masks(masks, self.orig_shape)
         if probs is not None:
             self.probs = probs
         if obb is not None:
@@ -546,10 +549,11 @@ class Results(SimpleClass, DataExportMixin):
 
         # Plot Segment results
         if pred_masks and show_masks:
+            masks_data = torch.as_tensor(pred_masks.data)  # NumPy masks from non-PyTorch backends
             if im_gpu is None:
                 img = LetterBox(pred_masks.shape[1:])(image=annotator.result())
                 im_gpu = (
-                    torch.as_tensor(img, dtype=torch.float16, device=pred_masks.data.device)
+                    torch.as_tensor(img, dtype=torch.float16, device=masks_data.device)
                     .permute(2, 0, 1)
                     .flip(0)
                     .contiguous()
@@ -562,7 +566,7 @@ class Results(SimpleClass, DataExportMixin):
                 if pred_boxes and color_mode == "class"
                 else reversed(range(len(pred_masks)))
             )
-            annotator.masks(pred_masks.data, colors=[colors(x, True) for x in idx], im_gpu=im_gpu)
+            annotator.masks(masks_data, colors=[colors(x, True) for x in idx], im_gpu=im_gpu)
 
         # Plot Detect results
         if pred_boxes is not None and show_boxes:
@@ -733,12 +737,13 @@ class Results(SimpleClass, DataExportMixin):
             # Detect/segment/pose
             for j, d in enumerate(boxes):
                 c, conf, id = int(d.cls), float(d.conf), int(d.id.item()) if d.is_track else None
-                line = (c, *(d.xyxyxyxyn.view(-1) if is_obb else d.xywhn.view(-1)))
+                line = (c, *(d.xyxyxyxyn.reshape(-1) if is_obb else d.xywhn.reshape(-1)))
                 if masks:
                     seg = masks[j].xyn[0].copy().reshape(-1)  # reversed mask.xyn, (n,2) to (n*2)
                     line = (c, *seg)
                 if kpts is not None:
-                    kpt = torch.cat((kpts[j].xyn, kpts[j].conf[..., None]), 2) if kpts[j].has_visible else kpts[j].xyn
+                    kpt = kpts[j].cpu().numpy()
+                    kpt = np.concatenate((kpt.xyn, kpt.conf[..., None]), 2) if kpt.has_visible else kpt.xyn
                     line += (*kpt.reshape(-1).tolist(),)
                 line += (conf,) * save_conf + (() if id is None else (id,))
                 texts.append(("%g " * len(line)).rstrip() % line)
@@ -842,11 +847,11 @@ class Results(SimpleClass, DataExportMixin):
                     "y": (self.masks.xy[i][:, 1] / h).round(decimals).tolist(),
                 }
             if self.keypoints is not None:
-                x, y, visible = self.keypoints[i].data[0].cpu().unbind(dim=1)  # torch Tensor
+                x, y, visible = self.keypoints[i].cpu().numpy().data[0].T
                 result["keypoints"] = {
-                    "x": (x / w).numpy().round(decimals).tolist(),  # decimals named argument required
-                    "y": (y / h).numpy().round(decimals).tolist(),
-                    "visible": visible.numpy().round(decimals).tolist(),
+                    "x": (x / w).round(decimals).tolist(),  # decimals named argument required
+                    "y": (y / h).round(decimals).tolist(),
+                    "visible": visible.round(decimals).tolist(),
                 }
             results.append(result)
 
@@ -1001,8 +1006,7 @@ class Boxes(BaseTensor):
         """
         return self.data[:, -3] if self.is_track else None
 
-    @property
-    @lru_cache(maxsize=2)
+    @cached_property
     def xywh(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Convert bounding boxes from [x1, y1, x2, y2] format to [x, y, width, height] format.
@@ -1022,8 +1026,7 @@ class Boxes(BaseTensor):
         """
         return ops.xyxy2xywh(self.xyxy)
 
-    @property
-    @lru_cache(maxsize=2)
+    @cached_property
     def xyxyn(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Return normalized bounding box coordinates relative to the original image size.
@@ -1046,8 +1049,7 @@ class Boxes(BaseTensor):
         xyxy[..., [1, 3]] /= self.orig_shape[0]
         return xyxy
 
-    @property
-    @lru_cache(maxsize=2)
+    @cached_property
     def xywhn(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Return normalized bounding boxes in [x, y, width, height] format.
@@ -1077,7 +1079,9 @@ class Masks(BaseTensor):
     A class for storing and manipulating detection masks.
 
     This class extends BaseTensor and provides functionality for handling segmentation masks,
-    including methods for converting between pixel and normalized coordinates.
+    including methods for converting between pixel and normalized coordinates. Masks created with `from_protos` keep
+    the mask prototypes and coefficients and are only assembled on first access of `data`, `xy` or `xyn`, while
+    length, indexing and device transfers work on the coefficients.
 
     Attributes:
         data (torch.Tensor | np.ndarray): The raw tensor or array containing mask data.
@@ -1086,6 +1090,7 @@ class Masks(BaseTensor):
         xyn (List[np.ndarray]): A list of normalized segments.
 
     Methods:
+        from_protos: Create masks assembled from mask prototypes on first access.
         cpu: Return a copy of the Masks object with the mask tensor on CPU memory.
         numpy: Return a copy of the Masks object with the mask tensor as a numpy array.
         cuda: Return a copy of the Masks object with the mask tensor on GPU memory.
@@ -1118,8 +1123,106 @@ class Masks(BaseTensor):
             masks = masks[None, :]
         super().__init__(masks, orig_shape)
 
+    @classmethod
+    def from_protos(
+        cls,
+        protos: Union[torch.Tensor, np.ndarray],
+        coefficients: Union[torch.Tensor, np.ndarray],
+        boxes: Union[torch.Tensor, np.ndarray],
+        shape: Tuple[int, int],
+        orig_shape: Tuple[int, int],
+        native: bool = False,
+    ) -> "Masks":
+        """
+        Create masks that are assembled from mask prototypes on first access of their data.
+
+        Args:
+            protos (torch.Tensor | np.ndarray): Mask prototypes with shape (mask_dim, mask_h, mask_w).
+            coefficients (torch.Tensor | np.ndarray): Mask coefficients with shape (N, mask_dim).
+            boxes (torch.Tensor | np.ndarray): Boxes the masks are cropped to, in xyxy pixels of `shape`.
+            shape (Tuple[int, int]): Height and width of the assembled masks.
+            orig_shape (Tuple[int, int]): The original image shape as (height, width).
+            native (bool): Whether masks are assembled at native resolution as with `retina_masks=True`.
+
+        Returns:
+            (Masks): Masks whose data is computed with `process_mask` or `process_mask_native` when first accessed.
+        """
+        masks = cls.__new__(cls)
+        masks._source = protos, coefficients, boxes, tuple(shape), native
+        masks._data = None
+        masks.orig_shape = orig_shape
+        return masks
+
     @property
-    @lru_cache(maxsize=1)
+    def data(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return the mask data, assembling it from the mask prototypes on first access of lazy masks."""
+        if self._source is not None:
+            protos, coefficients, boxes, shape, native = self._source
+            mask_ops = ops_numpy if isinstance(coefficients, np.ndarray) else ops
+            if not len(coefficients):  # interpolation needs at least one mask
+                self._data = coefficients.reshape(0, *shape)
+            elif native:
+                self._data = mask_ops.process_mask_native(protos, coefficients, boxes, shape)
+            else:
+                self._data = mask_ops.process_mask(protos, coefficients, boxes, shape, upsample=True)
+            self._source = None
+        return self._data
+
+    @data.setter
+    def data(self, data: Union[torch.Tensor, np.ndarray]) -> None:
+        """Set the mask data and clear segments cached from the previous data."""
+        self._data, self._source = data, None
+        self.__dict__.pop("xy", None)
+        self.__dict__.pop("xyn", None)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Return the shape of the mask data without assembling lazy masks."""
+        return self._data.shape if self._source is None else (len(self._source[1]), *self._source[3])
+
+    def _apply_source(self, fn) -> "Masks":
+        """Return lazy masks with fn applied to the prototypes, coefficients and boxes."""
+        protos, coefficients, boxes, shape, native = self._source
+        return Masks.from_protos(fn(protos), fn(coefficients), fn(boxes), shape, self.orig_shape, native)
+
+    def cpu(self) -> "Masks":
+        """Return a copy of the masks on CPU memory, keeping lazy masks unassembled."""
+        if self._source is None:
+            return super().cpu()
+        return self._apply_source(lambda x: x if isinstance(x, np.ndarray) else x.cpu())
+
+    def numpy(self) -> "Masks":
+        """Return a copy of the masks as numpy arrays, keeping lazy masks unassembled."""
+        if self._source is None:
+            return super().numpy()
+        return self._apply_source(lambda x: x if isinstance(x, np.ndarray) else x.numpy())
+
+    def cuda(self) -> "Masks":
+        """Return a copy of the masks on GPU memory, keeping lazy masks unassembled."""
+        if self._source is None:
+            return super().cuda()
+        return self._apply_source(lambda x: torch.as_tensor(x).cuda())
+
+    def to(self, *args, **kwargs) -> "Masks":
+        """Return a copy of the masks on the specified device, keeping lazy masks unassembled unless cast to a dtype."""
+        if self._source is None or any(isinstance(x, torch.dtype) for x in (*args, *kwargs.values())):
+            return super().to(*args, **kwargs)
+        return self._apply_source(lambda x: torch.as_tensor(x).to(*args, **kwargs))
+
+    def __len__(self) -> int:
+        """Return the number of masks without assembling lazy masks."""
+        return len(self._data) if self._source is None else len(self._source[1])
+
+    def __getitem__(self, idx) -> "Masks":
+        """Return the masks at idx, selecting the coefficients of lazy masks without assembling them."""
+        if self._source is None:
+            return super().__getitem__(idx)
+        protos, coefficients, boxes, shape, native = self._source
+        if isinstance(idx, int):
+            idx = [idx]  # keep the instance dimension, as assembled masks of one instance are (1, H, W)
+        return Masks.from_protos(protos, coefficients[idx], boxes[idx], shape, self.orig_shape, native)
+
+    @cached_property
     def xyn(self) -> List[np.ndarray]:
         """
         Return normalized xy-coordinates of the segmentation masks.
@@ -1143,8 +1246,7 @@ class Masks(BaseTensor):
             for x in ops.masks2segments(self.data)
         ]
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def xy(self) -> List[np.ndarray]:
         """
         Return the [x, y] pixel coordinates for each segment in the mask tensor.
@@ -1226,8 +1328,7 @@ class Keypoints(BaseTensor):
         super().__init__(keypoints, orig_shape)
         self.has_visible = self.data.shape[-1] == 3
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def xy(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Return x, y coordinates of keypoints.
@@ -1250,8 +1351,7 @@ class Keypoints(BaseTensor):
         """
         return self.data[..., :2]
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def xyn(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Return normalized coordinates (x, y) of keypoints relative to the original image size.
@@ -1272,8 +1372,7 @@ class Keypoints(BaseTensor):
         xy[..., 1] /= self.orig_shape[0]
         return xy
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def conf(self) -> Optional[Union[torch.Tensor, np.ndarray]]:
         """
         Return confidence values for each keypoint.
@@ -1357,8 +1456,7 @@ class Probs(BaseTensor):
         """
         super().__init__(probs, orig_shape)
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def top1(self) -> int:
         """
         Return the index of the class with the highest probability.
@@ -1373,8 +1471,7 @@ class Probs(BaseTensor):
         """
         return int(self.data.argmax())
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def top5(self) -> List[int]:
         """
         Return the indices of the top 5 class probabilities.
@@ -1389,8 +1486,7 @@ class Probs(BaseTensor):
         """
         return (-self.data).argsort(0)[:5].tolist()  # this way works with both torch and numpy.
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def top1conf(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Return the confidence score of the highest probability class.
@@ -1409,8 +1505,7 @@ class Probs(BaseTensor):
         """
         return self.data[self.top1]
 
-    @property
-    @lru_cache(maxsize=1)
+    @cached_property
     def top5conf(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Return confidence scores for the top 5 classification predictions.
@@ -1577,8 +1672,7 @@ class OBB(BaseTensor):
         """
         return self.data[:, -3] if self.is_track else None
 
-    @property
-    @lru_cache(maxsize=2)
+    @cached_property
     def xyxyxyxy(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Convert OBB format to 8-point (xyxyxyxy) coordinate format for rotated bounding boxes.
@@ -1596,8 +1690,7 @@ class OBB(BaseTensor):
         """
         return ops.xywhr2xyxyxyxy(self.xywhr)
 
-    @property
-    @lru_cache(maxsize=2)
+    @cached_property
     def xyxyxyxyn(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Convert rotated bounding boxes to normalized xyxyxyxy format.
@@ -1618,8 +1711,7 @@ class OBB(BaseTensor):
         xyxyxyxyn[..., 1] /= self.orig_shape[0]
         return xyxyxyxyn
 
-    @property
-    @lru_cache(maxsize=2)
+    @cached_property
     def xyxy(self) -> Union[torch.Tensor, np.ndarray]:
         """
         Convert oriented bounding boxes (OBB) to axis-aligned bounding boxes in xyxy format.
@@ -1655,3 +1747,213 @@ class OBB(BaseTensor):
             if isinstance(x, torch.Tensor)
             else np.stack([x.min(1), y.min(1), x.max(1), y.max(1)], -1)
         )
+
+
+class ResultsSink:
+    """
+    Streaming columnar writer of inference results into chunked *.npz row groups.
+
+    Results are queued by the caller and converted on a background writer thread. Each row group holds the results of
+    a run of frames as a few concatenated columns with offset indices, like a Parquet row group. A row group is written
+    once it holds `rows` instances or frames, or once its oldest result is `interval` seconds old, so memory stays flat
+    and results reach disk regularly for endless streams. Parts are written atomically as
+    `part-00000.npz`, `part-00001.npz`, ... and can be read with `ResultsSink.read` while the sink is still running.
+
+    Frame columns are `paths` and `path_offsets` (packed unique source paths of the part), `path_index`, `frame`
+    (index of the result within its source), `shape` (original h, w) and `offsets` (first instance of each frame).
+    Instance columns are `cls`, `conf`, `id` (-1 if untracked), `xyxy` or `xywhr` for OBB, `keypoints`, and masks as
+    column-major run-lengths `mask_counts` with `mask_offsets` per instance and `mask_shape` per frame. Classification
+    results store `probs` per frame.
+
+    Attributes:
+        path (Path): Directory of the row group files.
+        rows (int): Maximum number of instances or frames per row group.
+        interval (float | None): Maximum seconds a result is buffered before its row group is written.
+        parts (int): Number of row groups written.
+        error (Exception | None): Error raised on the writer thread, re-raised on the next call.
+
+    Methods:
+        append: Queue a batch of results for writing.
+        close: Write the remaining results and stop the writer thread.
+        read: Read all row groups of a sink directory into concatenated columns.
+
+    Examples:
+        >>> sink = ResultsSink("runs/detect/predict/columns")
+        >>> for result in model.predict("video.mp4", stream=True):
+        ...     sink.append([result])
+        >>> sink.close()
+        >>> columns = ResultsSink.read("runs/detect/predict/columns")
+    """
+
+    def __init__(
+        self, path: Union[str, Path], rows: int = 65536, interval: Optional[float] = 60.0, maxsize: int = 8
+    ) -> None:
+        """
+        Initialize the sink and start its writer thread.
+
+        Args:
+            path (str | Path): Directory of the row group files, parts of an earlier run are appended to.
+            rows (int): Maximum number of instances or frames per row group.
+            interval (float, optional): Maximum seconds a result is buffered before its row group is written, e.g. for
+                sparse detections on 24/7 streams. Row groups are only written by size if None.
+            maxsize (int): Maximum number of queued batches, after which `append` blocks until the writer catches up.
+        """
+        import queue
+        import threading
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.rows = rows
+        self.interval = interval
+        self.parts = len(list(self.path.glob("part-*.npz")))
+        self.error = None
+        self.frames = {}  # number of results written per source path
+        self.buffer = []
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def append(self, results: List[Results]) -> None:
+        """Queue a batch of results for writing, blocking while the queue is full."""
+        if self.error:
+            raise self.error
+        self.queue.put(list(results))
+
+    def close(self) -> None:
+        """Write the remaining results as a last row group and stop the writer thread."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        if self.error:
+            raise self.error
+
+    def _run(self) -> None:
+        """Convert queued results into frame columns and write a row group whenever `rows` or `interval` is reached."""
+        import queue
+        import time
+
+        try:
+            n, t = 0, 0.0  # buffered rows and time the oldest buffered result was queued
+            while True:
+                due = self.buffer and self.interval is not None
+                try:
+                    results = self.queue.get(timeout=max(t + self.interval - time.monotonic(), 0) if due else None)
+                except queue.Empty:  # the oldest buffered result is `interval` seconds old
+                    self._write()
+                    n = 0
+                    continue
+                if results is None:
+                    break
+                for result in results:
+                    if not self.buffer:
+                        t = time.monotonic()
+                    self.buffer.append(self._columns(result))
+                    n += max(len(self.buffer[-1]["conf"]) if "conf" in self.buffer[-1] else 0, 1)
+                    if n >= self.rows:
+                        self._write()
+                        n = 0
+            self._write()
+        except Exception as e:
+            self.error = e
+            while self.queue.get() is not None:  # keep draining so append() never blocks on a dead writer
+                pass
+
+    def _columns(self, result: Results) -> Dict[str, Any]:
+        """Return the columns of one result as NumPy arrays."""
+        frame = self.frames.get(result.path, 0)
+        self.frames[result.path] = frame + 1
+        x = {"path": result.path, "frame": frame, "shape": result.orig_shape}
+        boxes = result.obb if result.obb is not None else result.boxes
+        if boxes is not None:
+            boxes = boxes.cpu().numpy()
+            x["cls"], x["conf"] = boxes.cls.astype(np.int32), boxes.conf.astype(np.float32)
+            x["id"] = np.full(len(boxes), -1, dtype=np.int64) if boxes.id is None else boxes.id.astype(np.int64)
+            x["xywhr" if result.obb is not None else "xyxy"] = boxes.data[:, : 5 if result.obb is not None else 4]
+        if result.masks is not None:
+            x["mask_counts"], x["mask_offsets"] = ops.masks2rle(result.masks.data)
+            x["mask_shape"] = result.masks.data.shape[1:]
+        if result.keypoints is not None:
+            x["keypoints"] = result.keypoints.data.cpu().numpy().astype(np.float32)
+        if result.probs is not None:
+            x["probs"] = result.probs.data.cpu().numpy().astype(np.float32)
+        return x
+
+    def _write(self) -> None:
+        """Concatenate the buffered frames into one row group file and clear the buffer."""
+        import os
+
+        frames, self.buffer = self.buffer, []
+        if not frames:
+            return
+        paths = list(dict.fromkeys(x["path"] for x in frames))
+        index = {p: i for i, p in enumerate(paths)}
+        encoded = [p.encode() for p in paths]
+        n = [len(x["conf"]) if "conf" in x else 0 for x in frames]
+        columns = {
+            "paths": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            "path_offsets": np.concatenate(([0], np.cumsum([len(p) for p in encoded], dtype=np.int64))),
+            "path_index": np.array([index[x["path"]] for x in frames], dtype=np.int32),
+            "frame": np.array([x["frame"] for x in frames], dtype=np.int64),
+            "shape": np.array([x["shape"] for x in frames], dtype=np.int32).reshape(-1, 2),
+            "offsets": np.concatenate(([0], np.cumsum(n, dtype=np.int64))),
+        }
+        for k in "cls", "conf", "id", "xyxy", "xywhr", "keypoints", "mask_counts":
+            template = next((x[k] for x in frames if k in x), None)
+            if template is not None:  # frames without the column have no instances
+                empty = np.zeros((0, *template.shape[1:]), dtype=template.dtype)
+                columns[k] = np.concatenate([x.get(k, empty) for x in frames])
+        if "mask_counts" in columns:
+            starts = np.cumsum([0] + [x["mask_offsets"][-1] for x in frames if "mask_offsets" in x])
+            offsets = [x["mask_offsets"][1:] + s for x, s in zip((x for x in frames if "mask_offsets" in x), starts)]
+            columns["mask_offsets"] = np.concatenate([[0], *offsets]).astype(np.int64)
+            columns["mask_shape"] = np.array([x.get("mask_shape", (0, 0)) for x in frames], dtype=np.int32)
+        if all("probs" in x for x in frames):
+            columns["probs"] = np.stack([x["probs"] for x in frames])
+
+        file = self.path / f"part-{self.parts:05d}.npz"
+        with open(f"{file}.tmp", "wb") as f:
+            np.savez(f, **columns)
+        os.replace(f"{file}.tmp", file)  # readers never see partially written row groups
+        self.parts += 1
+
+    @staticmethod
+    def read(path: Union[str, Path]) -> Dict[str, np.ndarray]:
+        """
+        Read all row groups of a sink directory into concatenated columns.
+
+        Offset columns are rebased onto the concatenated instance and run-length columns, and the packed source paths
+        are decoded into a `path` column holding the source of each frame.
+
+        Args:
+            path (str | Path): Directory of the row group files.
+
+        Returns:
+            (Dict[str, np.ndarray]): Concatenated columns, empty if no row group was written yet.
+
+        Examples:
+            >>> columns = ResultsSink.read("runs/segment/predict/columns")
+            >>> i = columns["offsets"][0]  # first instance of the first frame
+            >>> a, b = columns["mask_offsets"][i : i + 2]
+            >>> mask = ops.rle2mask(columns["mask_counts"][a:b], columns["mask_shape"][0])
+        """
+        parts = []
+        for file in sorted(Path(path).glob("part-*.npz")):
+            with np.load(file) as x:
+                x = dict(x)
+            b, offsets = x.pop("paths").tobytes(), x.pop("path_offsets").tolist()
+            paths = np.array([b[i:j].decode() for i, j in zip(offsets[:-1], offsets[1:])])
+            x["path"] = paths[x.pop("path_index")]
+            parts.append(x)
+        columns = {}
+        for k in dict.fromkeys(k for x in parts for k in x):
+            t = next(x[k] for x in parts if k in x)
+            for x in parts:  # fill columns missing from row groups without instances of that kind
+                if k not in x:
+                    n = 1 if k == "mask_offsets" else len(x["frame"]) if k == "mask_shape" else 0
+                    x[k] = np.zeros((n, *t.shape[1:]), dtype=t.dtype)
+            if k in {"offsets", "mask_offsets"}:  # rebase offsets onto the concatenated columns
+                ends = np.cumsum([0] + [x[k][-1] for x in parts[:-1]])
+                columns[k] = np.concatenate([[0]] + [x[k][1:] + e for x, e in zip(parts, ends)]).astype(np.int64)
+            else:
+                columns[k] = np.concatenate([x[k] for x in parts])
+        return columns
@@ -23,6 +23,7 @@ from torch import nn, optim
 
 from ultralytics import __version__
 from ultralytics.cfg import get_cfg, get_save_dir
+from ultralytics.data.build import DevicePrefetcher
 from ultralytics.data.utils import check_cls_dataset, check_det_dataset
 from ultralytics.nn.tasks import attempt_load_one_weight, attempt_load_weights
 from ultralytics.utils import (
@@ -205,9 +206,6 @@ class BaseTrainer:
         # Run subprocess if DDP training, else train normally
         if world_size > 1 and "LOCAL_RANK" not in os.environ:
             # Argument checks
-            if self.args.rect:
-                LOGGER.warning("'rect=True' is incompatible with Multi-GPU training, setting 'rect=False'")
-                self.args.rect = False
             if self.args.batch < 1.0:
                 LOGGER.warning(
                     "'batch<1' for AutoBatch is incompatible with Multi-GPU training, setting default 'batch=16'"
@@ -373,7 +371,7 @@ class BaseTrainer:
                 warnings.simplefilter("ignore")  # suppress 'Detected lr_scheduler.step() before optimizer.step()'
                 self.scheduler.step()
             self._model_train() # set model.train()，and freeze certain layer(eg: dfl layer and BN)
-            pbar = enumerate(self.train_loader)
+            pbar = enumerate(DevicePrefetcher(self.train_loader, self.device))  # copy next batch during this step
             # Update dataloader attributes (optional)
             if epoch == (self.epochs - self.args.close_mosaic):
                 self._close_dataloader_mosaic()
@@ -381,7 +379,7 @@ class BaseTrainer:
 
             if RANK in {-1, 0}:
                 LOGGER.info(self.progress_string())
-                pbar = TQDM(enumerate(self.train_loader), total=nb)
+                pbar = TQDM(enumerate(DevicePrefetcher(self.train_loader, self.device)), total=nb)
             self.tloss = None
             for i, batch in pbar:
                 self.run_callbacks("on_train_batch_start")
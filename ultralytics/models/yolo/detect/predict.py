@@ -1,8 +1,10 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import numpy as np
+
 from ultralytics.engine.predictor import BasePredictor
 from ultralytics.engine.results import Results
-from ultralytics.utils import ops
+from ultralytics.utils import ops, ops_numpy
 
 
 class DetectionPredictor(BasePredictor):
@@ -36,10 +38,10 @@ class DetectionPredictor(BasePredictor):
         Post-process predictions and return a list of Results objects.
 
         This method applies non-maximum suppression to raw model predictions and prepares them for visualization and
-        further analysis.
+        further analysis. NumPy predictions from non-PyTorch backends are postprocessed with NumPy operations.
 
         Args:
-            preds (torch.Tensor): Raw predictions from the model.
+            preds (torch.Tensor | np.ndarray): Raw predictions from the model.
             img (torch.Tensor): Processed input image tensor in model input format.
             orig_imgs (torch.Tensor | list): Original input images before preprocessing.
             **kwargs (Any): Additional keyword arguments.
@@ -52,8 +54,10 @@ class DetectionPredictor(BasePredictor):
             >>> results = predictor.predict("path/to/image.jpg")
             >>> processed_results = predictor.postprocess(preds, img, orig_imgs)
         """
-        save_feats = getattr(self, "_feats", None) is not None
-        preds = ops.non_max_suppression(
+        feats = getattr(self._stage, "feats", getattr(self, "_feats", None))  # per batch in pipelined mode
+        save_feats = feats is not None
+        numpy = isinstance(preds[0] if isinstance(preds, (list, tuple)) else preds, np.ndarray)
+        preds = (ops_numpy if numpy else ops).non_max_suppression(
             preds,
             self.args.conf,
             self.args.iou,
@@ -70,7 +74,7 @@ class DetectionPredictor(BasePredictor):
             orig_imgs = ops.convert_torch2numpy_batch(orig_imgs)
 
         if save_feats:
-            obj_feats = self.get_obj_feats(self._feats, preds[1])
+            obj_feats = self.get_obj_feats(feats, preds[1])
             preds = preds[0]
 
         results = self.construct_results(preds, img, orig_imgs, **kwargs)
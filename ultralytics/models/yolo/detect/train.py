@@ -12,7 +12,7 @@ from ultralytics.data import build_dataloader, build_yolo_dataset
 from ultralytics.engine.trainer import BaseTrainer
 from ultralytics.models import yolo
 from ultralytics.nn.tasks import DetectionModel
-from ultralytics.utils import LOGGER, RANK
+from ultralytics.utils import RANK
 from ultralytics.utils.patches import override_configs
 from ultralytics.utils.plotting import plot_images, plot_labels, plot_results
 from ultralytics.utils.torch_utils import de_parallel, torch_distributed_zero_first
@@ -82,10 +82,7 @@ class DetectionTrainer(BaseTrainer):
         assert mode in {"train", "val"}, f"Mode must be 'train' or 'val', not {mode}."
         with torch_distributed_zero_first(rank):  # init dataset *.cache only once if DDP
             dataset = self.build_dataset(dataset_path, mode, batch_size)
-        shuffle = mode == "train"
-        if getattr(dataset, "rect", False) and shuffle:
-            LOGGER.warning("'rect=True' is incompatible with DataLoader shuffle, setting shuffle=False")
-            shuffle = False
+        shuffle = mode == "train"  # rect datasets are shuffled within aspect-ratio buckets
         workers = self.args.workers if mode == "train" else self.args.workers * 2
         return build_dataloader(dataset, batch_size, workers, shuffle, rank)  # return dataloader
 
@@ -99,7 +96,11 @@ class DetectionTrainer(BaseTrainer):
         Returns:
             (Dict): Preprocessed batch with normalized images.
         """
-        batch["img"] = batch["img"].to(self.device, non_blocking=True).float() / 255 # normalized
+        batch["img"] = batch["img"].to(self.device, non_blocking=True).float()
+        batch_transforms = getattr(self.train_loader.dataset, "batch_transforms", None)
+        if batch_transforms is not None:  # batch_augment perspective, HSV and flips on the training device
+            batch = batch_transforms(batch)
+        batch["img"] /= 255  # normalized
         if self.args.multi_scale:
             imgs = batch["img"]
             sz = (
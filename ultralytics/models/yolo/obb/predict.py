@@ -1,10 +1,11 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import numpy as np
 import torch
 
 from ultralytics.engine.results import Results
 from ultralytics.models.yolo.detect.predict import DetectionPredictor
-from ultralytics.utils import DEFAULT_CFG, ops
+from ultralytics.utils import DEFAULT_CFG, ops, ops_numpy
 
 
 class OBBPredictor(DetectionPredictor):
@@ -49,8 +50,8 @@ class OBBPredictor(DetectionPredictor):
         Construct the result object from the prediction.
 
         Args:
-            pred (torch.Tensor): The predicted bounding boxes, scores, and rotation angles with shape (N, 7) where
-                the last dimension contains [x, y, w, h, confidence, class_id, angle].
+            pred (torch.Tensor | np.ndarray): The predicted bounding boxes, scores, and rotation angles with shape
+                (N, 7) where the last dimension contains [x, y, w, h, confidence, class_id, angle].
             img (torch.Tensor): The image after preprocessing with shape (B, C, H, W).
             orig_img (np.ndarray): The original image before preprocessing.
             img_path (str): The path to the original image.
@@ -59,7 +60,8 @@ class OBBPredictor(DetectionPredictor):
             (Results): The result object containing the original image, image path, class names, and oriented bounding
                 boxes.
         """
-        rboxes = ops.regularize_rboxes(torch.cat([pred[:, :4], pred[:, -1:]], dim=-1))
+        box_ops, cat = (ops_numpy, np.concatenate) if isinstance(pred, np.ndarray) else (ops, torch.cat)
+        rboxes = box_ops.regularize_rboxes(cat([pred[:, :4], pred[:, -1:]], -1))
         rboxes[:, :4] = ops.scale_boxes(img.shape[2:], rboxes[:, :4], orig_img.shape, xywh=True)
-        obb = torch.cat([rboxes, pred[:, 4:6]], dim=-1)
+        obb = cat([rboxes, pred[:, 4:6]], -1)
         return Results(orig_img, path=img_path, names=self.model.names, obb=obb)
@@ -61,8 +61,8 @@ class PosePredictor(DetectionPredictor):
         result object.
 
         Args:
-            pred (torch.Tensor): The predicted bounding boxes, scores, and keypoints with shape (N, 6+K*D) where N is
-                the number of detections, K is the number of keypoints, and D is the keypoint dimension.
+            pred (torch.Tensor | np.ndarray): The predicted bounding boxes, scores, and keypoints with shape (N, 6+K*D)
+                where N is the number of detections, K is the number of keypoints, and D is the keypoint dimension.
             img (torch.Tensor): The processed input image tensor with shape (B, C, H, W).
             orig_img (np.ndarray): The original unprocessed image as a numpy array.
             img_path (str): The path to the original image file.
@@ -73,7 +73,7 @@ class PosePredictor(DetectionPredictor):
         """
         result = super().construct_result(pred, img, orig_img, img_path)
         # Extract keypoints from prediction and reshape according to model's keypoint shape
-        pred_kpts = pred[:, 6:].view(len(pred), *self.model.kpt_shape)
+        pred_kpts = pred[:, 6:].reshape(len(pred), *self.model.kpt_shape)
         # Scale keypoints coordinates to match the original image dimensions
         pred_kpts = ops.scale_coords(img.shape[2:], pred_kpts, orig_img.shape)
         result.update(keypoints=pred_kpts)
@@ -1,8 +1,10 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
-from ultralytics.engine.results import Results
+import numpy as np
+
+from ultralytics.engine.results import Masks, Results
 from ultralytics.models.yolo.detect.predict import DetectionPredictor
-from ultralytics.utils import DEFAULT_CFG, ops
+from ultralytics.utils import DEFAULT_CFG, ops, ops_numpy
 
 
 class SegmentationPredictor(DetectionPredictor):
@@ -90,22 +92,34 @@ class SegmentationPredictor(DetectionPredictor):
         Construct a single result object from the prediction.
 
         Args:
-            pred (np.ndarray): The predicted bounding boxes, scores, and masks.
+            pred (torch.Tensor | np.ndarray): The predicted bounding boxes, scores, and masks.
             img (torch.Tensor): The image after preprocessing.
             orig_img (np.ndarray): The original image before preprocessing.
             img_path (str): The path to the original image.
-            proto (torch.Tensor): The prototype masks.
+            proto (torch.Tensor | np.ndarray): The prototype masks.
 
         Returns:
             (Results): Result object containing the original image, image path, class names, bounding boxes, and masks.
         """
+        mask_ops = ops_numpy if isinstance(pred, np.ndarray) else ops
         if not len(pred):  # save empty boxes
             masks = None
+        elif self.args.lazy_masks:
+            # keep all predictions, filtering empty masks would require assembling them; assemble on first access
+            boxes = pred[:, :4].copy() if isinstance(pred, np.ndarray) else pred[:, :4].clone()  # input image pixels
+            proto = proto.copy() if isinstance(proto, np.ndarray) else proto.clone()  # IO-bound outputs are reused
+            pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
+            if self.args.retina_masks:  # crop at native resolution to the scaled boxes
+                boxes, shape = pred[:, :4], orig_img.shape[:2]
+            else:
+                shape = img.shape[2:]
+            masks = Masks.from_protos(proto, pred[:, 6:], boxes, shape, orig_img.shape[:2], self.args.retina_masks)
+            return Results(orig_img, path=img_path, names=self.model.names, boxes=pred[:, :6], masks=masks)
         elif self.args.retina_masks:
             pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
-            masks = ops.process_mask_native(proto, pred[:, 6:], pred[:, :4], orig_img.shape[:2])  # HWC
+            masks = mask_ops.process_mask_native(proto, pred[:, 6:], pred[:, :4], orig_img.shape[:2])  # HWC
         else:
-            masks = ops.process_mask(proto, pred[:, 6:], pred[:, :4], img.shape[2:], upsample=True)  # HWC
+            masks = mask_ops.process_mask(proto, pred[:, 6:], pred[:, :4], img.shape[2:], upsample=True)  # HWC
             pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
         if masks is not None:
             keep = masks.sum((-2, -1)) > 0  # only keep predictions with masks
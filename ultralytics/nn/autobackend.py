@@ -119,6 +119,7 @@ class AutoBackend(nn.Module):
         imx (bool): Whether the model is an IMX model.
         rknn (bool): Whether the model is an RKNN model.
         triton (bool): Whether the model is a Triton Inference Server model.
+        numpy_outputs (bool): Whether NumPy outputs are returned without conversion to tensors.
 
     Methods:
         forward: Run inference on an input image.
@@ -141,6 +142,7 @@ class AutoBackend(nn.Module):
         fp16: bool = False,
         fuse: bool = True,
         verbose: bool = True,
+        numpy_outputs: bool = False,
     ):
         """
         Initialize the AutoBackend for inference.
@@ -153,6 +155,7 @@ class AutoBackend(nn.Module):
             fp16 (bool): Enable half-precision inference. Supported only on specific backends.
             fuse (bool): Fuse Conv2D + BatchNorm layers for optimization.
             verbose (bool): Enable verbose logging.
+            numpy_outputs (bool): Return NumPy outputs of non-PyTorch backends as-is instead of converting to tensors.
         """
         super().__init__()
         w = str(weights[0] if isinstance(weights, list) else weights)
@@ -670,7 +673,7 @@ class AutoBackend(nn.Module):
                     buffer_ptr=im.data_ptr(),
                 )
                 self.session.run_with_iobinding(self.io)
-                y = self.bindings
+                y = [x.numpy() for x in self.bindings] if self.numpy_outputs and not self.cuda else self.bindings
             if self.imx:
                 if self.task == "detect":
                     # boxes, conf, cls
@@ -846,7 +849,7 @@ class AutoBackend(nn.Module):
         Returns:
             (torch.Tensor): The converted tensor
         """
-        return torch.tensor(x).to(self.device) if isinstance(x, np.ndarray) else x
+        return torch.tensor(x).to(self.device) if isinstance(x, np.ndarray) and not self.numpy_outputs else x
 
     def warmup(self, imgsz: Tuple[int, int, int, int] = (1, 3, 640, 640)) -> None:
         """
@@ -1,16 +1,16 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 from collections import deque
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import torch
+from scipy.sparse import coo_matrix
 
-from ultralytics.utils.ops import xywh2xyxy
-from ultralytics.utils.plotting import save_one_box
+from ultralytics.utils.ops import clip_boxes, xywh2xyxy, xyxy2xywh
 
 from .basetrack import TrackState
-from .byte_tracker import BYTETracker, STrack
+from .byte_tracker import BYTETracker, STrack, STrackTable
 from .utils import matching
 from .utils.gmc import GMC
 from .utils.kalman_filter import KalmanFilterXYWH
@@ -147,7 +147,87 @@ class BOTrack(STrack):
     def tlwh_to_xywh(tlwh: np.ndarray) -> np.ndarray:
         """Convert bounding box from tlwh (top-left-width-height) to xywh (center-x-center-y-width-height) format."""
         ret = np.asarray(tlwh).copy()
-        ret[:2] += ret[2:] / 2
+        ret[..., :2] += ret[..., 2:] / 2
+        return ret
+
+
+class BOTrackTable(STrackTable):
+    """
+    Struct-of-arrays track table for BOTSORT, adding appearance features and an XYWH Kalman state.
+
+    Attributes:
+        shared_kalman (KalmanFilterXYWH): A shared Kalman filter for all BOTrackTable instances.
+        smooth_feat (np.ndarray | None): Smoothed feature vectors with shape (N, D).
+        curr_feat (np.ndarray | None): Current feature vectors with shape (N, D).
+        feat_age (np.ndarray): Number of frames each feature was reused from a track without re-embedding, shape (N,).
+        alpha (float): Smoothing factor for the exponential moving average of features.
+
+    Methods:
+        multi_predict: Predict the next states of the selected tracks.
+        update: Update the selected tracks and their smoothed features with matched detections.
+        convert_coords: Convert tlwh bounding box coordinates to xywh format.
+
+    Examples:
+        Create a table of detections with ReID features
+        >>> tracks = BOTrackTable(np.array([[100, 50, 80, 40, 0]]), np.array([0.9]), [1], np.random.rand(1, 128))
+        >>> tracks.activate(KalmanFilterXYWH(), frame_id=1)
+    """
+
+    shared_kalman = KalmanFilterXYWH()
+    columns = STrackTable.columns + ("smooth_feat", "curr_feat", "feat_age")
+    alpha = 0.9
+
+    def __init__(
+        self,
+        xywh: np.ndarray,
+        score: np.ndarray,
+        cls: np.ndarray,
+        feat: Optional[np.ndarray] = None,
+        stream: Optional[np.ndarray] = None,
+    ):
+        """
+        Initialize a table of unactivated tracks from detections and their optional ReID features.
+
+        Args:
+            xywh (np.ndarray): Boxes with shape (N, 5) or (N, 6) in the format (x, y, w, h, [a], idx).
+            score (np.ndarray): Confidence scores of the detections with shape (N,).
+            cls (np.ndarray): Class labels of the detections with shape (N,).
+            feat (np.ndarray, optional): Feature vectors of the detections with shape (N, D).
+            stream (np.ndarray, optional): Stream index of each detection with shape (N,), 0 for all if None.
+        """
+        super().__init__(xywh, score, cls, stream)
+        self.curr_feat = None if feat is None else feat / np.linalg.norm(feat, axis=1, keepdims=True)
+        self.smooth_feat = None if feat is None else self.curr_feat.copy()
+        self.feat_age = np.zeros(len(self.score), dtype=int)
+
+    def multi_predict(self, index: np.ndarray) -> None:
+        """Predict the next states of the tracks at `index` using the shared Kalman filter."""
+        mean = self.mean[index]
+        if len(mean):
+            mean[self.state[index] != TrackState.Tracked, 6:] = 0
+            self.mean[index], self.covariance[index] = self.shared_kalman.multi_predict(mean, self.covariance[index])
+
+    def update(self, index: np.ndarray, detections: "BOTrackTable", det_index: np.ndarray, frame_id: int) -> None:
+        """Update the tracks at `index` and their smoothed features with the detections at `det_index`."""
+        if detections.curr_feat is not None and len(index):
+            feat = detections.curr_feat[det_index]
+            smooth_feat = self.alpha * self.smooth_feat[index] + (1 - self.alpha) * feat
+            self.smooth_feat[index] = smooth_feat / np.linalg.norm(smooth_feat, axis=1, keepdims=True)
+            self.curr_feat[index] = feat
+            self.feat_age[index] = detections.feat_age[det_index]
+        super().update(index, detections, det_index, frame_id)
+
+    def convert_coords(self, tlwh: np.ndarray) -> np.ndarray:
+        """Convert tlwh bounding box coordinates to xywh format."""
+        return BOTrack.tlwh_to_xywh(tlwh)
+
+    @property
+    def tlwh(self) -> np.ndarray:
+        """Return the current bounding boxes in `(top left x, top left y, width, height)` format."""
+        if self.mean is None:
+            return self._tlwh.copy()
+        ret = self.mean[:, :4].copy()
+        ret[:, :2] -= ret[:, 2:] / 2
         return ret
 
 
@@ -159,41 +239,51 @@ class BOTSORT(BYTETracker):
         proximity_thresh (float): Threshold for spatial proximity (IoU) between tracks and detections.
         appearance_thresh (float): Threshold for appearance similarity (ReID embeddings) between tracks and detections.
         encoder (Any): Object to handle ReID embeddings, set to None if ReID is not enabled.
+        reid_cache (int): Number of frames a barely moving track may reuse its smoothed feature instead of
+            re-embedding its detection, 0 to embed every detection.
         gmc (GMC): An instance of the GMC algorithm for data association.
+        gmcs (List[GMC]): One GMC instance per stream, the first of which is `gmc`.
         args (Any): Parsed command-line arguments containing tracking parameters.
 
     Methods:
         get_kalmanfilter: Return an instance of KalmanFilterXYWH for object tracking.
         init_track: Initialize track with detections, scores, and classes.
+        encode: Extract ReID features of detections.
+        reuse_features: Find detections that can reuse the feature of a barely moving track.
         get_dists: Get distances between tracks and detections using IoU and (optionally) ReID.
-        multi_predict: Predict and track multiple objects with a YOLO model.
         reset: Reset the BOTSORT tracker to its initial state.
+        reset_streams: Drop the tracks and reset the GMC state of some streams only.
+        state_dict: Return the full tracker state including the GMC states.
+        load_state_dict: Restore the full tracker state including the GMC states.
 
     Examples:
         Initialize BOTSORT and process detections
         >>> bot_sort = BOTSORT(args, frame_rate=30)
-        >>> bot_sort.init_track(dets, scores, cls, img)
-        >>> bot_sort.multi_predict(tracks)
+        >>> tracks = bot_sort.init_track(dets, scores, cls, img)
+        >>> bot_sort.multi_predict(tracks, np.arange(len(tracks)))
 
     Note:
         The class is designed to work with a YOLO object detection model and supports ReID only if enabled via args.
     """
 
-    def __init__(self, args: Any, frame_rate: int = 30):
+    def __init__(self, args: Any, frame_rate: int = 30, streams: int = 1):
         """
         Initialize BOTSORT object with ReID module and GMC algorithm.
 
         Args:
             args (Any): Parsed command-line arguments containing tracking parameters.
             frame_rate (int): Frame rate of the video being processed.
+            streams (int): Number of synchronized streams updated together with `update_streams`.
 
         Examples:
             Initialize BOTSORT with command-line arguments and a specified frame rate:
             >>> args = parse_args()
             >>> bot_sort = BOTSORT(args, frame_rate=30)
         """
-        super().__init__(args, frame_rate)
-        self.gmc = GMC(method=args.gmc_method)
+        super().__init__(args, frame_rate, streams)
+        gmc_kwargs = {"refresh": getattr(args, "gmc_refresh", 1.0), "budget": getattr(args, "gmc_budget", 0.0)}
+        self.gmcs = [GMC(method=args.gmc_method, **gmc_kwargs) for _ in range(streams)]
+        self.gmc = self.gmcs[0]
 
         # ReID module
         self.proximity_thresh = args.proximity_thresh
@@ -201,72 +291,164 @@ class BOTSORT(BYTETracker):
         self.encoder = (
             (lambda feats, s: [f.cpu().numpy() for f in feats])  # native features do not require any model
             if args.with_reid and self.args.model == "auto"
-            else ReID(args.model)
+            else ReID(args.model, batch=getattr(args, "reid_batch", 0))
             if args.with_reid
             else None
         )
+        self.reid_cache = getattr(args, "reid_cache", 0) if isinstance(self.encoder, ReID) else 0
 
     def get_kalmanfilter(self) -> KalmanFilterXYWH:
         """Return an instance of KalmanFilterXYWH for predicting and updating object states in the tracking process."""
         return KalmanFilterXYWH()
 
     def init_track(
-        self, dets: np.ndarray, scores: np.ndarray, cls: np.ndarray, img: Optional[np.ndarray] = None
-    ) -> List[BOTrack]:
-        """Initialize object tracks using detection bounding boxes, scores, class labels, and optional ReID features."""
-        if len(dets) == 0:
-            return []
-        if self.args.with_reid and self.encoder is not None:
-            features_keep = self.encoder(img, dets)
-            return [BOTrack(xyxy, s, c, f) for (xyxy, s, c, f) in zip(dets, scores, cls, features_keep)]  # detections
+        self,
+        dets: np.ndarray,
+        scores: np.ndarray,
+        cls: np.ndarray,
+        img: Optional[np.ndarray] = None,
+        stream: Optional[np.ndarray] = None,
+    ) -> BOTrackTable:
+        """
+        Initialize a table of unactivated tracks from detections, scores, class labels and optional ReID features.
+
+        With `stream` given, `img` holds the frame (or features) of each stream and the ReID encoder is run per stream.
+        Detections that barely moved from a track with a recent feature reuse its smoothed feature instead.
+        """
+        if len(dets) and self.args.with_reid and self.encoder is not None:
+            reuse, tracks = self.reuse_features(BOTrackTable(dets, scores, cls, stream=stream))
+            if not len(reuse):
+                return BOTrackTable(dets, scores, cls, self.encode(dets, img, stream), stream)  # detections
+            encode = np.ones(len(dets), dtype=bool)
+            encode[reuse] = False
+            feat = np.empty((len(dets), self.tracks.smooth_feat.shape[1]), dtype=np.float32)
+            feat[reuse] = self.tracks.smooth_feat[tracks]
+            if encode.any():
+                feat[encode] = self.encode(dets[encode], img, None if stream is None else stream[encode])
+            detections = BOTrackTable(dets, scores, cls, feat, stream)
+            detections.feat_age[reuse] = self.tracks.feat_age[tracks] + 1
+            return detections
         else:
-            return [BOTrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)]  # detections
+            return BOTrackTable(dets, scores, cls, stream=stream)  # detections
+
+    def encode(self, dets: np.ndarray, img: Any, stream: Optional[np.ndarray] = None) -> np.ndarray:
+        """Extract the ReID features of detections, running the encoder once per stream if `stream` is given."""
+        if stream is None:
+            return np.stack(self.encoder(img, dets)[: len(dets)])
+        feat = None
+        for i, x in enumerate(img):
+            mask = stream == i
+            if mask.any():
+                f = np.stack(self.encoder(x, dets[mask])[: mask.sum()])
+                if feat is None:
+                    feat = np.empty((len(dets), f.shape[1]), dtype=f.dtype)
+                feat[mask] = f
+        return feat
+
+    def reuse_features(self, detections: BOTrackTable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find detections that can reuse the smoothed feature of a track instead of being embedded.
+
+        A detection reuses the feature of a tracked object of the same class that barely moved, i.e. overlaps its last
+        box with an IoU of at least 0.9, as long as that feature was reused for fewer than `reid_cache` frames. Only
+        unambiguous pairs qualify, where neither the track nor the detection has another such overlap, so association
+        cannot match the detection to a different track than the one whose feature it reused.
 
-    def get_dists(self, tracks: List[BOTrack], detections: List[BOTrack]) -> np.ndarray:
+        Args:
+            detections (BOTrackTable): Detections of the current frame, without features.
+
+        Returns:
+            (np.ndarray): Indices of the detections that reuse a feature.
+            (np.ndarray): Indices into `tracks` of the tracks whose smoothed features they reuse.
+        """
+        tracks = self.tracks
+        if not self.reid_cache or not len(tracks) or tracks.smooth_feat is None:
+            return np.empty(0, dtype=int), np.empty(0, dtype=int)
+        pairs = self.get_pairs(tracks, detections)
+        dists = matching.iou_distance(tracks.coords, detections.coords, pairs)
+        t, d = np.nonzero(dists <= 0.1) if pairs is None else (pairs[0][dists <= 0.1], pairs[1][dists <= 0.1])
+        one = (np.bincount(t, minlength=len(tracks))[t] == 1) & (np.bincount(d, minlength=len(detections))[d] == 1)
+        valid = tracks.is_activated & (tracks.state == TrackState.Tracked) & (tracks.feat_age < self.reid_cache)
+        keep = one & valid[t] & (tracks.cls[t] == detections.cls[d])  # unambiguous 1:1 pairs of the same class
+        return d[keep], t[keep]
+
+    def get_dists(self, tracks: BOTrackTable, detections: BOTrackTable) -> np.ndarray:
         """Calculate distances between tracks and detections using IoU and optionally ReID embeddings."""
-        dists = matching.iou_distance(tracks, detections)
+        pairs = self.get_pairs(tracks, detections)
+        dists = matching.iou_distance(tracks.coords, detections.coords, pairs)
         dists_mask = dists > (1 - self.proximity_thresh)
 
         if self.args.fuse_score:
-            dists = matching.fuse_score(dists, detections)
+            dists = matching.fuse_score(dists, detections.score, pairs)
 
-        if self.args.with_reid and self.encoder is not None:
-            emb_dists = matching.embedding_distance(tracks, detections) / 2.0
+        if self.args.with_reid and self.encoder is not None and dists.size:
+            emb_dists = matching.embedding_distance(tracks.smooth_feat, detections.curr_feat, pairs=pairs) / 2.0
             emb_dists[emb_dists > (1 - self.appearance_thresh)] = 1.0
             emb_dists[dists_mask] = 1.0
             dists = np.minimum(dists, emb_dists)
-        return dists
-
-    def multi_predict(self, tracks: List[BOTrack]) -> None:
-        """Predict the mean and covariance of multiple object tracks using a shared Kalman filter."""
-        BOTrack.multi_predict(tracks)
+        return dists if pairs is None else coo_matrix((dists, pairs), shape=(len(tracks), len(detections)))
 
     def reset(self) -> None:
         """Reset the BOTSORT tracker to its initial state, clearing all tracked objects and internal states."""
         super().reset()
-        self.gmc.reset_params()
+        for gmc in self.gmcs:
+            gmc.reset_params()
+
+    def reset_streams(self, streams: List[int]) -> None:
+        """Drop the tracks and reset the GMC state of the given streams, leaving the other streams untouched."""
+        super().reset_streams(streams)
+        for i in streams:
+            self.gmcs[i].reset_params()
+
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        """Return the full tracker state including the GMC state of each stream as a flat dictionary of arrays."""
+        state = super().state_dict()
+        for i, gmc in enumerate(self.gmcs):
+            state.update({f"gmc{i}.{k}": v for k, v in gmc.state_dict().items()})
+        return state
+
+    def load_state_dict(self, state: Dict[str, np.ndarray]) -> None:
+        """Restore the tracker state including the GMC state of each stream returned by `state_dict`."""
+        super().load_state_dict(state)
+        for i, gmc in enumerate(self.gmcs):
+            prefix = f"gmc{i}."
+            gmc.load_state_dict({k[len(prefix) :]: v for k, v in state.items() if k.startswith(prefix)})
 
 
 class ReID:
-    """YOLO model as encoder for re-identification."""
+    """YOLO model as encoder for re-identification, embedding detection crops in fixed-size micro-batches."""
 
-    def __init__(self, model: str):
+    def __init__(self, model: str, batch: int = 0):
         """
         Initialize encoder for re-identification.
 
         Args:
             model (str): Path to the YOLO model for re-identification.
+            batch (int): Micro-batch size. Crops are embedded in batches of this size, padding the last one with blank
+                crops so every batch has the same shape. 0 embeds all crops in a single batch.
         """
         from ultralytics import YOLO
 
+        self.batch = batch
         self.model = YOLO(model)
         self.model(embed=[len(self.model.model.model) - 2 if ".pt" in model else -1], verbose=False, save=False)  # init
 
     def __call__(self, img: np.ndarray, dets: np.ndarray) -> List[np.ndarray]:
         """Extract embeddings for detected objects."""
-        feats = self.model.predictor(
-            [save_one_box(det, img, save=False) for det in xywh2xyxy(torch.from_numpy(dets[:, :4]))]
-        )
-        if len(feats) != dets.shape[0] and feats[0].shape[0] == dets.shape[0]:
-            feats = feats[0]  # batched prediction with non-PyTorch backend
+        # Crop boxes enlarged the same way as save_one_box, computed for all detections at once
+        b = xyxy2xywh(xywh2xyxy(torch.from_numpy(dets[:, :4])))
+        b[:, 2:] = b[:, 2:] * 1.02 + 10
+        xyxy = clip_boxes(xywh2xyxy(b).long(), img.shape).tolist()
+        c = 1 if img.shape[2] == 1 else -1  # RGB crops
+        crops = [img[y1:y2, x1:x2, ::c] for x1, y1, x2, y2 in xyxy]
+
+        feats = []
+        batch = self.batch or len(crops)
+        for i in range(0, len(crops), batch):
+            n = len(crops[i : i + batch])
+            pad = [np.zeros((32, 32, img.shape[2]), dtype=img.dtype)] * (batch - n)
+            f = self.model.predictor(crops[i : i + batch] + pad)
+            if len(f) != batch and f[0].shape[0] == batch:
+                f = f[0]  # batched prediction with non-PyTorch backend
+            feats.extend(f[:n])
         return [f.cpu().numpy() for f in feats]
@@ -1,8 +1,11 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
-from typing import Any, List, Optional, Tuple
+from copy import copy
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from scipy.sparse import coo_matrix
 
 from ..utils import LOGGER
 from ..utils.ops import xywh2ltwh
@@ -205,8 +208,8 @@ class STrack(BaseTrack):
     def tlwh_to_xyah(tlwh: np.ndarray) -> np.ndarray:
         """Convert bounding box from tlwh format to center-x-center-y-aspect-height (xyah) format."""
         ret = np.asarray(tlwh).copy()
-        ret[:2] += ret[2:] / 2
-        ret[2] /= ret[3]
+        ret[..., :2] += ret[..., 2:] / 2
+        ret[..., 2] /= ret[..., 3]
         return ret
 
     @property
@@ -235,78 +238,366 @@ class STrack(BaseTrack):
         return f"OT_{self.track_id}_({self.start_frame}-{self.end_frame})"
 
 
+class STrackTable:
+    """
+    Struct-of-arrays table of tracks that share one Kalman filter.
+
+    Every attribute is a column with one row per track, so prediction, motion compensation, association and lifecycle
+    transitions of all tracks run as array operations instead of per-object Python calls. Detections are stored in the
+    same layout before activation, with `mean` and `covariance` left as None.
+
+    Attributes:
+        shared_kalman (KalmanFilterXYAH): Shared Kalman filter used for batched prediction.
+        columns (tuple): Names of the per-track columns.
+        kalman_filter (KalmanFilterXYAH | None): Kalman filter used to initiate and update the tracks.
+        _tlwh (np.ndarray): Detected boxes in top-left-width-height format with shape (N, 4).
+        mean (np.ndarray | None): Stacked Kalman state means with shape (N, 8).
+        covariance (np.ndarray | None): Stacked Kalman state covariances with shape (N, 8, 8).
+        score (np.ndarray): Confidence scores with shape (N,).
+        cls (np.ndarray): Class labels with shape (N,).
+        idx (np.ndarray): Index of the detection that last updated each track with shape (N,).
+        angle (np.ndarray | None): Oriented bounding box angles with shape (N,), None for axis-aligned boxes.
+        track_id (np.ndarray): Track IDs with shape (N,).
+        state (np.ndarray): TrackState of each track with shape (N,).
+        is_activated (np.ndarray): Activation flags with shape (N,).
+        tracklet_len (np.ndarray): Number of consecutive updates of each track with shape (N,).
+        frame_id (np.ndarray): Last frame each track was updated in with shape (N,).
+        start_frame (np.ndarray): Frame each track was activated in with shape (N,).
+        stream (np.ndarray): Index of the stream each track belongs to with shape (N,).
+
+    Methods:
+        concatenate: Concatenate tables into a single table.
+        next_id: Reserve consecutive global track IDs.
+        multi_predict: Predict the next states of the selected tracks.
+        multi_gmc: Update all track states using a homography matrix.
+        activate: Activate all rows as new tracks.
+        update: Update the selected tracks with matched detections.
+        convert_coords: Convert bounding boxes to x-y-aspect-height format.
+        bounds: Get axis-aligned boxes enclosing the boxes.
+
+    Examples:
+        Activate a table of two detections
+        >>> tracks = STrackTable(np.array([[100, 200, 50, 80, 0], [300, 200, 40, 60, 1]]), np.array([0.9, 0.8]), [0, 0])
+        >>> tracks.activate(KalmanFilterXYAH(), frame_id=1)
+        >>> tracks.result.shape
+        (2, 8)
+    """
+
+    shared_kalman = KalmanFilterXYAH()
+    columns = (
+        "_tlwh",
+        "mean",
+        "covariance",
+        "score",
+        "cls",
+        "idx",
+        "angle",
+        "track_id",
+        "state",
+        "is_activated",
+        "tracklet_len",
+        "frame_id",
+        "start_frame",
+        "stream",
+    )
+
+    def __init__(self, xywh: np.ndarray, score: np.ndarray, cls: np.ndarray, stream: Optional[np.ndarray] = None):
+        """
+        Initialize a table of unactivated tracks from detections.
+
+        Args:
+            xywh (np.ndarray): Boxes with shape (N, 5) or (N, 6) in the format (x, y, w, h, [a], idx), where (x, y) is
+                the center, (w, h) are width and height, [a] is the optional angle, and idx is the detection index.
+            score (np.ndarray): Confidence scores of the detections with shape (N,).
+            cls (np.ndarray): Class labels of the detections with shape (N,).
+            stream (np.ndarray, optional): Stream index of each detection with shape (N,), 0 for all if None.
+        """
+        xywh = np.asarray(xywh)
+        assert xywh.shape[1] in {5, 6}, f"expected 5 or 6 values but got {xywh.shape[1]}"
+        n = len(xywh)
+        self.kalman_filter = None
+        self._tlwh = np.asarray(xywh2ltwh(xywh[:, :4]), dtype=np.float32)
+        self.mean, self.covariance = None, None
+        self.score = np.asarray(score)
+        self.cls = np.asarray(cls)
+        self.idx = xywh[:, -1]
+        self.angle = xywh[:, 4] if xywh.shape[1] == 6 else None
+        self.track_id = np.zeros(n, dtype=int)
+        self.state = np.full(n, TrackState.New)
+        self.is_activated = np.zeros(n, dtype=bool)
+        self.tracklet_len = np.zeros(n, dtype=int)
+        self.frame_id = np.zeros(n, dtype=int)
+        self.start_frame = np.zeros(n, dtype=int)
+        self.stream = np.zeros(n, dtype=int) if stream is None else np.asarray(stream)
+
+    def __len__(self) -> int:
+        """Return the number of tracks in the table."""
+        return len(self._tlwh)
+
+    def __getitem__(self, index: Union[np.ndarray, slice]) -> "STrackTable":
+        """Return a new table with the rows selected by an index array, boolean mask or slice."""
+        table = copy(self)
+        for k in self.columns:
+            v = getattr(self, k)
+            if v is not None:
+                setattr(table, k, v[index])
+        return table
+
+    @staticmethod
+    def concatenate(tables: List["STrackTable"]) -> "STrackTable":
+        """Concatenate tables of the same type into one table, keeping the row order."""
+        table = copy(tables[0])
+        nonempty = [t for t in tables if len(t)] or tables[:1]
+        for k in table.columns:
+            v = [getattr(t, k) for t in nonempty]
+            setattr(table, k, None if any(x is None for x in v) else np.concatenate(v))
+        table.kalman_filter = next((t.kalman_filter for t in tables if t.kalman_filter is not None), None)
+        return table
+
+    @staticmethod
+    def next_id(n: int) -> np.ndarray:
+        """Reserve `n` consecutive global track IDs and return them."""
+        BaseTrack._count += n
+        return np.arange(BaseTrack._count - n + 1, BaseTrack._count + 1)
+
+    def multi_predict(self, index: np.ndarray):
+        """Predict the next states of the tracks at `index` using the shared Kalman filter."""
+        mean = self.mean[index]
+        if len(mean):
+            mean[self.state[index] != TrackState.Tracked, 7] = 0
+            self.mean[index], self.covariance[index] = self.shared_kalman.multi_predict(mean, self.covariance[index])
+
+    def multi_gmc(self, H: np.ndarray = np.eye(2, 3)):
+        """Update all track positions and covariances using one homography matrix, or one (N, 2, 3) matrix per track."""
+        if H.ndim == 2:
+            R8x8 = np.kron(np.eye(4, dtype=float), H[:2, :2])
+            self.mean = self.mean @ R8x8.T
+            self.mean[:, :2] += H[:2, 2]
+            self.covariance = R8x8 @ self.covariance @ R8x8.T
+        else:
+            R8x8 = np.zeros((len(H), 8, 8))
+            for i in range(0, 8, 2):
+                R8x8[:, i : i + 2, i : i + 2] = H[:, :2, :2]
+            self.mean = np.einsum("nij,nj->ni", R8x8, self.mean)
+            self.mean[:, :2] += H[:, :2, 2]
+            self.covariance = R8x8 @ self.covariance @ R8x8.transpose(0, 2, 1)
+
+    def activate(self, kalman_filter: KalmanFilterXYAH, frame_id: int):
+        """Activate all rows as new tracks, assigning track IDs and initializing their Kalman states."""
+        n = len(self)
+        self.kalman_filter = kalman_filter
+        self.track_id = self.next_id(n)
+        self.mean, self.covariance = kalman_filter.multi_initiate(self.convert_coords(self._tlwh).reshape(n, 4))
+
+        self.tracklet_len = np.zeros(n, dtype=int)
+        self.state = np.full(n, TrackState.Tracked)
+        self.is_activated = np.full(n, frame_id == 1)
+        self.frame_id = np.full(n, frame_id)
+        self.start_frame = np.full(n, frame_id)
+
+    def update(self, index: np.ndarray, detections: "STrackTable", det_index: np.ndarray, frame_id: int):
+        """
+        Update the tracks at `index` with the detections at `det_index`.
+
+        Tracked tracks extend their tracklet, while lost tracks are re-activated with their existing track ID.
+
+        Args:
+            index (np.ndarray): Row indices of the tracks to update.
+            detections (STrackTable): Table of detections matched to the tracks.
+            det_index (np.ndarray): Row indices of the matched detections, aligned with `index`.
+            frame_id (int): The ID of the current frame.
+        """
+        refind = self.state[index] != TrackState.Tracked
+        if len(index):
+            measurement = self.convert_coords(detections.tlwh[det_index])
+            self.mean[index], self.covariance[index] = self.kalman_filter.multi_update(
+                self.mean[index], self.covariance[index], measurement
+            )
+        self.tracklet_len[index] = np.where(refind, 0, self.tracklet_len[index] + 1)
+        self.state[index] = TrackState.Tracked
+        self.is_activated[index] = True
+        self.frame_id[index] = frame_id
+
+        self.score[index] = detections.score[det_index]
+        self.cls[index] = detections.cls[det_index]
+        self.idx[index] = detections.idx[det_index]
+        if self.angle is not None:
+            self.angle[index] = detections.angle[det_index]
+
+    def convert_coords(self, tlwh: np.ndarray) -> np.ndarray:
+        """Convert bounding boxes from top-left-width-height format to x-y-aspect-height format."""
+        return STrack.tlwh_to_xyah(tlwh)
+
+    @property
+    def tlwh(self) -> np.ndarray:
+        """Get the bounding boxes in top-left-width-height format from the current state estimates."""
+        if self.mean is None:
+            return self._tlwh.copy()
+        ret = self.mean[:, :4].copy()
+        ret[:, 2] *= ret[:, 3]
+        ret[:, :2] -= ret[:, 2:] / 2
+        return ret
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        """Get the bounding boxes in (min x, min y, max x, max y) format."""
+        ret = self.tlwh
+        ret[:, 2:] += ret[:, :2]
+        return ret
+
+    @property
+    def xywh(self) -> np.ndarray:
+        """Get the bounding boxes in (center x, center y, width, height) format."""
+        ret = self.tlwh
+        ret[:, :2] += ret[:, 2:] / 2
+        return ret
+
+    @property
+    def xywha(self) -> np.ndarray:
+        """Get the bounding boxes in (center x, center y, width, height, angle) format, warning if angle is missing."""
+        if self.angle is None:
+            LOGGER.warning("`angle` attr not found, returning `xywh` instead.")
+            return self.xywh
+        return np.concatenate([self.xywh, self.angle[:, None]], axis=1)
+
+    @property
+    def coords(self) -> np.ndarray:
+        """Get the bounding boxes in `xyxy` format, or `xywha` format for oriented bounding boxes."""
+        return self.xyxy if self.angle is None else self.xywha
+
+    def bounds(self, scale: float = 1.0) -> np.ndarray:
+        """Get axis-aligned boxes in xyxy format enclosing the (oriented) boxes, scaled about their centers."""
+        xywh = self.xywh
+        if self.angle is not None:
+            cos, sin = np.abs(np.cos(self.angle)), np.abs(np.sin(self.angle))
+            xywh[:, 2], xywh[:, 3] = xywh[:, 2] * cos + xywh[:, 3] * sin, xywh[:, 2] * sin + xywh[:, 3] * cos
+        half = xywh[:, 2:] * (scale / 2)
+        return np.concatenate([xywh[:, :2] - half, xywh[:, :2] + half], axis=1)
+
+    @property
+    def result(self) -> np.ndarray:
+        """Get the tracking results as rows of (*coords, track_id, score, cls, idx)."""
+        return np.concatenate([self.coords, np.stack([self.track_id, self.score, self.cls, self.idx], axis=1)], axis=1)
+
+
 class BYTETracker:
     """
     BYTETracker: A tracking algorithm built on top of YOLOv8 for object detection and tracking.
 
     This class encapsulates the functionality for initializing, updating, and managing the tracks for detected objects in a
-    video sequence. It maintains the state of tracked, lost, and removed tracks over frames, utilizes Kalman filtering for
-    predicting the new object locations, and performs data association.
+    video sequence. Tracked and lost tracks are kept in a single STrackTable, ordered tracked rows first, so Kalman
+    prediction, motion compensation, data association and state transitions run as array operations on the table.
+
+    A tracker can follow several synchronized streams at once, e.g. the cameras of a stream batch. Tracks of all streams
+    share the table and are updated in the same array operations, while association is restricted to pairs from the
+    same stream and solved for all streams with one sparse block-diagonal assignment.
 
     Attributes:
-        tracked_stracks (List[STrack]): List of successfully activated tracks.
-        lost_stracks (List[STrack]): List of lost tracks.
-        removed_stracks (List[STrack]): List of removed tracks.
+        tracks (STrackTable): Table of tracked and lost tracks.
+        tracked_stracks (STrackTable): Rows of `tracks` that are currently tracked.
+        lost_stracks (STrackTable): Rows of `tracks` that are currently lost.
+        removed_ids (np.ndarray): IDs of recently removed tracks, which are no longer kept as lost.
         frame_id (int): The current frame ID.
         args (Namespace): Command-line arguments.
+        streams (int): Number of streams updated together.
         max_time_lost (int): The maximum frames for a track to be considered as 'lost'.
         kalman_filter (KalmanFilterXYAH): Kalman Filter object.
+        gate_size (int): Number of track-detection pairs above which association only scores overlapping boxes.
 
     Methods:
         update: Update object tracker with new detections.
+        update_streams: Update object tracker with new detections of every stream.
         get_kalmanfilter: Return a Kalman filter object for tracking bounding boxes.
         init_track: Initialize object tracking with detections.
+        get_pairs: Return the candidate pairs of tracks and detections.
         get_dists: Calculate the distance between tracks and detections.
         multi_predict: Predict the location of tracks.
         reset_id: Reset the ID counter of STrack.
         reset: Reset the tracker by clearing all tracks.
-        joint_stracks: Combine two lists of stracks.
-        sub_stracks: Filter out the stracks present in the second list from the first list.
-        remove_duplicate_stracks: Remove duplicate stracks based on IoU.
+        reset_streams: Drop the tracks of some streams only.
+        state_dict: Return the full tracker state as a dictionary of arrays.
+        load_state_dict: Restore the tracker state from a dictionary of arrays.
+        save: Save the tracker state to a file.
+        load: Restore the tracker state from a file.
+        remove_duplicate_stracks: Remove duplicate tracks based on IoU.
 
     Examples:
         Initialize BYTETracker and update with detection results
         >>> tracker = BYTETracker(args, frame_rate=30)
         >>> results = yolo_model.detect(image)
         >>> tracked_objects = tracker.update(results)
+
+        Track 4 streams together
+        >>> tracker = BYTETracker(args, frame_rate=30, streams=4)
+        >>> tracked_objects = tracker.update_streams([yolo_model.detect(image) for image in images], images)
     """
 
-    def __init__(self, args, frame_rate: int = 30):
+    gate_size = 4096
+
+    def __init__(self, args, frame_rate: int = 30, streams: int = 1):
         """
         Initialize a BYTETracker instance for object tracking.
 
         Args:
             args (Namespace): Command-line arguments containing tracking parameters.
             frame_rate (int): Frame rate of the video sequence.
+            streams (int): Number of synchronized streams updated together with `update_streams`.
 
         Examples:
             Initialize BYTETracker with command-line arguments and a frame rate of 30
             >>> args = Namespace(track_buffer=30)
             >>> tracker = BYTETracker(args, frame_rate=30)
         """
-        self.tracked_stracks = []  # type: List[STrack]
-        self.lost_stracks = []  # type: List[STrack]
-        self.removed_stracks = []  # type: List[STrack]
-
         self.frame_id = 0
         self.args = args
+        self.streams = streams
         self.max_time_lost = int(frame_rate / 30.0 * args.track_buffer)
         self.kalman_filter = self.get_kalmanfilter()
+        self.tracks = self.init_track(np.empty((0, 5)), np.empty(0), np.empty(0))
+        self.tracks.activate(self.kalman_filter, self.frame_id)
+        self.removed_ids = np.empty(0, dtype=int)
         self.reset_id()
 
+    @property
+    def tracked_stracks(self) -> STrackTable:
+        """Return the currently tracked tracks, including unconfirmed ones."""
+        return self.tracks[self.tracks.state == TrackState.Tracked]
+
+    @property
+    def lost_stracks(self) -> STrackTable:
+        """Return the currently lost tracks."""
+        return self.tracks[self.tracks.state == TrackState.Lost]
+
     def update(self, results, img: Optional[np.ndarray] = None, feats: Optional[np.ndarray] = None) -> np.ndarray:
         """Update the tracker with new detections and return the current list of tracked objects."""
+        return self.update_streams([results], [img], [feats])[0]
+
+    def update_streams(
+        self, results: list, imgs: Optional[List[np.ndarray]] = None, feats: Optional[list] = None
+    ) -> List[np.ndarray]:
+        """
+        Update the tracker with new detections of every stream and return the tracked objects of each stream.
+
+        Args:
+            results (list): Detection results of each stream, with `conf`, `cls` and `xywh` or `xywhr` attributes.
+            imgs (List[np.ndarray], optional): Current frame of each stream.
+            feats (list, optional): Object features of each stream, used for ReID instead of the frames if given.
+
+        Returns:
+            (List[np.ndarray]): Tracked objects of each stream as rows of (*coords, track_id, score, cls, idx).
+        """
+        assert len(results) == self.streams, f"expected results of {self.streams} streams but got {len(results)}"
+        imgs = imgs or [None] * self.streams
+        feats = feats or [None] * self.streams
         self.frame_id += 1
-        activated_stracks = []
-        refind_stracks = []
-        lost_stracks = []
-        removed_stracks = []
 
-        scores = results.conf
-        bboxes = results.xywhr if hasattr(results, "xywhr") else results.xywh
+        counts = [len(r.conf) for r in results]
+        stream = np.repeat(np.arange(self.streams), counts)
+        scores = np.concatenate([r.conf for r in results])
+        bboxes = np.concatenate([r.xywhr if hasattr(r, "xywhr") else r.xywh for r in results])
         # Add index
-        bboxes = np.concatenate([bboxes, np.arange(len(bboxes)).reshape(-1, 1)], axis=-1)
-        cls = results.cls
+        bboxes = np.concatenate([bboxes, np.concatenate([np.arange(n) for n in counts]).reshape(-1, 1)], axis=-1)
+        cls = np.concatenate([r.cls for r in results])
 
         remain_inds = scores >= self.args.track_high_thresh
         inds_low = scores > self.args.track_low_thresh
@@ -319,119 +610,130 @@ class BYTETracker:
         scores_second = scores[inds_second]
         cls_keep = cls[remain_inds]
         cls_second = cls[inds_second]
-
-        detections = self.init_track(dets, scores_keep, cls_keep, img if feats is None else feats)
-        # Add newly detected tracklets to tracked_stracks
-        unconfirmed = []
-        tracked_stracks = []  # type: List[STrack]
-        for track in self.tracked_stracks:
-            if not track.is_activated:
-                unconfirmed.append(track)
-            else:
-                tracked_stracks.append(track)
+        stream_keep = stream[remain_inds]
+        stream_second = stream[inds_second]
+
+        inputs = [img if f is None else f for img, f in zip(imgs, feats)]
+        detections = self.init_track(dets, scores_keep, cls_keep, inputs, stream_keep)
+        tracks = self.tracks
+        lost = tracks.state != TrackState.Tracked
+        # Unconfirmed tracks were only seen in their first frame, the others form the pool for the first association
+        unconfirmed = np.flatnonzero(~tracks.is_activated)
+        pool = np.flatnonzero(tracks.is_activated)
         # Step 2: First association, with high score detection boxes
-        strack_pool = self.joint_stracks(tracked_stracks, self.lost_stracks)
         # Predict the current location with KF
-        self.multi_predict(strack_pool)
-        if hasattr(self, "gmc") and img is not None:
-            # use try-except here to bypass errors from gmc module
-            try:
-                warp = self.gmc.apply(img, dets)
-            except Exception:
-                warp = np.eye(2, 3)
-            STrack.multi_gmc(strack_pool, warp)
-            STrack.multi_gmc(unconfirmed, warp)
-
-        dists = self.get_dists(strack_pool, detections)
+        self.multi_predict(tracks, pool)
+        if hasattr(self, "gmcs") and any(img is not None for img in imgs):
+            warp = np.tile(np.eye(2, 3), (self.streams, 1, 1))
+            for i, (gmc, img) in enumerate(zip(self.gmcs, imgs)):
+                if img is not None:
+                    # use try-except here to bypass errors from gmc module
+                    try:
+                        warp[i] = gmc.apply(img, dets[stream_keep == i])
+                    except Exception:
+                        pass
+            tracks.multi_gmc(warp[0] if self.streams == 1 else warp[tracks.stream])
+
+        dists = self.get_dists(tracks[pool], detections)
         matches, u_track, u_detection = matching.linear_assignment(dists, thresh=self.args.match_thresh)
-
-        for itracked, idet in matches:
-            track = strack_pool[itracked]
-            det = detections[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
+        matches = np.asarray(matches, dtype=int).reshape(-1, 2)
+        matched = pool[matches[:, 0]]
+        refind = matched[lost[matched]]
+        tracks.update(matched, detections, matches[:, 1], self.frame_id)
         # Step 3: Second association, with low score detection boxes association the untrack to the low score detections
-        detections_second = self.init_track(dets_second, scores_second, cls_second, img if feats is None else feats)
-        r_tracked_stracks = [strack_pool[i] for i in u_track if strack_pool[i].state == TrackState.Tracked]
+        detections_second = self.init_track(dets_second, scores_second, cls_second, inputs, stream_second)
+        r_tracked = pool[np.asarray(u_track, dtype=int)]
+        r_tracked = r_tracked[~lost[r_tracked]]
         # TODO
-        dists = matching.iou_distance(r_tracked_stracks, detections_second)
+        pairs = self.get_pairs(tracks[r_tracked], detections_second)
+        dists = matching.iou_distance(tracks.coords[r_tracked], detections_second.coords, pairs)
+        if pairs is not None:
+            dists = coo_matrix((dists, pairs), shape=(len(r_tracked), len(detections_second)))
         matches, u_track, u_detection_second = matching.linear_assignment(dists, thresh=0.5)
-        for itracked, idet in matches:
-            track = r_tracked_stracks[itracked]
-            det = detections_second[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
-
-        for it in u_track:
-            track = r_tracked_stracks[it]
-            if track.state != TrackState.Lost:
-                track.mark_lost()
-                lost_stracks.append(track)
+        matches = np.asarray(matches, dtype=int).reshape(-1, 2)
+        tracks.update(r_tracked[matches[:, 0]], detections_second, matches[:, 1], self.frame_id)
+
+        lost_new = r_tracked[np.asarray(u_track, dtype=int)]
+        tracks.state[lost_new] = TrackState.Lost
         # Deal with unconfirmed tracks, usually tracks with only one beginning frame
-        detections = [detections[i] for i in u_detection]
-        dists = self.get_dists(unconfirmed, detections)
+        detections = detections[np.asarray(u_detection, dtype=int)]
+        dists = self.get_dists(tracks[unconfirmed], detections)
         matches, u_unconfirmed, u_detection = matching.linear_assignment(dists, thresh=0.7)
-        for itracked, idet in matches:
-            unconfirmed[itracked].update(detections[idet], self.frame_id)
-            activated_stracks.append(unconfirmed[itracked])
-        for it in u_unconfirmed:
-            track = unconfirmed[it]
-            track.mark_removed()
-            removed_stracks.append(track)
+        matches = np.asarray(matches, dtype=int).reshape(-1, 2)
+        tracks.update(unconfirmed[matches[:, 0]], detections, matches[:, 1], self.frame_id)
+        removed = unconfirmed[np.asarray(u_unconfirmed, dtype=int)]
         # Step 4: Init new stracks
-        for inew in u_detection:
-            track = detections[inew]
-            if track.score < self.args.new_track_thresh:
-                continue
-            track.activate(self.kalman_filter, self.frame_id)
-            activated_stracks.append(track)
+        new = detections[np.asarray(u_detection, dtype=int)]
+        new = new[new.score >= self.args.new_track_thresh]
+        new.activate(self.kalman_filter, self.frame_id)
         # Step 5: Update state
-        for track in self.lost_stracks:
-            if self.frame_id - track.end_frame > self.max_time_lost:
-                track.mark_removed()
-                removed_stracks.append(track)
-
-        self.tracked_stracks = [t for t in self.tracked_stracks if t.state == TrackState.Tracked]
-        self.tracked_stracks = self.joint_stracks(self.tracked_stracks, activated_stracks)
-        self.tracked_stracks = self.joint_stracks(self.tracked_stracks, refind_stracks)
-        self.lost_stracks = self.sub_stracks(self.lost_stracks, self.tracked_stracks)
-        self.lost_stracks.extend(lost_stracks)
-        self.lost_stracks = self.sub_stracks(self.lost_stracks, self.removed_stracks)
-        self.tracked_stracks, self.lost_stracks = self.remove_duplicate_stracks(self.tracked_stracks, self.lost_stracks)
-        self.removed_stracks.extend(removed_stracks)
-        if len(self.removed_stracks) > 1000:
-            self.removed_stracks = self.removed_stracks[-999:]  # clip remove stracks to 1000 maximum
-
-        return np.asarray([x.result for x in self.tracked_stracks if x.is_activated], dtype=np.float32)
+        expired = lost & (self.frame_id - tracks.frame_id > self.max_time_lost)
+        removed = np.concatenate([removed, np.flatnonzero(expired)])
+        tracks.state[removed] = TrackState.Removed
+
+        # Keep tracked rows first (existing, new, re-found) followed by lost rows (existing, newly lost)
+        tracked = np.flatnonzero(~lost & (tracks.state == TrackState.Tracked))
+        lost = np.concatenate([np.flatnonzero(lost & (tracks.state != TrackState.Tracked)), lost_new])
+        lost = lost[~np.isin(tracks.track_id[lost], self.removed_ids)]
+        self.removed_ids = np.concatenate([self.removed_ids, tracks.track_id[removed]])
+        if len(self.removed_ids) > 1000 * self.streams:
+            self.removed_ids = self.removed_ids[-999 * self.streams :]  # clip removed track IDs to 1000 per stream
+        tracks = tracks.concatenate([tracks[tracked], new, tracks[np.concatenate([refind, lost])]])
+        self.tracks = self.remove_duplicate_stracks(tracks)
+
+        tracks = self.tracks
+        keep = tracks.is_activated & (tracks.state == TrackState.Tracked)
+        results, stream = tracks.result[keep].astype(np.float32), tracks.stream[keep]
+        results = results[np.argsort(stream, kind="stable")]
+        return np.split(results, np.cumsum(np.bincount(stream, minlength=self.streams))[:-1])
 
     def get_kalmanfilter(self) -> KalmanFilterXYAH:
         """Return a Kalman filter object for tracking bounding boxes using KalmanFilterXYAH."""
         return KalmanFilterXYAH()
 
     def init_track(
-        self, dets: np.ndarray, scores: np.ndarray, cls: np.ndarray, img: Optional[np.ndarray] = None
-    ) -> List[STrack]:
-        """Initialize object tracking with given detections, scores, and class labels using the STrack algorithm."""
-        return [STrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)] if len(dets) else []  # detections
+        self,
+        dets: np.ndarray,
+        scores: np.ndarray,
+        cls: np.ndarray,
+        img: Optional[np.ndarray] = None,
+        stream: Optional[np.ndarray] = None,
+    ) -> STrackTable:
+        """Initialize a table of unactivated tracks from detections, scores, class labels and their stream indices."""
+        return STrackTable(dets, scores, cls, stream)  # detections
+
+    def get_pairs(self, tracks: STrackTable, detections: STrackTable) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Return the index pairs of tracks and detections that can be associated, or None if all pairs can be.
+
+        Pairs are restricted to the same stream. Once there are more than `gate_size` pairs they are also gated to
+        overlapping boxes, as boxes without overlap have an IoU cost of 1 and can never be matched. Oriented boxes are
+        gated on their enclosing boxes enlarged by half, which keeps every pair with a probiou cost below 0.9.
+
+        Args:
+            tracks (STrackTable): Tracks with their predicted boxes.
+            detections (STrackTable): Detections of the current frame.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray] | None): Indices into tracks and detections of the candidate pairs.
+        """
+        if len(tracks) * len(detections) > self.gate_size:
+            scale = 1.0 if tracks.angle is None else 1.5
+            groups = (tracks.stream, detections.stream) if self.streams > 1 else (None, None)
+            return matching.overlap_pairs(tracks.bounds(scale), detections.bounds(scale), *groups)
+        return matching.group_pairs(tracks.stream, detections.stream) if self.streams > 1 else None
 
-    def get_dists(self, tracks: List[STrack], detections: List[STrack]) -> np.ndarray:
+    def get_dists(self, tracks: STrackTable, detections: STrackTable) -> np.ndarray:
         """Calculate the distance between tracks and detections using IoU and optionally fuse scores."""
-        dists = matching.iou_distance(tracks, detections)
+        pairs = self.get_pairs(tracks, detections)
+        dists = matching.iou_distance(tracks.coords, detections.coords, pairs)
         if self.args.fuse_score:
-            dists = matching.fuse_score(dists, detections)
-        return dists
+            dists = matching.fuse_score(dists, detections.score, pairs)
+        return dists if pairs is None else coo_matrix((dists, pairs), shape=(len(tracks), len(detections)))
 
-    def multi_predict(self, tracks: List[STrack]):
-        """Predict the next states for multiple tracks using Kalman filter."""
-        STrack.multi_predict(tracks)
+    def multi_predict(self, tracks: STrackTable, index: np.ndarray):
+        """Predict the next states of the tracks at `index` using Kalman filter."""
+        tracks.multi_predict(index)
 
     @staticmethod
     def reset_id():
@@ -439,48 +741,85 @@ class BYTETracker:
         STrack.reset_id()
 
     def reset(self):
-        """Reset the tracker by clearing all tracked, lost, and removed tracks and reinitializing the Kalman filter."""
-        self.tracked_stracks = []  # type: List[STrack]
-        self.lost_stracks = []  # type: List[STrack]
-        self.removed_stracks = []  # type: List[STrack]
+        """Reset the tracker by clearing all tracks and reinitializing the Kalman filter."""
         self.frame_id = 0
         self.kalman_filter = self.get_kalmanfilter()
+        self.tracks = self.init_track(np.empty((0, 5)), np.empty(0), np.empty(0))
+        self.tracks.activate(self.kalman_filter, self.frame_id)
+        self.removed_ids = np.empty(0, dtype=int)
         self.reset_id()
 
-    @staticmethod
-    def joint_stracks(tlista: List[STrack], tlistb: List[STrack]) -> List[STrack]:
-        """Combine two lists of STrack objects into a single list, ensuring no duplicates based on track IDs."""
-        exists = {}
-        res = []
-        for t in tlista:
-            exists[t.track_id] = 1
-            res.append(t)
-        for t in tlistb:
-            tid = t.track_id
-            if not exists.get(tid, 0):
-                exists[tid] = 1
-                res.append(t)
-        return res
+    def reset_streams(self, streams: List[int]):
+        """
+        Drop the tracks of the given streams, e.g. when their source changed, leaving the other streams untouched.
 
-    @staticmethod
-    def sub_stracks(tlista: List[STrack], tlistb: List[STrack]) -> List[STrack]:
-        """Filter out the stracks present in the second list from the first list."""
-        track_ids_b = {t.track_id for t in tlistb}
-        return [t for t in tlista if t.track_id not in track_ids_b]
+        Track IDs keep counting up, so new tracks of the reset streams never reuse IDs of tracks of other streams.
 
-    @staticmethod
-    def remove_duplicate_stracks(stracksa: List[STrack], stracksb: List[STrack]) -> Tuple[List[STrack], List[STrack]]:
-        """Remove duplicate stracks from two lists based on Intersection over Union (IoU) distance."""
-        pdist = matching.iou_distance(stracksa, stracksb)
-        pairs = np.where(pdist < 0.15)
-        dupa, dupb = [], []
-        for p, q in zip(*pairs):
-            timep = stracksa[p].frame_id - stracksa[p].start_frame
-            timeq = stracksb[q].frame_id - stracksb[q].start_frame
-            if timep > timeq:
-                dupb.append(q)
-            else:
-                dupa.append(p)
-        resa = [t for i, t in enumerate(stracksa) if i not in dupa]
-        resb = [t for i, t in enumerate(stracksb) if i not in dupb]
-        return resa, resb
+        Args:
+            streams (List[int]): Indices of the streams to reset.
+        """
+        self.tracks = self.tracks[~np.isin(self.tracks.stream, streams)]
+
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        """
+        Return the full tracker state as a flat dictionary of arrays.
+
+        The state holds every track column including the Kalman means and covariances, the removed track IDs, the frame
+        counter and the global track ID counter, so a stream can be checkpointed and resumed in another process.
+
+        Returns:
+            (Dict[str, np.ndarray]): Tracker state, which can be written with `np.savez` and restored with
+                `load_state_dict`. The arrays are copies, later updates modify the track table in place.
+        """
+        state = {f"tracks.{k}": getattr(self.tracks, k) for k in self.tracks.columns}
+        state = {k: v.copy() for k, v in state.items() if v is not None}
+        state.update(
+            frame_id=np.array(self.frame_id),
+            streams=np.array(self.streams),
+            removed_ids=np.array(self.removed_ids),
+            track_count=np.array(BaseTrack._count),
+        )
+        return state
+
+    def load_state_dict(self, state: Dict[str, np.ndarray]):
+        """
+        Restore the tracker state returned by `state_dict`, continuing the tracks where they were left.
+
+        The global track ID counter is only ever advanced, so restored tracks never share IDs with tracks created since.
+
+        Args:
+            state (Dict[str, np.ndarray]): Tracker state, e.g. as loaded with `np.load`.
+        """
+        assert int(state["streams"]) == self.streams, f"expected a state of {self.streams} streams"
+        tracks = self.init_track(np.empty((0, 5)), np.empty(0), np.empty(0))
+        for k in tracks.columns:
+            setattr(tracks, k, np.array(state[f"tracks.{k}"]) if f"tracks.{k}" in state else None)  # copy
+        tracks.kalman_filter = self.kalman_filter
+        self.tracks = tracks
+        self.frame_id = int(state["frame_id"])
+        self.removed_ids = np.array(state["removed_ids"])
+        BaseTrack._count = max(BaseTrack._count, int(state["track_count"]))
+
+    def save(self, file: Union[str, Path, IO]):
+        """Save the tracker state to an uncompressed .npz file or file object, for a fast checkpoint of a stream."""
+        np.savez(file, **self.state_dict())
+
+    def load(self, file: Union[str, Path, IO]):
+        """Restore the tracker state from a file written by `save`."""
+        with np.load(file) as state:
+            self.load_state_dict(dict(state))
+
+    def remove_duplicate_stracks(self, tracks: STrackTable) -> STrackTable:
+        """Remove duplicates between tracked and lost rows based on IoU distance, keeping the longer-lived tracks."""
+        a = np.flatnonzero(tracks.state == TrackState.Tracked)
+        b = np.flatnonzero(tracks.state != TrackState.Tracked)
+        coords = tracks.coords
+        pairs = self.get_pairs(tracks[a], tracks[b])
+        dists = matching.iou_distance(coords[a], coords[b], pairs)
+        p, q = np.nonzero(dists < 0.15) if pairs is None else (pairs[0][dists < 0.15], pairs[1][dists < 0.15])
+        age = tracks.frame_id - tracks.start_frame
+        older = age[a[p]] > age[b[q]]
+        keep = np.ones(len(tracks), dtype=bool)
+        keep[b[q[older]]] = False
+        keep[a[p[~older]]] = False
+        return tracks if keep.all() else tracks[keep]
@@ -59,13 +59,9 @@ def on_predict_start(predictor: object, persist: bool = False) -> None:
 
             predictor._hook = predictor.model.model.model[-1].register_forward_pre_hook(pre_hook)
 
-    trackers = []
-    for _ in range(predictor.dataset.bs):
-        tracker = TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=30)
-        trackers.append(tracker)
-        if predictor.dataset.mode != "stream":  # only need one tracker for other modes
-            break
-    predictor.trackers = trackers
+    # a single tracker updates all streams of a stream batch together
+    streams = predictor.dataset.bs if predictor.dataset.mode == "stream" else 1
+    predictor.trackers = [TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=30, streams=streams)]
     predictor.vid_path = [None] * predictor.dataset.bs  # for determining when to reset tracker on new video
 
 
@@ -84,15 +80,27 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
     """
     is_obb = predictor.args.task == "obb"
     is_stream = predictor.dataset.mode == "stream"
-    for i, result in enumerate(predictor.results):
-        tracker = predictor.trackers[i if is_stream else 0]
-        vid_path = predictor.save_dir / Path(result.path).name
-        if not persist and predictor.vid_path[i if is_stream else 0] != vid_path:
-            tracker.reset()
-            predictor.vid_path[i if is_stream else 0] = vid_path
-
-        det = (result.obb if is_obb else result.boxes).cpu().numpy()
-        tracks = tracker.update(det, result.orig_img, getattr(result, "feats", None))
+    tracker = predictor.trackers[0]
+    dets = [(result.obb if is_obb else result.boxes).cpu().numpy() for result in predictor.results]
+    if is_stream:
+        vid_paths = [predictor.save_dir / Path(result.path).name for result in predictor.results]
+        changed = [i for i, (a, b) in enumerate(zip(predictor.vid_path, vid_paths)) if a != b]
+        if not persist and changed:  # reset only the streams whose source changed
+            tracker.reset_streams(changed)
+        predictor.vid_path = vid_paths
+        imgs = [result.orig_img for result in predictor.results]
+        feats = [getattr(result, "feats", None) for result in predictor.results]
+        all_tracks = tracker.update_streams(dets, imgs, feats)
+    else:
+        all_tracks = []
+        for result, det in zip(predictor.results, dets):
+            vid_path = predictor.save_dir / Path(result.path).name
+            if not persist and predictor.vid_path[0] != vid_path:
+                tracker.reset()
+                predictor.vid_path[0] = vid_path
+            all_tracks.append(tracker.update(det, result.orig_img, getattr(result, "feats", None)))
+
+    for i, (result, tracks) in enumerate(zip(predictor.results, all_tracks)):
         if len(tracks) == 0:
             continue
         idx = tracks[:, -1].astype(int)
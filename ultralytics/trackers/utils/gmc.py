@@ -1,7 +1,10 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import copy
-from typing import List, Optional
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional
 
 import cv2
 import numpy as np
@@ -9,19 +12,109 @@ import numpy as np
 from ultralytics.utils import LOGGER
 
 
+class FramePyramid:
+    """
+    Grayscale and downscaled versions of a frame, computed once and shared by everything that processes the frame.
+
+    Pyramids are cached per frame object, so all consumers of the same frame, e.g. motion compensation and other
+    per-frame analytics, only convert and downscale it once. Only the pyramids of the `cache_size` most recently used
+    frames are kept, and a frame must not be modified in place while its pyramid is in use.
+
+    Attributes:
+        frame (weakref.ref): Weak reference to the frame, with shape (H, W) or (H, W, C) in BGR order.
+        levels (dict): Cached grayscale levels keyed by downscale factor and blur.
+        cache_size (int): Maximum number of frames whose pyramids are cached, shared by all instances.
+
+    Methods:
+        of: Return the cached pyramid of a frame, creating it if needed.
+        gray: Return the grayscale frame downscaled by an integer factor.
+
+    Examples:
+        Share the downscaled grayscale frame between consumers
+        >>> frame = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
+        >>> small = FramePyramid.of(frame).gray(2)
+        >>> FramePyramid.of(frame).gray(2) is small
+        True
+    """
+
+    cache_size = 16
+    _cache: "OrderedDict[int, FramePyramid]" = OrderedDict()
+
+    def __init__(self, frame: np.ndarray) -> None:
+        """
+        Initialize an empty pyramid of a frame, whose levels are computed on first use.
+
+        Args:
+            frame (np.ndarray): The frame with shape (H, W) or (H, W, C) in BGR order.
+        """
+        self.frame = weakref.ref(frame)
+        self.levels = {}
+
+    @classmethod
+    def of(cls, frame: np.ndarray) -> "FramePyramid":
+        """Return the cached pyramid of a frame, creating and caching it if the frame has not been seen recently."""
+        key = id(frame)
+        pyramid = cls._cache.get(key)
+        if pyramid is None or pyramid.frame() is not frame:  # ids of garbage collected frames are reused
+            pyramid = cls._cache[key] = cls(frame)
+            while len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)  # least recently used
+        cls._cache.move_to_end(key)
+        return pyramid
+
+    def gray(self, downscale: int = 1, blur: bool = False) -> np.ndarray:
+        """
+        Return the grayscale frame downscaled by an integer factor.
+
+        Args:
+            downscale (int): Factor by which width and height are divided.
+            blur (bool): Apply a 3x3 Gaussian blur to the full-resolution grayscale frame before downscaling.
+
+        Returns:
+            (np.ndarray): The grayscale level with shape (H // downscale, W // downscale).
+        """
+        key = ("gray", downscale, blur)
+        if key not in self.levels:
+            if downscale == 1 and not blur:
+                frame = self.frame()
+                if frame.ndim == 3 and frame.shape[2] == 3:
+                    self.levels[key] = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                else:
+                    self.levels[key] = frame.reshape(frame.shape[:2]).copy()  # decouple from later frame changes
+            else:
+                gray = self.gray()
+                if blur:
+                    gray = cv2.GaussianBlur(gray, (3, 3), 1.5)
+                if downscale > 1:
+                    gray = cv2.resize(gray, (gray.shape[1] // downscale, gray.shape[0] // downscale))
+                self.levels[key] = gray
+        return self.levels[key]
+
+
 class GMC:
     """
     Generalized Motion Compensation (GMC) class for tracking and object detection in video frames.
 
     This class provides methods for tracking and detecting objects based on several tracking algorithms including ORB,
-    SIFT, ECC, and Sparse Optical Flow. It also supports downscaling of frames for computational efficiency.
+    SIFT, ECC, and Sparse Optical Flow. It also supports downscaling of frames for computational efficiency. Grayscale
+    conversion and downscaling go through the shared FramePyramid cache, so each frame is only converted once.
+
+    Sparse Optical Flow can track its keypoints across frames, re-detecting them only on keyframes when too few of them
+    remain inliers. With a time budget, the processing resolution is halved while the smoothed frame time exceeds it,
+    and doubled again, up to the configured one, once there is ample headroom.
 
     Attributes:
         method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
         downscale (int): Factor by which to downscale the frames for processing.
+        refresh (float): Fraction of keyframe keypoints that must remain inliers to keep tracking them.
+        budget (float): Per-frame time budget in milliseconds, 0 for unlimited.
+        base_downscale (int): Configured downscale factor, the smallest one used under a budget.
+        frame_time (float): Exponential moving average of the frame time in milliseconds.
+        frames (int): Number of frames timed since the downscale factor last changed.
         prevFrame (np.ndarray): Previous frame for tracking.
         prevKeyPoints (List): Keypoints from the previous frame.
         prevDescriptors (np.ndarray): Descriptors from the previous frame.
+        keyframeKeyPoints (int): Number of keypoints detected on the last keyframe.
         initializedFirstFrame (bool): Flag indicating if the first frame has been processed.
 
     Methods:
@@ -29,6 +122,8 @@ class GMC:
         apply_ecc: Apply the ECC algorithm to a raw frame.
         apply_features: Apply feature-based methods like ORB or SIFT to a raw frame.
         apply_sparseoptflow: Apply the Sparse Optical Flow method to a raw frame.
+        state_dict: Return the motion estimation state as a dictionary of arrays.
+        load_state_dict: Restore the motion estimation state from a dictionary of arrays.
         reset_params: Reset the internal parameters of the GMC object.
 
     Examples:
@@ -41,13 +136,20 @@ class GMC:
                [4, 5, 6]])
     """
 
-    def __init__(self, method: str = "sparseOptFlow", downscale: int = 2) -> None:
+    def __init__(
+        self, method: str = "sparseOptFlow", downscale: int = 2, refresh: float = 1.0, budget: float = 0.0
+    ) -> None:
         """
         Initialize a Generalized Motion Compensation (GMC) object with tracking method and downscale factor.
 
         Args:
             method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
             downscale (int): Downscale factor for processing frames.
+            refresh (float): Sparse Optical Flow keeps tracking its keypoints while more than this fraction of the
+                keyframe keypoints remain inliers, and re-detects them otherwise. 1.0 re-detects them every frame.
+            budget (float): Per-frame time budget in milliseconds. The downscale factor doubles while the smoothed
+                frame time exceeds it and halves, down to `downscale`, while it stays under a fifth of it. 0 disables
+                the budget.
 
         Examples:
             Initialize a GMC object with the 'sparseOptFlow' method and a downscale factor of 2
@@ -57,6 +159,11 @@ class GMC:
 
         self.method = method
         self.downscale = max(1, downscale)
+        self.refresh = refresh
+        self.budget = budget
+        self.base_downscale = self.downscale
+        self.frame_time = 0.0
+        self.frames = 0
 
         if self.method == "orb":
             self.detector = cv2.FastFeatureDetector_create(20)
@@ -87,6 +194,7 @@ class GMC:
         self.prevFrame = None
         self.prevKeyPoints = None
         self.prevDescriptors = None
+        self.keyframeKeyPoints = 0
         self.initializedFirstFrame = False
 
     def apply(self, raw_frame: np.ndarray, detections: Optional[List] = None) -> np.ndarray:
@@ -107,15 +215,35 @@ class GMC:
             >>> print(transformation_matrix.shape)
             (2, 3)
         """
+        t0, initialized = time.perf_counter(), self.initializedFirstFrame
         if self.method in {"orb", "sift"}:
-            return self.apply_features(raw_frame, detections)
+            H = self.apply_features(raw_frame, detections)
         elif self.method == "ecc":
-            return self.apply_ecc(raw_frame)
+            H = self.apply_ecc(raw_frame)
         elif self.method == "sparseOptFlow":
-            return self.apply_sparseoptflow(raw_frame)
+            H = self.apply_sparseoptflow(raw_frame)
         else:
             return np.eye(2, 3)
 
+        if self.budget and initialized:  # first frames only detect keypoints, so they are not representative
+            dt = (time.perf_counter() - t0) * 1000
+            self.frame_time = 0.9 * self.frame_time + 0.1 * dt if self.frames else dt
+            self.frames += 1
+            if self.frames >= 10:  # adapt the processing resolution, restarting from the next frame at the new one
+                downscale = self.downscale
+                if self.frame_time > self.budget and min(raw_frame.shape[:2]) // (2 * downscale) >= 64:
+                    downscale *= 2
+                elif self.frame_time < self.budget / 5 and downscale > self.base_downscale:  # ~4x cost when doubled
+                    downscale //= 2
+                if downscale != self.downscale:
+                    LOGGER.info(
+                        f"GMC took {self.frame_time:.1f}ms per frame for a {self.budget:g}ms budget, "
+                        f"downscaling frames by {downscale}"
+                    )
+                    self.downscale, self.frames = downscale, 0
+                    self.reset_params()
+        return H
+
     def apply_ecc(self, raw_frame: np.ndarray) -> np.ndarray:
         """
         Apply the ECC (Enhanced Correlation Coefficient) algorithm to a raw frame for motion compensation.
@@ -133,18 +261,13 @@ class GMC:
             [[1. 0. 0.]
              [0. 1. 0.]]
         """
-        height, width, c = raw_frame.shape
-        frame = cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY) if c == 3 else raw_frame
+        # Blurred and downscaled grayscale image for computational efficiency
+        frame = FramePyramid.of(raw_frame).gray(self.downscale, blur=self.downscale > 1)
         H = np.eye(2, 3, dtype=np.float32)
 
-        # Downscale image for computational efficiency
-        if self.downscale > 1.0:
-            frame = cv2.GaussianBlur(frame, (3, 3), 1.5)
-            frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
-
         # Handle first frame initialization
         if not self.initializedFirstFrame:
-            self.prevFrame = frame.copy()
+            self.prevFrame = frame
             self.initializedFirstFrame = True
             return H
 
@@ -174,16 +297,11 @@ class GMC:
             >>> print(transformation_matrix.shape)
             (2, 3)
         """
-        height, width, c = raw_frame.shape
-        frame = cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY) if c == 3 else raw_frame
+        # Downscaled grayscale image for computational efficiency
+        frame = FramePyramid.of(raw_frame).gray(self.downscale)
+        height, width = frame.shape
         H = np.eye(2, 3)
 
-        # Downscale image for computational efficiency
-        if self.downscale > 1.0:
-            frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
-            width = width // self.downscale
-            height = height // self.downscale
-
         # Create mask for keypoint detection, excluding border regions
         mask = np.zeros_like(frame)
         mask[int(0.02 * height) : int(0.98 * height), int(0.02 * width) : int(0.98 * width)] = 255
@@ -200,7 +318,7 @@ class GMC:
 
         # Handle first frame initialization
         if not self.initializedFirstFrame:
-            self.prevFrame = frame.copy()
+            self.prevFrame = frame
             self.prevKeyPoints = copy.copy(keypoints)
             self.prevDescriptors = copy.copy(descriptors)
             self.initializedFirstFrame = True
@@ -216,7 +334,7 @@ class GMC:
 
         # Handle empty matches case
         if len(knnMatches) == 0:
-            self.prevFrame = frame.copy()
+            self.prevFrame = frame
             self.prevKeyPoints = copy.copy(keypoints)
             self.prevDescriptors = copy.copy(descriptors)
             return H
@@ -268,7 +386,7 @@ class GMC:
             LOGGER.warning("not enough matching points")
 
         # Store current frame data for next iteration
-        self.prevFrame = frame.copy()
+        self.prevFrame = frame
         self.prevKeyPoints = copy.copy(keypoints)
         self.prevDescriptors = copy.copy(descriptors)
 
@@ -291,21 +409,15 @@ class GMC:
             [[1. 0. 0.]
              [0. 1. 0.]]
         """
-        height, width, c = raw_frame.shape
-        frame = cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY) if c == 3 else raw_frame
+        # Downscaled grayscale image for computational efficiency
+        frame = FramePyramid.of(raw_frame).gray(self.downscale)
         H = np.eye(2, 3)
 
-        # Downscale image for computational efficiency
-        if self.downscale > 1.0:
-            frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
-
-        # Find good features to track
-        keypoints = cv2.goodFeaturesToTrack(frame, mask=None, **self.feature_params)
-
         # Handle first frame initialization
         if not self.initializedFirstFrame or self.prevKeyPoints is None:
-            self.prevFrame = frame.copy()
-            self.prevKeyPoints = copy.copy(keypoints)
+            self.prevFrame = frame
+            self.prevKeyPoints = cv2.goodFeaturesToTrack(self.prevFrame, mask=None, **self.feature_params)
+            self.keyframeKeyPoints = 0 if self.prevKeyPoints is None else len(self.prevKeyPoints)
             self.initializedFirstFrame = True
             return H
 
@@ -313,20 +425,14 @@ class GMC:
         matchedKeypoints, status, _ = cv2.calcOpticalFlowPyrLK(self.prevFrame, frame, self.prevKeyPoints, None)
 
         # Extract successfully tracked points
-        prevPoints = []
-        currPoints = []
-
-        for i in range(len(status)):
-            if status[i]:
-                prevPoints.append(self.prevKeyPoints[i])
-                currPoints.append(matchedKeypoints[i])
-
-        prevPoints = np.array(prevPoints)
-        currPoints = np.array(currPoints)
+        status = status.ravel().astype(bool)
+        prevPoints = self.prevKeyPoints[status]
+        currPoints = matchedKeypoints[status]
+        inliers = None
 
         # Estimate transformation matrix using RANSAC
-        if (prevPoints.shape[0] > 4) and (prevPoints.shape[0] == currPoints.shape[0]):
-            H, _ = cv2.estimateAffinePartial2D(prevPoints, currPoints, cv2.RANSAC)
+        if prevPoints.shape[0] > 4:
+            H, inliers = cv2.estimateAffinePartial2D(prevPoints, currPoints, cv2.RANSAC)
 
             # Scale translation components back to original resolution
             if self.downscale > 1.0:
@@ -335,15 +441,63 @@ class GMC:
         else:
             LOGGER.warning("not enough matching points")
 
-        # Store current frame data for next iteration
-        self.prevFrame = frame.copy()
-        self.prevKeyPoints = copy.copy(keypoints)
+        # Store current frame data for next iteration, tracking the inliers further unless too few of them are left
+        self.prevFrame = frame
+        if self.refresh < 1 and inliers is not None and inliers.sum() > self.refresh * self.keyframeKeyPoints:
+            self.prevKeyPoints = currPoints[inliers.ravel().astype(bool)]
+        else:
+            self.prevKeyPoints = cv2.goodFeaturesToTrack(self.prevFrame, mask=None, **self.feature_params)
+            self.keyframeKeyPoints = 0 if self.prevKeyPoints is None else len(self.prevKeyPoints)
 
         return H
 
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        """
+        Return the motion estimation state as a flat dictionary of arrays.
+
+        The state holds the reference frame with its keypoints and descriptors and the current downscale factor. ORB
+        and SIFT keypoints are stored as rows of (x, y, size, angle, response, octave, class_id).
+
+        Returns:
+            (Dict[str, np.ndarray]): GMC state, which can be restored with `load_state_dict`.
+        """
+        state = {
+            "downscale": np.array(self.downscale),
+            "keyframeKeyPoints": np.array(self.keyframeKeyPoints),
+            "initializedFirstFrame": np.array(self.initializedFirstFrame),
+        }
+        keypoints = self.prevKeyPoints
+        if keypoints is not None and self.method in {"orb", "sift"}:
+            keypoints = [(*k.pt, k.size, k.angle, k.response, k.octave, k.class_id) for k in keypoints]
+            keypoints = np.array(keypoints, dtype=np.float32).reshape(-1, 7)
+        arrays = {
+            "prevFrame": self.prevFrame,
+            "prevKeyPoints": keypoints,
+            "prevDescriptors": self.prevDescriptors,
+        }
+        state.update({k: v.copy() for k, v in arrays.items() if v is not None})  # decouple from later updates
+        return state
+
+    def load_state_dict(self, state: Dict[str, np.ndarray]) -> None:
+        """Restore the motion estimation state returned by `state_dict`."""
+        self.reset_params()
+        self.downscale = int(state["downscale"])
+        self.keyframeKeyPoints = int(state["keyframeKeyPoints"])
+        self.initializedFirstFrame = bool(state["initializedFirstFrame"])
+        self.prevFrame, self.prevKeyPoints, self.prevDescriptors = (
+            None if state.get(k) is None else np.array(state[k])  # copies, the state may be restored again
+            for k in ("prevFrame", "prevKeyPoints", "prevDescriptors")
+        )
+        if self.prevKeyPoints is not None and self.method in {"orb", "sift"}:
+            self.prevKeyPoints = tuple(
+                cv2.KeyPoint(x, y, size, angle, response, int(octave), int(class_id))
+                for x, y, size, angle, response, octave, class_id in self.prevKeyPoints.tolist()
+            )
+
     def reset_params(self) -> None:
         """Reset the internal parameters including previous frame, keypoints, and descriptors."""
         self.prevFrame = None
         self.prevKeyPoints = None
         self.prevDescriptors = None
+        self.keyframeKeyPoints = 0
         self.initializedFirstFrame = False
@@ -23,9 +23,13 @@ class KalmanFilterXYAH:
         initiate: Create a track from an unassociated measurement.
         predict: Run the Kalman filter prediction step.
         project: Project the state distribution to measurement space.
+        multi_initiate: Create tracks from multiple unassociated measurements (vectorized version).
+        multi_project: Project multiple state distributions to measurement space (vectorized version).
         multi_predict: Run the Kalman filter prediction step (vectorized version).
         update: Run the Kalman filter correction step.
+        multi_update: Run the Kalman filter correction step (vectorized version).
         gating_distance: Compute the gating distance between state distribution and measurements.
+        multi_gating_distance: Compute the gating distances between multiple states and measurements.
 
     Examples:
         Initialize the Kalman filter and create a track from a measurement
@@ -95,6 +99,37 @@ class KalmanFilterXYAH:
         covariance = np.diag(np.square(std))
         return mean, covariance
 
+    def multi_initiate(self, measurement: np.ndarray):
+        """
+        Create tracks from multiple unassociated measurements (vectorized version).
+
+        Args:
+            measurement (np.ndarray): The Nx4 dimensional matrix of bounding box coordinates (x, y, a, h).
+
+        Returns:
+            mean (np.ndarray): Mean matrix of the new tracks with shape (N, 8).
+            covariance (np.ndarray): Covariance matrix of the new tracks with shape (N, 8, 8).
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> measurement = np.array([[100, 50, 1.5, 200], [300, 80, 0.5, 100]])
+            >>> mean, covariance = kf.multi_initiate(measurement)
+        """
+        mean = np.concatenate((measurement, np.zeros_like(measurement)), axis=1)
+        h = measurement[:, 3]
+        std = [
+            2 * self._std_weight_position * h,
+            2 * self._std_weight_position * h,
+            1e-2 * np.ones_like(h),
+            2 * self._std_weight_position * h,
+            10 * self._std_weight_velocity * h,
+            10 * self._std_weight_velocity * h,
+            1e-5 * np.ones_like(h),
+            10 * self._std_weight_velocity * h,
+        ]
+        covariance = np.square(std).T[:, :, None] * np.eye(8)
+        return mean, covariance
+
     def predict(self, mean: np.ndarray, covariance: np.ndarray):
         """
         Run Kalman filter prediction step.
@@ -162,6 +197,31 @@ class KalmanFilterXYAH:
         covariance = np.linalg.multi_dot((self._update_mat, covariance, self._update_mat.T))
         return mean, covariance + innovation_cov
 
+    def multi_project(self, mean: np.ndarray, covariance: np.ndarray):
+        """
+        Project multiple state distributions to measurement space (vectorized version).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the states.
+
+        Returns:
+            mean (np.ndarray): Projected mean matrix with shape (N, 4).
+            covariance (np.ndarray): Projected covariance matrix with shape (N, 4, 4).
+        """
+        h = mean[:, 3]
+        std = [
+            self._std_weight_position * h,
+            self._std_weight_position * h,
+            1e-1 * np.ones_like(h),
+            self._std_weight_position * h,
+        ]
+        innovation_cov = np.square(std).T[:, :, None] * np.eye(4)
+
+        mean = mean @ self._update_mat.T
+        covariance = self._update_mat @ covariance @ self._update_mat.T
+        return mean, covariance + innovation_cov
+
     def multi_predict(self, mean: np.ndarray, covariance: np.ndarray):
         """
         Run Kalman filter prediction step for multiple object states (Vectorized version).
@@ -235,6 +295,38 @@ class KalmanFilterXYAH:
         new_covariance = covariance - np.linalg.multi_dot((kalman_gain, projected_cov, kalman_gain.T))
         return new_mean, new_covariance
 
+    def multi_update(self, mean: np.ndarray, covariance: np.ndarray, measurement: np.ndarray):
+        """
+        Run Kalman filter correction step for multiple object states (vectorized version).
+
+        All gains are solved in one stacked operation instead of one Cholesky factorization per track, which removes the
+        per-call overhead that dominates for these small matrices.
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the predicted states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the predicted states.
+            measurement (np.ndarray): The Nx4 dimensional matrix of measurements, one per state.
+
+        Returns:
+            new_mean (np.ndarray): Measurement-corrected mean matrix with shape (N, 8).
+            new_covariance (np.ndarray): Measurement-corrected covariance matrix with shape (N, 8, 8).
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> mean, covariance = kf.multi_initiate(np.array([[100, 50, 1.5, 200], [300, 80, 0.5, 100]]))
+            >>> measurement = np.array([[102, 51, 1.5, 201], [299, 80, 0.5, 99]])
+            >>> new_mean, new_covariance = kf.multi_update(mean, covariance, measurement)
+        """
+        projected_mean, projected_cov = self.multi_project(mean, covariance)
+
+        # K = P H^T S^-1, solved as S K^T = H P since S and P are symmetric
+        kalman_gain = np.linalg.solve(projected_cov, self._update_mat @ covariance).transpose(0, 2, 1)
+        innovation = measurement - projected_mean
+
+        new_mean = mean + np.einsum("nij,nj->ni", kalman_gain, innovation)
+        new_covariance = covariance - kalman_gain @ projected_cov @ kalman_gain.transpose(0, 2, 1)
+        return new_mean, new_covariance
+
     def gating_distance(
         self,
         mean: np.ndarray,
@@ -285,6 +377,50 @@ class KalmanFilterXYAH:
         else:
             raise ValueError("Invalid distance metric")
 
+    def multi_gating_distance(
+        self,
+        mean: np.ndarray,
+        covariance: np.ndarray,
+        measurements: np.ndarray,
+        only_position: bool = False,
+        metric: str = "maha",
+    ) -> np.ndarray:
+        """
+        Compute gating distances between multiple state distributions and measurements (vectorized version).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the states.
+            measurements (np.ndarray): An (M, 4) matrix of M measurements in the format of the state.
+            only_position (bool, optional): If True, distance computation is done with respect to box center position
+                only.
+            metric (str, optional): The metric to use for calculating the distance. Options are 'gaussian' for the
+                squared Euclidean distance and 'maha' for the squared Mahalanobis distance.
+
+        Returns:
+            (np.ndarray): An (N, M) matrix, where element (i, j) is the squared distance between state i and
+                `measurements[j]`.
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> mean, covariance = kf.multi_initiate(np.array([[0, 0, 1, 1], [5, 5, 1, 1]]))
+            >>> measurements = np.array([[1, 1, 1, 1], [2, 2, 1, 1], [5, 5, 1, 1]])
+            >>> distances = kf.multi_gating_distance(mean, covariance, measurements)  # shape (2, 3)
+        """
+        mean, covariance = self.multi_project(mean, covariance)
+        if only_position:
+            mean, covariance = mean[:, :2], covariance[:, :2, :2]
+            measurements = measurements[:, :2]
+
+        d = measurements[None] - mean[:, None]  # (N, M, 4)
+        if metric == "gaussian":
+            return np.sum(d * d, axis=2)
+        elif metric == "maha":
+            z = np.linalg.solve(np.linalg.cholesky(covariance), d.transpose(0, 2, 1))
+            return np.sum(z * z, axis=1)  # square maha
+        else:
+            raise ValueError("Invalid distance metric")
+
 
 class KalmanFilterXYWH(KalmanFilterXYAH):
     """
@@ -303,8 +439,10 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
 
     Methods:
         initiate: Create a track from an unassociated measurement.
+        multi_initiate: Create tracks from multiple unassociated measurements in a vectorized manner.
         predict: Run the Kalman filter prediction step.
         project: Project the state distribution to measurement space.
+        multi_project: Project multiple state distributions to measurement space in a vectorized manner.
         multi_predict: Run the Kalman filter prediction step in a vectorized manner.
         update: Run the Kalman filter correction step.
 
@@ -361,6 +499,37 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         covariance = np.diag(np.square(std))
         return mean, covariance
 
+    def multi_initiate(self, measurement: np.ndarray):
+        """
+        Create tracks from multiple unassociated measurements (vectorized version).
+
+        Args:
+            measurement (np.ndarray): The Nx4 dimensional matrix of bounding box coordinates (x, y, w, h).
+
+        Returns:
+            mean (np.ndarray): Mean matrix of the new tracks with shape (N, 8).
+            covariance (np.ndarray): Covariance matrix of the new tracks with shape (N, 8, 8).
+
+        Examples:
+            >>> kf = KalmanFilterXYWH()
+            >>> measurement = np.array([[100, 50, 20, 40], [300, 80, 10, 20]])
+            >>> mean, covariance = kf.multi_initiate(measurement)
+        """
+        mean = np.concatenate((measurement, np.zeros_like(measurement)), axis=1)
+        w, h = measurement[:, 2], measurement[:, 3]
+        std = [
+            2 * self._std_weight_position * w,
+            2 * self._std_weight_position * h,
+            2 * self._std_weight_position * w,
+            2 * self._std_weight_position * h,
+            10 * self._std_weight_velocity * w,
+            10 * self._std_weight_velocity * h,
+            10 * self._std_weight_velocity * w,
+            10 * self._std_weight_velocity * h,
+        ]
+        covariance = np.square(std).T[:, :, None] * np.eye(8)
+        return mean, covariance
+
     def predict(self, mean: np.ndarray, covariance: np.ndarray):
         """
         Run Kalman filter prediction step.
@@ -428,6 +597,31 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         covariance = np.linalg.multi_dot((self._update_mat, covariance, self._update_mat.T))
         return mean, covariance + innovation_cov
 
+    def multi_project(self, mean: np.ndarray, covariance: np.ndarray):
+        """
+        Project multiple state distributions to measurement space (vectorized version).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the states.
+
+        Returns:
+            mean (np.ndarray): Projected mean matrix with shape (N, 4).
+            covariance (np.ndarray): Projected covariance matrix with shape (N, 4, 4).
+        """
+        w, h = mean[:, 2], mean[:, 3]
+        std = [
+            self._std_weight_position * w,
+            self._std_weight_position * h,
+            self._std_weight_position * w,
+            self._std_weight_position * h,
+        ]
+        innovation_cov = np.square(std).T[:, :, None] * np.eye(4)
+
+        mean = mean @ self._update_mat.T
+        covariance = self._update_mat @ covariance @ self._update_mat.T
+        return mean, covariance + innovation_cov
+
     def multi_predict(self, mean: np.ndarray, covariance: np.ndarray):
         """
         Run Kalman filter prediction step (Vectorized version).
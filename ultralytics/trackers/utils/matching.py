@@ -1,10 +1,15 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+from typing import Optional, Tuple
+
 import numpy as np
 import scipy
+import torch
+from scipy.sparse import coo_matrix, issparse
+from scipy.sparse.csgraph import connected_components
 from scipy.spatial.distance import cdist
 
-from ultralytics.utils.metrics import batch_probiou, bbox_ioa
+from ultralytics.utils.metrics import batch_probiou, bbox_ioa, probiou
 
 try:
     import lap  # for linear_assignment
@@ -21,8 +26,13 @@ def linear_assignment(cost_matrix: np.ndarray, thresh: float, use_lap: bool = Tr
     """
     Perform linear assignment using either the scipy or lap.lapjv method.
 
+    Sparse cost matrices only hold the costs of candidate pairs, all other pairs can not be assigned. They are solved
+    per connected component of the candidate pairs, so block-diagonal problems such as multi-stream association and
+    spatially gated problems are solved without materializing the dense matrix.
+
     Args:
-        cost_matrix (np.ndarray): The matrix containing cost values for assignments, with shape (N, M).
+        cost_matrix (np.ndarray | scipy.sparse.spmatrix): The matrix containing cost values for assignments, with shape
+            (N, M).
         thresh (float): Threshold for considering an assignment valid.
         use_lap (bool): Use lap.lapjv for the assignment. If False, scipy.optimize.linear_sum_assignment is used.
 
@@ -39,6 +49,9 @@ def linear_assignment(cost_matrix: np.ndarray, thresh: float, use_lap: bool = Tr
     if cost_matrix.size == 0:
         return np.empty((0, 2), dtype=int), tuple(range(cost_matrix.shape[0])), tuple(range(cost_matrix.shape[1]))
 
+    if issparse(cost_matrix):
+        return sparse_linear_assignment(cost_matrix, thresh)
+
     if use_lap:
         # Use lap.lapjv
         # https://github.com/gatagat/lap
@@ -61,16 +74,141 @@ def linear_assignment(cost_matrix: np.ndarray, thresh: float, use_lap: bool = Tr
     return matches, unmatched_a, unmatched_b
 
 
-def iou_distance(atracks: list, btracks: list) -> np.ndarray:
+def sparse_linear_assignment(cost_matrix, thresh: float):
+    """
+    Perform linear assignment on a sparse cost matrix by solving each of its connected components separately.
+
+    Only pairs costing at most thresh are kept, which splits the bipartite graph of candidate pairs into connected
+    components that are assigned independently. Components with a single candidate pair are matched directly, the
+    others are solved densely with lap.lapjv, so large and spread out scenes cost roughly linear time.
+
+    Args:
+        cost_matrix (scipy.sparse.spmatrix): Costs of the candidate pairs, with shape (N, M).
+        thresh (float): Threshold for considering an assignment valid.
+
+    Returns:
+        matched_indices (np.ndarray): Array of matched indices of shape (K, 2), where K is the number of matches.
+        unmatched_a (np.ndarray): Array of unmatched indices from the first set, with shape (L,).
+        unmatched_b (np.ndarray): Array of unmatched indices from the second set, with shape (M,).
+
+    Examples:
+        >>> from scipy.sparse import coo_matrix
+        >>> cost_matrix = coo_matrix(([0.1, 0.3], ([0, 1], [1, 0])), shape=(2, 3))
+        >>> matched_indices, unmatched_a, unmatched_b = sparse_linear_assignment(cost_matrix, thresh=0.8)
+    """
+    cost_matrix = cost_matrix.tocoo()
+    n, m = cost_matrix.shape
+    keep = cost_matrix.data <= thresh
+    r, c, v = cost_matrix.row[keep], cost_matrix.col[keep], cost_matrix.data[keep]
+    graph = coo_matrix((np.ones(len(v)), (r, n + c)), shape=(n + m, n + m))
+    _, labels = connected_components(graph, directed=False)
+    label_a, label_b, label_pair = labels[:n], labels[n:], labels[:n][r]
+    sizes_a, sizes_b = np.bincount(label_a, minlength=n + m), np.bincount(label_b, minlength=n + m)
+    single = (sizes_a[label_pair] == 1) & (sizes_b[label_pair] == 1)
+    matches = [np.stack([r[single], c[single]], axis=1)]
+
+    # Solve the components with several candidate pairs, grouping their rows, columns and pairs by component
+    r, c, v, label_pair = r[~single], c[~single], v[~single], label_pair[~single]
+    components = np.unique(label_pair)
+    groups = []
+    for x in (label_a, label_b, label_pair):
+        order = np.argsort(x, kind="stable")
+        groups.append((order, np.searchsorted(x[order], components), np.searchsorted(x[order], components + 1)))
+    (order_a, start_a, end_a), (order_b, start_b, end_b), (order_pair, start_pair, end_pair) = groups
+    local_a, local_b = np.empty(n, dtype=int), np.empty(m, dtype=int)
+    for k in range(len(components)):
+        rows, cols = order_a[start_a[k] : end_a[k]], order_b[start_b[k] : end_b[k]]
+        pair = order_pair[start_pair[k] : end_pair[k]]
+        local_a[rows], local_b[cols] = np.arange(len(rows)), np.arange(len(cols))
+        block = np.full((len(rows), len(cols)), thresh + 1.0)  # pairs that are not candidates can never be matched
+        block[local_a[r[pair]], local_b[c[pair]]] = v[pair]
+        x = np.asarray(linear_assignment(block, thresh=thresh)[0], dtype=int).reshape(-1, 2)
+        matches.append(np.stack([rows[x[:, 0]], cols[x[:, 1]]], axis=1))
+
+    matches = np.concatenate(matches)
+    matches = matches[np.argsort(matches[:, 0])]
+    unmatched_a, unmatched_b = np.ones(n, dtype=bool), np.ones(m, dtype=bool)
+    unmatched_a[matches[:, 0]], unmatched_b[matches[:, 1]] = False, False
+    return matches, np.flatnonzero(unmatched_a), np.flatnonzero(unmatched_b)
+
+
+def _expand_ranges(order: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return index pairs (i, order[starts[i] + k]) for every i and 0 <= k < counts[i]."""
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(np.arange(len(starts)), counts), order[np.repeat(starts, counts) + offsets]
+
+
+def group_pairs(agroups: np.ndarray, bgroups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the index pairs of all elements of two arrays that belong to the same group.
+
+    Args:
+        agroups (np.ndarray): Group labels of set 'a' with shape (N,), e.g. the stream of each track.
+        bgroups (np.ndarray): Group labels of set 'b' with shape (M,), e.g. the stream of each detection.
+
+    Returns:
+        (Tuple[np.ndarray, np.ndarray]): Indices into 'a' and 'b' of every pair sharing a group, ordered by 'a'.
+
+    Examples:
+        >>> group_pairs(np.array([0, 1]), np.array([1, 0, 1]))
+        (array([0, 1, 1]), array([1, 0, 2]))
+    """
+    order = np.argsort(bgroups, kind="stable")
+    starts = np.searchsorted(bgroups[order], agroups, side="left")
+    counts = np.searchsorted(bgroups[order], agroups, side="right") - starts
+    return _expand_ranges(order, starts, counts)
+
+
+def overlap_pairs(
+    aboxes: np.ndarray, bboxes: np.ndarray, agroups: Optional[np.ndarray] = None, bgroups: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the index pairs of overlapping boxes, optionally only for boxes of the same group.
+
+    Boxes of 'b' are sorted by their left edge, so the candidates of each box of 'a' form one sorted interval that is
+    found with a binary search and then checked for overlap, instead of testing all N x M pairs.
+
+    Args:
+        aboxes (np.ndarray): Boxes of set 'a' in (x1, y1, x2, y2) format with shape (N, 4).
+        bboxes (np.ndarray): Boxes of set 'b' in (x1, y1, x2, y2) format with shape (M, 4).
+        agroups (np.ndarray, optional): Group labels of set 'a' with shape (N,), e.g. the stream of each track.
+        bgroups (np.ndarray, optional): Group labels of set 'b' with shape (M,), e.g. the stream of each detection.
+
+    Returns:
+        (Tuple[np.ndarray, np.ndarray]): Indices into 'a' and 'b' of every pair of overlapping boxes, ordered by 'a'.
+
+    Examples:
+        >>> overlap_pairs(np.array([[0, 0, 10, 10], [50, 50, 60, 60]]), np.array([[5, 5, 15, 15], [100, 0, 110, 10]]))
+        (array([0]), array([0]))
+    """
+    if len(aboxes) == 0 or len(bboxes) == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    ax, bx = aboxes[:, [0, 2]], bboxes[:, [0, 2]]
+    if agroups is not None:  # shift groups apart along x so boxes of different groups never overlap
+        x0 = min(ax.min(), bx.min())
+        span = max(ax.max(), bx.max()) - x0 + 1
+        ax, bx = ax - x0 + agroups[:, None] * span, bx - x0 + bgroups[:, None] * span
+    order = np.argsort(bx[:, 0])
+    left = bx[order, 0]
+    starts = np.searchsorted(left, ax[:, 0] - (bx[:, 1] - bx[:, 0]).max(), side="right")
+    counts = np.maximum(np.searchsorted(left, ax[:, 1], side="left") - starts, 0)
+    i, j = _expand_ranges(order, starts, counts)
+    keep = (bx[j, 1] > ax[i, 0]) & (bboxes[j, 1] < aboxes[i, 3]) & (bboxes[j, 3] > aboxes[i, 1])
+    return i[keep], j[keep]
+
+
+def iou_distance(atracks: list, btracks: list, pairs: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
     """
     Compute cost based on Intersection over Union (IoU) between tracks.
 
     Args:
-        atracks (List[STrack] | List[np.ndarray]): List of tracks 'a' or bounding boxes.
-        btracks (List[STrack] | List[np.ndarray]): List of tracks 'b' or bounding boxes.
+        atracks (List[STrack] | List[np.ndarray] | np.ndarray): List of tracks 'a' or bounding boxes.
+        btracks (List[STrack] | List[np.ndarray] | np.ndarray): List of tracks 'b' or bounding boxes.
+        pairs (Tuple[np.ndarray, np.ndarray], optional): Indices into 'a' and 'b' of the candidate pairs to compute.
 
     Returns:
-        (np.ndarray): Cost matrix computed based on IoU with shape (len(atracks), len(btracks)).
+        (np.ndarray): Cost matrix computed based on IoU with shape (len(atracks), len(btracks)), or the costs of the
+            candidate pairs with shape (P,) if `pairs` is given.
 
     Examples:
         Compute IoU distance between two sets of tracks
@@ -78,13 +216,25 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
         >>> btracks = [np.array([5, 5, 15, 15]), np.array([25, 25, 35, 35])]
         >>> cost_matrix = iou_distance(atracks, btracks)
     """
-    if atracks and isinstance(atracks[0], np.ndarray) or btracks and isinstance(btracks[0], np.ndarray):
+    if len(atracks) and isinstance(atracks[0], np.ndarray) or len(btracks) and isinstance(btracks[0], np.ndarray):
         atlbrs = atracks
         btlbrs = btracks
     else:
         atlbrs = [track.xywha if track.angle is not None else track.xyxy for track in atracks]
         btlbrs = [track.xywha if track.angle is not None else track.xyxy for track in btracks]
 
+    if pairs is not None:
+        if len(pairs[0]) == 0:
+            return np.zeros(0, dtype=np.float32)
+        a = np.ascontiguousarray(atlbrs, dtype=np.float32)[pairs[0]]
+        b = np.ascontiguousarray(btlbrs, dtype=np.float32)[pairs[1]]
+        if a.shape[1] == 5 and b.shape[1] == 5:
+            ious = probiou(torch.from_numpy(a), torch.from_numpy(b)).numpy()[:, 0]
+        else:
+            inter = (np.minimum(a[:, 2:], b[:, 2:]) - np.maximum(a[:, :2], b[:, :2])).clip(0).prod(1)
+            ious = inter / ((a[:, 2:] - a[:, :2]).prod(1) + (b[:, 2:] - b[:, :2]).prod(1) - inter + 1e-7)
+        return 1 - ious  # costs of the candidate pairs
+
     ious = np.zeros((len(atlbrs), len(btlbrs)), dtype=np.float32)
     if len(atlbrs) and len(btlbrs):
         if len(atlbrs[0]) == 5 and len(btlbrs[0]) == 5:
@@ -101,18 +251,24 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
     return 1 - ious  # cost matrix
 
 
-def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -> np.ndarray:
+def embedding_distance(
+    tracks: list, detections: list, metric: str = "cosine", pairs: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> np.ndarray:
     """
     Compute distance between tracks and detections based on embeddings.
 
     Args:
-        tracks (List[STrack]): List of tracks, where each track contains embedding features.
-        detections (List[BaseTrack]): List of detections, where each detection contains embedding features.
-        metric (str): Metric for distance computation. Supported metrics include 'cosine', 'euclidean', etc.
+        tracks (List[STrack] | np.ndarray): List of tracks, where each track contains embedding features, or the
+            stacked smoothed track features with shape (N, D).
+        detections (List[BaseTrack] | np.ndarray): List of detections, where each detection contains embedding
+            features, or the stacked detection features with shape (M, D).
+        metric (str): Metric for distance computation. Supported metrics include 'cosine', 'euclidean', etc. Only
+            'cosine' and 'euclidean' are supported together with `pairs`.
+        pairs (Tuple[np.ndarray, np.ndarray], optional): Indices into tracks and detections of the candidate pairs.
 
     Returns:
         (np.ndarray): Cost matrix computed based on embeddings with shape (N, M), where N is the number of tracks
-            and M is the number of detections.
+            and M is the number of detections, or the costs of the candidate pairs with shape (P,) if `pairs` is given.
 
     Examples:
         Compute the embedding distance between tracks and detections using cosine metric
@@ -120,24 +276,45 @@ def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -
         >>> detections = [BaseTrack(...), BaseTrack(...)]  # List of detection objects with embedding features
         >>> cost_matrix = embedding_distance(tracks, detections, metric="cosine")
     """
+    if pairs is not None and len(pairs[0]) == 0:
+        return np.zeros(0, dtype=np.float32)
     cost_matrix = np.zeros((len(tracks), len(detections)), dtype=np.float32)
     if cost_matrix.size == 0:
         return cost_matrix
-    det_features = np.asarray([track.curr_feat for track in detections], dtype=np.float32)
+    if isinstance(detections, np.ndarray):
+        det_features = np.asarray(detections, dtype=np.float32)
+    else:
+        det_features = np.asarray([track.curr_feat for track in detections], dtype=np.float32)
     # for i, track in enumerate(tracks):
     # cost_matrix[i, :] = np.maximum(0.0, cdist(track.smooth_feat.reshape(1,-1), det_features, metric))
-    track_features = np.asarray([track.smooth_feat for track in tracks], dtype=np.float32)
+    if isinstance(tracks, np.ndarray):
+        track_features = np.asarray(tracks, dtype=np.float32)
+    else:
+        track_features = np.asarray([track.smooth_feat for track in tracks], dtype=np.float32)
+    if pairs is not None:
+        track_features, det_features = track_features[pairs[0]], det_features[pairs[1]]
+        if metric == "cosine":
+            norm = np.linalg.norm(track_features, axis=1) * np.linalg.norm(det_features, axis=1)
+            return np.maximum(0.0, 1 - (track_features * det_features).sum(1) / norm)
+        elif metric == "euclidean":
+            return np.linalg.norm(track_features - det_features, axis=1)
+        raise ValueError(f"Unsupported metric '{metric}' for candidate pairs, use 'cosine' or 'euclidean'")
     cost_matrix = np.maximum(0.0, cdist(track_features, det_features, metric))  # Normalized features
     return cost_matrix
 
 
-def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
+def fuse_score(
+    cost_matrix: np.ndarray, detections: list, pairs: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> np.ndarray:
     """
     Fuse cost matrix with detection scores to produce a single similarity matrix.
 
     Args:
         cost_matrix (np.ndarray): The matrix containing cost values for assignments, with shape (N, M).
-        detections (List[BaseTrack]): List of detections, each containing a score attribute.
+        detections (List[BaseTrack] | np.ndarray): List of detections, each containing a score attribute, or an array
+            of detection scores with shape (M,).
+        pairs (Tuple[np.ndarray, np.ndarray], optional): Candidate pairs the costs belong to, if `cost_matrix` holds
+            the costs of candidate pairs with shape (P,).
 
     Returns:
         (np.ndarray): Fused similarity matrix with shape (N, M).
@@ -151,7 +328,8 @@ def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
     if cost_matrix.size == 0:
         return cost_matrix
     iou_sim = 1 - cost_matrix
-    det_scores = np.array([det.score for det in detections])
-    det_scores = np.expand_dims(det_scores, axis=0).repeat(cost_matrix.shape[0], axis=0)
+    det_scores = detections if isinstance(detections, np.ndarray) else np.array([det.score for det in detections])
+    if pairs is not None:
+        det_scores = det_scores[pairs[1]]
     fuse_sim = iou_sim * det_scores
     return 1 - fuse_sim  # fuse_cost
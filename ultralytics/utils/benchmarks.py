@@ -6,6 +6,10 @@ Usage:
     from ultralytics.utils.benchmarks import ProfileModels, benchmark
     ProfileModels(['yolo11n.yaml', 'yolov8s.yaml']).run()
     benchmark(model='yolo11n.pt', imgsz=160)
+    benchmark_decode(streams=(1, 8, 32), decode_workers=4)
+    benchmark_letterbox(batch=(1, 8, 16))
+    benchmark_kalman(tracks=(10, 100, 1000, 10000))
+    benchmark_reid_cache(objects=(10, 50), cache=(0, 5, 15))
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -211,6 +215,283 @@ def benchmark(
     return df
 
 
+def benchmark_decode(
+    streams: Tuple[int, ...] = (1, 2, 4, 8, 16, 32),
+    decode_workers: int = 0,
+    imgsz: Tuple[int, int] = (1080, 1920),
+    frames: int = 90,
+):
+    """
+    Benchmark LoadStreams decoding throughput on synthetic video streams.
+
+    A synthetic MJPG video is written once and opened as every stream. Half of its frames are read from all streams
+    through a buffered LoadStreams, and decoded FPS is reported per wall-clock second and per CPU-second used by this
+    process and its decode worker processes.
+
+    Args:
+        streams (Tuple[int, ...]): Numbers of concurrent streams to benchmark.
+        decode_workers (int): Number of decode worker processes, 0 to decode on threads of this process.
+        imgsz (Tuple[int, int]): Synthetic video frame size (height, width).
+        frames (int): Number of frames in the synthetic video.
+
+    Returns:
+        (pandas.DataFrame): Streams, frames decoded, wall time, CPU cores used, FPS and FPS per core.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_decode
+        >>> df = benchmark_decode(streams=(1, 4), decode_workers=2, imgsz=(240, 320), frames=30)
+    """
+    import tempfile
+
+    import cv2
+    import pandas as pd
+    import psutil
+
+    from ultralytics.data.loaders import LoadStreams
+
+    def cpu_time():
+        """Return CPU seconds used by this process and its live child processes."""
+        procs = [psutil.Process()] + psutil.Process().children(recursive=True)
+        return sum(sum(p.cpu_times()[:2]) for p in procs if p.is_running())
+
+    h, w = imgsz
+    y = []
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "synthetic.avi"
+        writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"MJPG"), 30, (w, h))
+        grid = np.add.outer(np.arange(h), np.arange(w))
+        for i in range(frames):
+            writer.write(np.repeat(((grid + 8 * i) % 256).astype(np.uint8)[..., None], 3, axis=2))
+        writer.release()
+        for n in streams:
+            source = Path(tmp) / f"{n}.streams"
+            source.write_text("\n".join([str(video)] * n))
+            dataset = LoadStreams(str(source), buffer=True, decode_workers=decode_workers)
+            c0, t0, f0 = cpu_time(), time.perf_counter(), sum(ring.head for ring in dataset.imgs)
+            for _ in zip(range(frames // 2), dataset):  # stop while decoders are still running to measure their CPU
+                pass
+            dt, cpu = time.perf_counter() - t0, cpu_time() - c0
+            decoded = sum(ring.head for ring in dataset.imgs) - f0  # read and buffered frames
+            dataset.close()
+            y.append([n, decoded, round(dt, 3), round(cpu / dt, 2), round(decoded / dt, 1), round(decoded / cpu, 1)])
+
+    df = pd.DataFrame(y, columns=["Streams", "Frames", "Time (s)", "Cores", "FPS", "FPS/core"])
+    LOGGER.info(f"\nDecode benchmark for {w}x{h} streams with decode_workers={decode_workers}\n{df}\n")
+    return df
+
+
+def benchmark_letterbox(
+    model: str = "yolo11n.pt",
+    batch: Tuple[int, ...] = (1, 8, 16),
+    imgsz: int = 640,
+    frame: Tuple[int, int] = (1080, 1920),
+    device: str = "cpu",
+    repeat: int = 5,
+):
+    """
+    Benchmark batched letterbox preprocessing against per-image letterboxing, stacking and normalization.
+
+    The per-image path letterboxes every frame into its own padded copy, stacks them, makes the BGR to RGB flipped
+    BCHW array contiguous and converts it to float, as the predictor did before batched preprocessing. The batched path
+    is `BasePredictor.preprocess`, which resizes frames straight into a reused batch buffer and normalizes it in one
+    pass. Peak host memory is measured with tracemalloc, which covers NumPy and OpenCV arrays, and counts the frame
+    copies alive at once.
+
+    Args:
+        model (str): Model whose predictor preprocesses the frames.
+        batch (Tuple[int, ...]): Batch sizes to benchmark.
+        imgsz (int): Inference image size.
+        frame (Tuple[int, int]): Synthetic frame size (height, width).
+        device (str): Device the batches are uploaded to.
+        repeat (int): Number of timed repetitions, the fastest of which is reported.
+
+    Returns:
+        (pandas.DataFrame): Batch size, path, time and peak host memory per frame, and speedup.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_letterbox
+        >>> df = benchmark_letterbox(batch=(1, 4), frame=(480, 640), repeat=1)
+    """
+    import tracemalloc
+
+    import pandas as pd
+
+    yolo = YOLO(model)
+    yolo.predict(np.zeros((*frame, 3), dtype=np.uint8), imgsz=imgsz, device=device, verbose=False)
+    predictor = yolo.predictor
+
+    def per_image(frames):
+        """Letterbox, stack and normalize frames one copy at a time."""
+        im = np.stack(predictor.pre_transform(frames))[..., ::-1].transpose((0, 3, 1, 2))
+        im = torch.from_numpy(np.ascontiguousarray(im)).to(predictor.device)
+        im = im.half() if predictor.model.fp16 else im.float()
+        im /= 255
+        return im
+
+    def profile(fn, frames):
+        """Return the fastest of `repeat` runs and the peak host memory of one run, both per frame."""
+        times = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            fn(frames)
+            times.append(time.perf_counter() - t)
+        tracemalloc.start()
+        fn(frames)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return min(times) / len(frames) * 1e3, peak / len(frames) / (1 << 20)
+
+    rng = np.random.default_rng(0)
+    y = []
+    for n in batch:
+        frames = [rng.integers(0, 255, (*frame, 3), dtype=np.uint8) for _ in range(n)]
+        predictor.preprocess(frames)  # allocate the reused batch buffer
+        (t0, m0), (t1, m1) = profile(per_image, frames), profile(predictor.preprocess, frames)
+        y.append([n, "per-image", round(t0, 2), round(m0, 1), 1.0])
+        y.append([n, "batched", round(t1, 2), round(m1, 1), round(t0 / t1, 1)])
+
+    df = pd.DataFrame(y, columns=["Batch", "Path", "Time (ms/frame)", "Peak host (MB/frame)", "Speedup"])
+    LOGGER.info(f"\nLetterbox benchmark for {frame[1]}x{frame[0]} frames at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def benchmark_kalman(tracks: Tuple[int, ...] = (10, 100, 1000, 10000), repeat: int = 5):
+    """
+    Benchmark per-track and vectorized Kalman filter steps for increasing numbers of tracks.
+
+    Initiate, update and gating distance are timed once per track through the single-state methods and once for all
+    tracks through their stacked `multi_` counterparts, on random boxes in (x, y, a, h) format.
+
+    Args:
+        tracks (Tuple[int, ...]): Numbers of tracks to benchmark.
+        repeat (int): Number of timed repetitions, the fastest of which is reported.
+
+    Returns:
+        (pandas.DataFrame): Tracks, step, per-track and vectorized time in milliseconds, and speedup.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_kalman
+        >>> df = benchmark_kalman(tracks=(10, 100), repeat=1)
+    """
+    import pandas as pd
+
+    from ultralytics.trackers.utils.kalman_filter import KalmanFilterXYAH
+
+    def best(fn):
+        """Return the fastest of `repeat` runs of fn in milliseconds."""
+        times = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t)
+        return min(times) * 1e3
+
+    kf = KalmanFilterXYAH()
+    rng = np.random.default_rng(0)
+    y = []
+    for n in tracks:
+        boxes = np.column_stack((rng.uniform(0, 1920, (n, 2)), rng.uniform(0.3, 3, n), rng.uniform(10, 300, n)))
+        mean, covariance = kf.multi_predict(*kf.multi_initiate(boxes))
+        measurement = boxes + rng.normal(0, 2, boxes.shape)
+        gate = measurement[:32]  # distances to a fixed number of measurements, so the cost grows with tracks only
+        steps = {
+            "initiate": (
+                lambda: [kf.initiate(b) for b in boxes],
+                lambda: kf.multi_initiate(boxes),
+            ),
+            "update": (
+                lambda: [kf.update(m, c, z) for m, c, z in zip(mean, covariance, measurement)],
+                lambda: kf.multi_update(mean, covariance, measurement),
+            ),
+            "gating_distance": (
+                lambda: [kf.gating_distance(m, c, gate) for m, c in zip(mean, covariance)],
+                lambda: kf.multi_gating_distance(mean, covariance, gate),
+            ),
+        }
+        for step, (loop, vectorized) in steps.items():
+            t0, t1 = best(loop), best(vectorized)
+            y.append([n, step, round(t0, 3), round(t1, 3), round(t0 / t1, 1)])
+
+    df = pd.DataFrame(y, columns=["Tracks", "Step", "Per-track (ms)", "Vectorized (ms)", "Speedup"])
+    LOGGER.info(f"\nKalman filter benchmark\n{df}\n")
+    return df
+
+
+def benchmark_reid_cache(
+    model: str = "yolo11n-cls.pt",
+    objects: Tuple[int, ...] = (10, 50),
+    cache: Tuple[int, ...] = (0, 5, 15),
+    frames: int = 100,
+    imgsz: Tuple[int, int] = (720, 1280),
+):
+    """
+    Benchmark BOTSORT tracking throughput and ID switches with and without the ReID feature cache.
+
+    Textured objects are rendered on a synthetic scene, half of them standing still and half of them crossing it
+    horizontally, and their ground-truth boxes with slight jitter are tracked by BOTSORT with a ReID model. Only the
+    tracker update is timed. ID switches count the frames in which an object got a different track ID than before.
+
+    Args:
+        model (str): ReID model, as the BOTSORT `model` argument.
+        objects (Tuple[int, ...]): Numbers of objects in the scene to benchmark.
+        cache (Tuple[int, ...]): `reid_cache` values to compare, 0 to embed every detection on every frame.
+        frames (int): Number of frames tracked.
+        imgsz (Tuple[int, int]): Synthetic frame size (height, width).
+
+    Returns:
+        (pandas.DataFrame): Objects, cache, embedded crops, time per frame, FPS and ID switches.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_reid_cache
+        >>> df = benchmark_reid_cache(objects=(10,), cache=(0, 5), frames=30)
+    """
+    import pandas as pd
+
+    from ultralytics.engine.results import Boxes
+    from ultralytics.trackers.bot_sort import BOTSORT
+    from ultralytics.utils import ROOT, IterableSimpleNamespace
+
+    h, w = imgsz
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (h, w, 3), dtype=np.uint8) // 4
+    cfg = {**YAML.load(ROOT / "cfg/trackers/botsort.yaml"), "gmc_method": "none", "with_reid": True, "model": model}
+    y = []
+    for n in objects:
+        size = rng.integers(40, 120, (n, 2))  # (w, h)
+        xy = rng.uniform(0, 1, (n, 2)) * ([w, h] - size)
+        speed = np.where(np.arange(n) % 2, rng.uniform(2, 6, n) * rng.choice([-1, 1], n), 0)  # half stand still
+        patches = [rng.integers(0, 255, (bh, bw, 3), dtype=np.uint8) for bw, bh in size]
+        scene = []
+        for _ in range(frames):
+            xy[:, 0] += speed
+            bounce = (xy[:, 0] < 0) | (xy[:, 0] > w - size[:, 0])
+            speed[bounce] *= -1
+            xy[:, 0] = xy[:, 0].clip(0, w - size[:, 0])
+            img, x0 = background.copy(), xy.astype(int)
+            for (x, y0), (bw, bh), patch in zip(x0, size, patches):
+                img[y0 : y0 + bh, x : x + bw] = patch
+            boxes = np.concatenate([x0, x0 + size], 1) + rng.normal(0, 1, (n, 4))
+            scene.append((img, np.column_stack([boxes, np.full(n, 0.9), np.zeros(n)])))
+
+        for c in cache:
+            tracker = BOTSORT(IterableSimpleNamespace(**{**cfg, "reid_cache": c}))
+            crops, encode = [], tracker.encode
+            tracker.encode = lambda dets, img, stream=None: crops.append(len(dets)) or encode(dets, img, stream)
+            ids, switches, dt = {}, 0, 0.0
+            for img, boxes in scene:
+                t = time.perf_counter()
+                tracks = tracker.update(Boxes(boxes, img.shape[:2]), img)
+                dt += time.perf_counter() - t
+                for track_id, i in tracks[:, [-4, -1]].astype(int).tolist():  # detection index is the object
+                    switches += ids.setdefault(i, track_id) != track_id
+                    ids[i] = track_id
+            y.append([n, c, sum(crops), round(dt / frames * 1e3, 2), round(frames / dt, 1), switches])
+
+    df = pd.DataFrame(y, columns=["Objects", "Cache", "Crops", "Time (ms/frame)", "FPS", "ID switches"])
+    LOGGER.info(f"\nReID cache benchmark with {model}\n{df}\n")
+    return df
+
+
 class RF100Benchmark:
     """
     Benchmark YOLO model performance across various formats for speed and accuracy.
@@ -3,11 +3,11 @@
 from collections import abc
 from itertools import repeat
 from numbers import Number
-from typing import List, Union
+from typing import List, Tuple, Union
 
 import numpy as np
 
-from .ops import ltwh2xywh, ltwh2xyxy, resample_segments, xywh2ltwh, xywh2xyxy, xyxy2ltwh, xyxy2xywh
+from .ops import ltwh2xywh, ltwh2xyxy, xywh2ltwh, xywh2xyxy, xyxy2ltwh, xyxy2xywh
 
 
 def _ntuple(n):
@@ -20,6 +20,22 @@ def _ntuple(n):
     return parse
 
 
+def _stack_segments(segments: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack (M, 2) segments of varying M into an (N, max(M), 2) array padded with their last points, and their M."""
+    lengths = np.array([len(s) for s in segments], dtype=np.int64)
+    stacked = np.empty((len(segments), lengths.max(), 2), dtype=np.float32)
+    for s, x in zip(segments, stacked):
+        x[: len(s)] = s
+        x[len(s) :] = s[-1]
+    return stacked, lengths
+
+
+def _pad_segments(segments: np.ndarray, n: int) -> np.ndarray:
+    """Pad (N, M, 2) segments to n points by repeating their last points."""
+    m = segments.shape[1]
+    return np.concatenate((segments, segments[:, -1:].repeat(n - m, axis=1)), axis=1) if n > m else segments
+
+
 to_2tuple = _ntuple(2)
 to_4tuple = _ntuple(4)
 
@@ -27,6 +43,14 @@ to_4tuple = _ntuple(4)
 # `xywh` means center x, center y and width, height(YOLO format)
 # `ltwh` means left top and width, height(COCO format)
 _formats = ["xyxy", "xywh", "ltwh"]
+_converters = {
+    ("xyxy", "xywh"): xyxy2xywh,
+    ("xyxy", "ltwh"): xyxy2ltwh,
+    ("xywh", "xyxy"): xywh2xyxy,
+    ("xywh", "ltwh"): xywh2ltwh,
+    ("ltwh", "xyxy"): ltwh2xyxy,
+    ("ltwh", "xywh"): ltwh2xywh,
+}
 
 __all__ = ("Bboxes", "Instances")  # tuple or list
 
@@ -38,15 +62,21 @@ class Bboxes:
     The class supports various bounding box formats like 'xyxy', 'xywh', and 'ltwh' and provides methods for format
     conversion, scaling, and area calculation. Bounding box data should be provided as numpy arrays.
 
+    Format conversions are deferred: `convert` only records the requested format and the stored boxes are converted
+    when `bboxes` is read, while scaling, translation and area calculation work on the stored boxes in whichever
+    format they are, so a chain of transforms converts the boxes once instead of at every step.
+
     Attributes:
-        bboxes (np.ndarray): The bounding boxes stored in a 2D numpy array with shape (N, 4).
+        bboxes (np.ndarray): The bounding boxes stored in a 2D numpy array with shape (N, 4), in `format`.
         format (str): The format of the bounding boxes ('xyxy', 'xywh', or 'ltwh').
 
     Methods:
         convert: Convert bounding box format from one type to another.
+        stored: Return the stored bounding boxes in a given format.
         areas: Calculate the area of bounding boxes.
         mul: Multiply bounding box coordinates by scale factor(s).
         add: Add offset to bounding box coordinates.
+        translate: Move bounding boxes along x and y.
         concatenate: Concatenate multiple Bboxes objects.
 
     Examples:
@@ -71,8 +101,34 @@ class Bboxes:
         bboxes = bboxes[None, :] if bboxes.ndim == 1 else bboxes
         assert bboxes.ndim == 2
         assert bboxes.shape[1] == 4
-        self.bboxes = bboxes
         self.format = format
+        self._data = bboxes  # stored boxes, in self._data_format until they are read in another format
+        self._data_format = format
+
+    @property
+    def bboxes(self) -> np.ndarray:
+        """Return the bounding boxes in `format`, converting the stored boxes if a conversion is pending."""
+        return self.stored(self.format)
+
+    @bboxes.setter
+    def bboxes(self, bboxes: np.ndarray) -> None:
+        """Set the bounding boxes, given in `format`."""
+        self._data, self._data_format = bboxes, self.format
+
+    def stored(self, format: str) -> np.ndarray:
+        """
+        Return the stored bounding boxes converted to a format, without changing the format they are reported in.
+
+        Args:
+            format (str): Format to convert the stored boxes to, one of 'xyxy', 'xywh', or 'ltwh'.
+
+        Returns:
+            (np.ndarray): The stored bounding boxes, modifying them in place modifies these boxes.
+        """
+        if self._data_format != format:
+            self._data = _converters[self._data_format, format](self._data)
+            self._data_format = format
+        return self._data
 
     def convert(self, format: str) -> None:
         """
@@ -82,23 +138,15 @@ class Bboxes:
             format (str): Target format for conversion, one of 'xyxy', 'xywh', or 'ltwh'.
         """
         assert format in _formats, f"Invalid bounding box format: {format}, format must be one of {_formats}"
-        if self.format == format:
-            return
-        elif self.format == "xyxy":
-            func = xyxy2xywh if format == "xywh" else xyxy2ltwh
-        elif self.format == "xywh":
-            func = xywh2xyxy if format == "xyxy" else xywh2ltwh
-        else:
-            func = ltwh2xyxy if format == "xyxy" else ltwh2xywh
-        self.bboxes = func(self.bboxes)
         self.format = format
 
     def areas(self) -> np.ndarray:
         """Calculate the area of bounding boxes."""
+        b = self._data
         return (
-            (self.bboxes[:, 2] - self.bboxes[:, 0]) * (self.bboxes[:, 3] - self.bboxes[:, 1])  # format xyxy
-            if self.format == "xyxy"
-            else self.bboxes[:, 3] * self.bboxes[:, 2]  # format xywh or ltwh
+            (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])  # format xyxy
+            if self._data_format == "xyxy"
+            else b[:, 3] * b[:, 2]  # format xywh or ltwh
         )
 
     def mul(self, scale: Union[int, tuple, list]) -> None:
@@ -113,10 +161,9 @@ class Bboxes:
             scale = to_4tuple(scale)
         assert isinstance(scale, (tuple, list))
         assert len(scale) == 4
-        self.bboxes[:, 0] *= scale[0]
-        self.bboxes[:, 1] *= scale[1]
-        self.bboxes[:, 2] *= scale[2]
-        self.bboxes[:, 3] *= scale[3]
+        # Scaling x and y commutes with format conversion, so it applies to the stored boxes in any format
+        b = self._data if scale[0] == scale[2] and scale[1] == scale[3] else self.bboxes
+        b *= np.asarray(scale)
 
     def add(self, offset: Union[int, tuple, list]) -> None:
         """
@@ -130,14 +177,23 @@ class Bboxes:
             offset = to_4tuple(offset)
         assert isinstance(offset, (tuple, list))
         assert len(offset) == 4
-        self.bboxes[:, 0] += offset[0]
-        self.bboxes[:, 1] += offset[1]
-        self.bboxes[:, 2] += offset[2]
-        self.bboxes[:, 3] += offset[3]
+        b = self.bboxes
+        b += np.asarray(offset)
+
+    def translate(self, dx: float, dy: float) -> None:
+        """
+        Move bounding boxes along x and y, in whichever format they are stored.
+
+        Args:
+            dx (float): Offset along x.
+            dy (float): Offset along y.
+        """
+        b = self._data
+        b += np.asarray((dx, dy, dx, dy) if self._data_format == "xyxy" else (dx, dy, 0, 0))
 
     def __len__(self) -> int:
         """Return the number of bounding boxes."""
-        return len(self.bboxes)
+        return len(self._data)
 
     @classmethod
     def concatenate(cls, boxes_list: List["Bboxes"], axis: int = 0) -> "Bboxes":
@@ -171,17 +227,20 @@ class Bboxes:
             index (int | slice | np.ndarray): The index, slice, or boolean array to select the desired bounding boxes.
 
         Returns:
-            (Bboxes): A new Bboxes object containing the selected bounding boxes.
+            (Bboxes): A new Bboxes object containing the selected bounding boxes, in the same format.
 
         Notes:
             When using boolean indexing, make sure to provide a boolean array with the same length as the number of
             bounding boxes.
         """
         if isinstance(index, int):
-            return Bboxes(self.bboxes[index].reshape(1, -1))
-        b = self.bboxes[index]
-        assert b.ndim == 2, f"Indexing on Bboxes with {index} failed to return a matrix!"
-        return Bboxes(b)
+            b = self._data[index].reshape(1, -1)
+        else:
+            b = self._data[index]
+            assert b.ndim == 2, f"Indexing on Bboxes with {index} failed to return a matrix!"
+        boxes = Bboxes(b, format=self._data_format)
+        boxes.format = self.format
+        return boxes
 
 
 class Instances:
@@ -192,11 +251,18 @@ class Instances:
     boxes, segmentation masks, and keypoints. It supports various operations like scaling, normalization, clipping,
     and format conversion.
 
+    Segments of different lengths are kept in one array padded with the last point of each segment, with their
+    lengths in `segment_lengths`. Repeated points leave boxes, masks and transforms of a polygon unchanged, so
+    segments are only resampled to `segment_resamples` points when they cross a border they are clipped to, where
+    clipping the points of a polygon only follows the border closely if the polygon is densely sampled.
+
     Attributes:
         _bboxes (Bboxes): Internal object for handling bounding box operations.
         keypoints (np.ndarray): Keypoints with shape (N, 17, 3) in format (x, y, visible).
         normalized (bool): Flag indicating whether the bounding box coordinates are normalized.
-        segments (np.ndarray): Segments array with shape (N, M, 2) after resampling.
+        segments (np.ndarray): Segments array with shape (N, M, 2), padded with the last point of each segment.
+        segment_lengths (np.ndarray | None): Number of points of each segment, None if no segment is padded.
+        segment_resamples (int): Number of points segments are resampled to before they are clipped.
 
     Methods:
         convert_bbox: Convert bounding box format.
@@ -206,6 +272,7 @@ class Instances:
         add_padding: Add padding to coordinates.
         flipud: Flip coordinates vertically.
         fliplr: Flip coordinates horizontally.
+        resample_segments: Resample padded segments to segment_resamples points.
         clip: Clip coordinates to stay within image boundaries.
         remove_zero_area_boxes: Remove boxes with zero area.
         update: Update instance variables.
@@ -223,25 +290,34 @@ class Instances:
     def __init__(
         self,
         bboxes: np.ndarray,
-        segments: np.ndarray = None,
+        segments: Union[np.ndarray, List[np.ndarray]] = None,
         keypoints: np.ndarray = None,
         bbox_format: str = "xywh",
         normalized: bool = True,
+        segment_lengths: np.ndarray = None,
+        segment_resamples: int = 1000,
     ) -> None:
         """
         Initialize the Instances object with bounding boxes, segments, and keypoints.
 
         Args:
             bboxes (np.ndarray): Bounding boxes with shape (N, 4).
-            segments (np.ndarray, optional): Segmentation masks.
+            segments (np.ndarray | List[np.ndarray], optional): Segmentation masks, a list of (M, 2) arrays of
+                varying M is padded into one array.
             keypoints (np.ndarray, optional): Keypoints with shape (N, 17, 3) in format (x, y, visible).
             bbox_format (str): Format of bboxes.
             normalized (bool): Whether the coordinates are normalized.
+            segment_lengths (np.ndarray, optional): Number of points of each padded segment.
+            segment_resamples (int): Number of points segments are resampled to before they are clipped.
         """
         self._bboxes = Bboxes(bboxes=bboxes, format=bbox_format)
         self.keypoints = keypoints
         self.normalized = normalized
+        if isinstance(segments, list) and len(segments):
+            segments, segment_lengths = _stack_segments(segments)
         self.segments = segments
+        self.segment_lengths = segment_lengths
+        self.segment_resamples = segment_resamples
 
     def convert_bbox(self, format: str) -> None:
         """
@@ -320,7 +396,7 @@ class Instances:
             padh (int): Padding height.
         """
         assert not self.normalized, "you should add padding with absolute coordinates."
-        self._bboxes.add(offset=(padw, padh, padw, padh))
+        self._bboxes.translate(padw, padh)
         self.segments[..., 0] += padw
         self.segments[..., 1] += padh
         if self.keypoints is not None:
@@ -342,6 +418,9 @@ class Instances:
             instances.
         """
         segments = self.segments[index] if len(self.segments) else self.segments
+        segment_lengths = (
+            self.segment_lengths[index] if self.segment_lengths is not None and len(self.segments) else None
+        )
         keypoints = self.keypoints[index] if self.keypoints is not None else None
         bboxes = self.bboxes[index]
         bbox_format = self._bboxes.format
@@ -351,6 +430,8 @@ class Instances:
             keypoints=keypoints,
             bbox_format=bbox_format,
             normalized=self.normalized,
+            segment_lengths=segment_lengths,
+            segment_resamples=self.segment_resamples,
         )
 
     def flipud(self, h: int) -> None:
@@ -360,13 +441,8 @@ class Instances:
         Args:
             h (int): Image height.
         """
-        if self._bboxes.format == "xyxy":
-            y1 = self.bboxes[:, 1].copy()
-            y2 = self.bboxes[:, 3].copy()
-            self.bboxes[:, 1] = h - y2
-            self.bboxes[:, 3] = h - y1
-        else:
-            self.bboxes[:, 1] = h - self.bboxes[:, 1]
+        bboxes = self._bboxes.stored("xyxy")
+        bboxes[:, [1, 3]] = h - bboxes[:, [3, 1]]
         self.segments[..., 1] = h - self.segments[..., 1]
         if self.keypoints is not None:
             self.keypoints[..., 1] = h - self.keypoints[..., 1]
@@ -378,17 +454,42 @@ class Instances:
         Args:
             w (int): Image width.
         """
-        if self._bboxes.format == "xyxy":
-            x1 = self.bboxes[:, 0].copy()
-            x2 = self.bboxes[:, 2].copy()
-            self.bboxes[:, 0] = w - x2
-            self.bboxes[:, 2] = w - x1
-        else:
-            self.bboxes[:, 0] = w - self.bboxes[:, 0]
+        bboxes = self._bboxes.stored("xyxy")
+        bboxes[:, [0, 2]] = w - bboxes[:, [2, 0]]
         self.segments[..., 0] = w - self.segments[..., 0]
         if self.keypoints is not None:
             self.keypoints[..., 0] = w - self.keypoints[..., 0]
 
+    def resample_segments(self, index: np.ndarray = None) -> None:
+        """
+        Resample padded segments with fewer points to segment_resamples points, inserting points along their edges.
+
+        Args:
+            index (np.ndarray, optional): Boolean array selecting the segments to resample, all segments if None.
+        """
+        if self.segment_lengths is None or not len(self.segments):
+            return
+        n = self.segment_resamples
+        i = np.nonzero((self.segment_lengths < n) if index is None else (self.segment_lengths < n) & index)[0]
+        if not len(i):
+            return
+        m = self.segment_lengths[i, None]
+        k = np.arange(n)
+        # Positions along each closed polygon, n - m - 1 evenly spaced ones merged with the m + 1 vertices
+        ne = n - m - 1
+        x = np.sort(np.where(k < ne, k * (m / np.maximum(ne - 1, 1)), k - ne), axis=1)
+        j = x.astype(np.int64)
+        t = (x - j)[..., None].astype(self.segments.dtype)
+        points = self.segments[i].reshape(-1, 2)
+        offsets = np.arange(len(i))[:, None] * self.segments.shape[1]
+        p0 = np.take(points, offsets + j % m, axis=0)
+        p1 = np.take(points, offsets + (j + 1) % m, axis=0)
+        segments = _pad_segments(self.segments, n)
+        segments[i, :n] = p0 + (p1 - p0) * t
+        segments[i, n:] = segments[i, n - 1 : n]
+        self.segments = segments
+        self.segment_lengths[i] = n
+
     def clip(self, w: int, h: int) -> None:
         """
         Clip coordinates to stay within image boundaries.
@@ -397,24 +498,24 @@ class Instances:
             w (int): Image width.
             h (int): Image height.
         """
-        ori_format = self._bboxes.format
-        self.convert_bbox(format="xyxy")
-        self.bboxes[:, [0, 2]] = self.bboxes[:, [0, 2]].clip(0, w)
-        self.bboxes[:, [1, 3]] = self.bboxes[:, [1, 3]].clip(0, h)
-        if ori_format != "xyxy":
-            self.convert_bbox(format=ori_format)
-        self.segments[..., 0] = self.segments[..., 0].clip(0, w)
-        self.segments[..., 1] = self.segments[..., 1].clip(0, h)
+        bboxes = self._bboxes.stored("xyxy")
+        x, y = bboxes[:, 0::2], bboxes[:, 1::2]
+        np.clip(x, 0, w, out=x)
+        np.clip(y, 0, h, out=y)
+        if len(self.segments):
+            x, y = self.segments[..., 0], self.segments[..., 1]
+            outside = (self.segments.reshape(len(x), -1).min(1) < 0) | (x.max(1) > w) | (y.max(1) > h)
+            if outside.any():
+                self.resample_segments(outside)
+                x, y = self.segments[..., 0], self.segments[..., 1]
+                np.clip(x, 0, w, out=x)
+                np.clip(y, 0, h, out=y)
         if self.keypoints is not None:
             # Set out of bounds visibility to zero
-            self.keypoints[..., 2][
-                (self.keypoints[..., 0] < 0)
-                | (self.keypoints[..., 0] > w)
-                | (self.keypoints[..., 1] < 0)
-                | (self.keypoints[..., 1] > h)
-            ] = 0.0
-            self.keypoints[..., 0] = self.keypoints[..., 0].clip(0, w)
-            self.keypoints[..., 1] = self.keypoints[..., 1].clip(0, h)
+            x, y = self.keypoints[..., 0], self.keypoints[..., 1]
+            self.keypoints[..., 2][(x < 0) | (x > w) | (y < 0) | (y > h)] = 0.0
+            np.clip(x, 0, w, out=x)
+            np.clip(y, 0, h, out=y)
 
     def remove_zero_area_boxes(self) -> np.ndarray:
         """
@@ -428,6 +529,8 @@ class Instances:
             self._bboxes = self._bboxes[good]
             if len(self.segments):
                 self.segments = self.segments[good]
+                if self.segment_lengths is not None:
+                    self.segment_lengths = self.segment_lengths[good]
             if self.keypoints is not None:
                 self.keypoints = self.keypoints[good]
         return good
@@ -438,18 +541,19 @@ class Instances:
 
         Args:
             bboxes (np.ndarray): New bounding boxes.
-            segments (np.ndarray, optional): New segments.
+            segments (np.ndarray, optional): New segments, treated as not padded.
             keypoints (np.ndarray, optional): New keypoints.
         """
         self._bboxes = Bboxes(bboxes, format=self._bboxes.format)
         if segments is not None:
             self.segments = segments
+            self.segment_lengths = None
         if keypoints is not None:
             self.keypoints = keypoints
 
     def __len__(self) -> int:
         """Return the number of instances."""
-        return len(self.bboxes)
+        return len(self._bboxes)
 
     @classmethod
     def concatenate(cls, instances_list: List["Instances"], axis=0) -> "Instances":
@@ -481,12 +585,12 @@ class Instances:
         normalized = instances_list[0].normalized
 
         cat_boxes = np.concatenate([ins.bboxes for ins in instances_list], axis=axis)
-        seg_len = [b.segments.shape[1] for b in instances_list]
-        if len(frozenset(seg_len)) > 1:  # resample segments if there's different length
-            max_len = max(seg_len)
+        seg_len = [b.segments.shape[1] for b in instances_list if len(b.segments)]
+        if len(frozenset(seg_len)) > 1 or len(seg_len) < len(instances_list):  # pad segments to the longest
+            max_len = max(seg_len, default=instances_list[0].segments.shape[1])
             cat_segments = np.concatenate(
                 [
-                    resample_segments(list(b.segments), max_len)
+                    _pad_segments(b.segments, max_len)
                     if len(b.segments)
                     else np.zeros((0, max_len, 2), dtype=np.float32)  # re-generating empty segments
                     for b in instances_list
@@ -495,8 +599,24 @@ class Instances:
             )
         else:
             cat_segments = np.concatenate([b.segments for b in instances_list], axis=axis)
+        cat_lengths = None
+        if any(b.segment_lengths is not None for b in instances_list):
+            cat_lengths = np.concatenate(
+                [
+                    np.full(len(b.segments), b.segments.shape[1]) if b.segment_lengths is None else b.segment_lengths
+                    for b in instances_list
+                ]
+            )
         cat_keypoints = np.concatenate([b.keypoints for b in instances_list], axis=axis) if use_keypoint else None
-        return cls(cat_boxes, cat_segments, cat_keypoints, bbox_format, normalized)
+        return cls(
+            cat_boxes,
+            cat_segments,
+            cat_keypoints,
+            bbox_format,
+            normalized,
+            segment_lengths=cat_lengths,
+            segment_resamples=instances_list[0].segment_resamples,
+        )
 
     @property
     def bboxes(self) -> np.ndarray:
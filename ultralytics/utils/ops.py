@@ -224,7 +224,8 @@ def non_max_suppression(
         labels (List[List[Union[int, float, torch.Tensor]]]): A priori labels for each image.
         max_det (int): Maximum number of detections to keep per image.
         nc (int): Number of classes. Indices after this are considered masks.
-        max_time_img (float): Maximum time in seconds for processing one image.
+        max_time_img (float): Maximum time in seconds for processing one image, only applies to rotated boxes or
+            when a priori labels are given, other inputs are processed as a single batch.
         max_nms (int): Maximum number of boxes for torchvision.ops.nms().
         max_wh (int): Maximum box width and height in pixels.
         in_place (bool): Whether to modify the input prediction tensor in place.
@@ -258,7 +259,6 @@ def non_max_suppression(
     extra = prediction.shape[1] - nc - 4  # number of extra info
     mi = 4 + nc  # mask start index
     xc = prediction[:, 4:mi].amax(1) > conf_thres  # candidates
-    xinds = torch.stack([torch.arange(len(i), device=prediction.device) for i in xc])[..., None]  # to track idxs
 
     # Settings
     # min_wh = 2  # (pixels) minimum box width and height
@@ -272,6 +272,52 @@ def non_max_suppression(
         else:
             prediction = torch.cat((xywh2xyxy(prediction[..., :4]), prediction[..., 4:]), dim=-1)  # xywh to xyxy
 
+    if not (rotated or labels):  # vectorized batch NMS
+        b, k = xc.nonzero(as_tuple=True)  # image and anchor indices of candidates
+        x = prediction[b, k]
+        box, cls, mask = x.split((4, nc, extra), 1)
+        if multi_label:
+            i, j = torch.where(cls > conf_thres)
+            x = torch.cat((box[i], x[i, 4 + j, None], j[:, None].float(), mask[i]), 1)
+        else:  # best class only
+            conf, j = cls.max(1, keepdim=True)
+            i = (conf.view(-1) > conf_thres).nonzero().view(-1)
+            x = torch.cat((box, conf, j.float(), mask), 1)[i]
+        b, k = b[i], k[i]
+        if classes is not None:
+            filt = (x[:, 5:6] == classes).any(1)
+            x, b, k = x[filt], b[filt], k[filt]
+
+        # Check shape, candidates are already grouped by image
+        n = x.shape[0]  # number of boxes
+        if n and torch.bincount(b, minlength=bs).max() > max_nms:  # excess boxes
+            order = x[:, 4].argsort(descending=True)  # sort by image then confidence and remove excess boxes
+            order = order[(b[order] * n + torch.arange(n, device=b.device)).argsort()]
+            x, b, k = x[order], b[order], k[order]
+            counts = torch.bincount(b, minlength=bs)
+            filt = torch.arange(n, device=b.device) - (counts.cumsum(0) - counts)[b] < max_nms  # rank within image
+            x, b, k = x[filt], b[filt], k[filt]
+
+        # Batched NMS
+        c = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
+        scores = x[:, 4]  # scores
+        if x.device.type != "cuda" or bs == 1:  # serial kernels scale with n^2, so run one call per image
+            ends = torch.bincount(b, minlength=bs).cumsum(0).tolist()
+            boxes = x[:, :4] + c  # boxes (offset by class)
+            i = torch.cat(
+                [torchvision.ops.nms(boxes[s:e], scores[s:e], iou_thres) + s for s, e in zip([0] + ends, ends)]
+            )
+        else:  # one call with boxes also offset by image, float64 keeps large offsets exact
+            c = c + b[:, None] * max_wh * (2 if agnostic else nc + 1)
+            i = torchvision.ops.nms(x[:, :4].double() + c, scores.double(), iou_thres)
+            i = i[(b[i] * len(i) + torch.arange(len(i), device=i.device)).argsort()]  # group by image
+        counts = torch.bincount(b[i], minlength=bs)
+        i = i[torch.arange(len(i), device=i.device) - (counts.cumsum(0) - counts)[b[i]] < max_det]  # limit detections
+        counts = counts.clamp(max=max_det).tolist()
+        output, keepi = list(x[i].split(counts)), list(k[i].split(counts))
+        return (output, keepi) if return_idxs else output
+
+    xinds = torch.stack([torch.arange(len(i), device=prediction.device) for i in xc])[..., None]  # to track idxs
     t = time.time()
     output = [torch.zeros((0, 6 + extra), device=prediction.device)] * bs
     keepi = [torch.zeros((0, 1), device=prediction.device)] * bs  # to store the kept idxs
@@ -829,7 +875,7 @@ def masks2segments(masks, strategy: str = "all"):
     Convert masks to segments using contour detection.
 
     Args:
-        masks (torch.Tensor): Binary masks with shape (batch_size, 160, 160).
+        masks (torch.Tensor | np.ndarray): Binary masks with shape (batch_size, 160, 160).
         strategy (str): Segmentation strategy, either 'all' or 'largest'.
 
     Returns:
@@ -838,7 +884,8 @@ def masks2segments(masks, strategy: str = "all"):
     from ultralytics.data.converter import merge_multi_segment
 
     segments = []
-    for x in masks.int().cpu().numpy().astype("uint8"):
+    masks = masks.int().cpu().numpy() if isinstance(masks, torch.Tensor) else masks
+    for x in masks.astype("uint8"):
         c = cv2.findContours(x, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]
         if c:
             if strategy == "all":  # merge and concatenate all segments
@@ -855,6 +902,58 @@ def masks2segments(masks, strategy: str = "all"):
     return segments
 
 
+def masks2rle(masks):
+    """
+    Run-length encode binary masks in column-major order, as in uncompressed COCO RLE.
+
+    Runs alternate between 0 and 1 pixels starting with 0, so masks whose first pixel is set start with a zero count.
+    Run boundaries of all masks are found in one vectorized pass, on the device of the masks for tensors, so only the
+    boundaries are copied to the CPU.
+
+    Args:
+        masks (torch.Tensor | np.ndarray): Binary masks with shape (N, H, W).
+
+    Returns:
+        counts (np.ndarray): Concatenated run lengths of all masks (int32).
+        offsets (np.ndarray): Start of the runs of each mask in counts with shape (N + 1,) (int64).
+    """
+    n, h, w = masks.shape
+    if isinstance(masks, torch.Tensor):
+        x = masks.bool().transpose(1, 2).reshape(n, h * w)
+        i, j = (x[:, 1:] != x[:, :-1]).nonzero(as_tuple=True)
+        i, j, first = i.cpu().numpy(), j.cpu().numpy(), x[:, 0].cpu().numpy()
+    else:
+        x = masks.astype(bool).transpose(0, 2, 1).reshape(n, h * w)
+        i, j = (x[:, 1:] != x[:, :-1]).nonzero()
+        first = x[:, 0]
+    k = np.arange(n)
+    lead = k[first]  # masks starting with a 1 pixel get an extra boundary at 0 for their zero-length first run
+    inst = np.concatenate((k, lead, i, k))  # boundaries: start, optional empty run, run changes, end
+    pos = np.concatenate((np.zeros(n + len(lead), dtype=np.int64), j + 1, np.full(n, h * w)))
+    order = np.concatenate((np.zeros(n), np.ones(len(lead)), np.full(len(i), 2), np.full(n, 3)))
+    s = np.lexsort((order, pos, inst))
+    inst, pos = inst[s], pos[s]
+    keep = inst[1:] == inst[:-1]  # differences within one mask
+    counts = np.diff(pos)[keep].astype(np.int32)
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(inst, minlength=n) - 1)))
+    return counts, offsets
+
+
+def rle2mask(counts, shape):
+    """
+    Decode a column-major run-length encoding as returned by masks2rle into a binary mask.
+
+    Args:
+        counts (np.ndarray): Run lengths of one mask, alternating between 0 and 1 pixels starting with 0.
+        shape (tuple): Mask shape (H, W).
+
+    Returns:
+        (np.ndarray): Binary mask with shape (H, W) (bool).
+    """
+    values = np.arange(len(counts)) % 2 == 1
+    return np.repeat(values, counts).reshape(shape[1], shape[0]).T
+
+
 def convert_torch2numpy_batch(batch: torch.Tensor) -> np.ndarray:
     """
     Convert a batch of FP32 torch tensors to NumPy uint8 arrays, changing from BCHW to BHWC layout.
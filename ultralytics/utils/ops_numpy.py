@@ -0,0 +1,326 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""
+NumPy implementations of the postprocessing operations in ultralytics.utils.ops.
+
+These functions mirror the signatures and outputs of their PyTorch counterparts so that predictions from non-PyTorch
+backends (ONNX Runtime, OpenVINO, TensorFlow, etc.) can be postprocessed without converting them to torch tensors.
+Box and coordinate helpers in ultralytics.utils.ops (scale_boxes, scale_coords, clip_boxes, xywh2xyxy) already accept
+NumPy arrays and are reused directly.
+"""
+
+import math
+
+import cv2
+import numpy as np
+
+from ultralytics.utils.ops import xywh2xyxy
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_thres: float) -> np.ndarray:
+    """
+    Perform greedy non-maximum suppression on axis-aligned boxes, matching torchvision.ops.nms().
+
+    Args:
+        boxes (np.ndarray): Boxes with shape (N, 4) in xyxy format.
+        scores (np.ndarray): Confidence scores with shape (N,).
+        iou_thres (float): Boxes with IoU above this threshold are suppressed.
+
+    Returns:
+        (np.ndarray): Indices of kept boxes sorted by decreasing score.
+    """
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        i, order = order[0], order[1:]
+        keep.append(i)
+        w = (np.minimum(x2[i], x2[order]) - np.maximum(x1[i], x1[order])).clip(0)
+        h = (np.minimum(y2[i], y2[order]) - np.maximum(y1[i], y1[order])).clip(0)
+        inter = w * h
+        order = order[inter / (areas[i] + areas[order] - inter) <= iou_thres]
+    return np.array(keep, dtype=np.int64)
+
+
+def batch_probiou(obb1: np.ndarray, obb2: np.ndarray, eps: float = 1e-7) -> np.ndarray:
+    """
+    Calculate the probabilistic IoU between oriented bounding boxes.
+
+    Args:
+        obb1 (np.ndarray): Boxes of shape (N, 5) in xywhr format.
+        obb2 (np.ndarray): Boxes of shape (M, 5) in xywhr format.
+        eps (float, optional): A small value to avoid division by zero.
+
+    Returns:
+        (np.ndarray): An array of shape (N, M) representing obb similarities.
+    """
+
+    def covariance(boxes):
+        """Generate covariance matrix components from xywhr boxes."""
+        a, b, c = boxes[:, 2:3] ** 2 / 12, boxes[:, 3:4] ** 2 / 12, boxes[:, 4:5]
+        cos2, sin2, cos_sin = np.cos(c) ** 2, np.sin(c) ** 2, np.cos(c) * np.sin(c)
+        return a * cos2 + b * sin2, a * sin2 + b * cos2, (a - b) * cos_sin
+
+    x1, y1 = obb1[:, 0:1], obb1[:, 1:2]
+    x2, y2 = obb2[None, :, 0], obb2[None, :, 1]
+    a1, b1, c1 = covariance(obb1)
+    a2, b2, c2 = (x.T for x in covariance(obb2))
+
+    t1 = (
+        ((a1 + a2) * (y1 - y2) ** 2 + (b1 + b2) * (x1 - x2) ** 2) / ((a1 + a2) * (b1 + b2) - (c1 + c2) ** 2 + eps)
+    ) * 0.25
+    t2 = (((c1 + c2) * (x2 - x1) * (y1 - y2)) / ((a1 + a2) * (b1 + b2) - (c1 + c2) ** 2 + eps)) * 0.5
+    t3 = (
+        np.log(
+            ((a1 + a2) * (b1 + b2) - (c1 + c2) ** 2)
+            / (4 * np.sqrt((a1 * b1 - c1**2).clip(0) * (a2 * b2 - c2**2).clip(0)) + eps)
+            + eps
+        )
+        * 0.5
+    )
+    bd = (t1 + t2 + t3).clip(eps, 100.0)
+    hd = np.sqrt(1.0 - np.exp(-bd) + eps)
+    return 1 - hd
+
+
+def nms_rotated(boxes: np.ndarray, scores: np.ndarray, threshold: float = 0.45) -> np.ndarray:
+    """
+    Perform NMS on oriented bounding boxes using probiou and fast-nms.
+
+    Args:
+        boxes (np.ndarray): Rotated bounding boxes with shape (N, 5) in xywhr format.
+        scores (np.ndarray): Confidence scores with shape (N,).
+        threshold (float): IoU threshold for NMS.
+
+    Returns:
+        (np.ndarray): Indices of boxes to keep after NMS.
+    """
+    sorted_idx = np.argsort(-scores, kind="stable")
+    boxes = boxes[sorted_idx]
+    ious = np.triu(batch_probiou(boxes, boxes), k=1)
+    return sorted_idx[(ious >= threshold).sum(0) <= 0]
+
+
+def non_max_suppression(
+    prediction,
+    conf_thres: float = 0.25,
+    iou_thres: float = 0.45,
+    classes=None,
+    agnostic: bool = False,
+    multi_label: bool = False,
+    max_det: int = 300,
+    nc: int = 0,  # number of classes (optional)
+    max_nms: int = 30000,
+    max_wh: int = 7680,
+    rotated: bool = False,
+    end2end: bool = False,
+    return_idxs: bool = False,
+):
+    """
+    Perform non-maximum suppression (NMS) on NumPy prediction results.
+
+    Mirrors ultralytics.utils.ops.non_max_suppression() for arrays returned by non-PyTorch backends.
+
+    Args:
+        prediction (np.ndarray): Predictions with shape (batch_size, num_classes + 4 + num_masks, num_boxes)
+            containing boxes, classes, and optional masks.
+        conf_thres (float): Confidence threshold for filtering detections. Valid values are between 0.0 and 1.0.
+        iou_thres (float): IoU threshold for NMS filtering. Valid values are between 0.0 and 1.0.
+        classes (List[int], optional): List of class indices to consider. If None, all classes are considered.
+        agnostic (bool): Whether to perform class-agnostic NMS.
+        multi_label (bool): Whether each box can have multiple labels.
+        max_det (int): Maximum number of detections to keep per image.
+        nc (int): Number of classes. Indices after this are considered masks.
+        max_nms (int): Maximum number of boxes per image passed to NMS.
+        max_wh (int): Maximum box width and height in pixels.
+        rotated (bool): Whether to handle Oriented Bounding Boxes (OBB).
+        end2end (bool): Whether the model is end-to-end and doesn't require NMS.
+        return_idxs (bool): Whether to return the indices of kept detections.
+
+    Returns:
+        output (List[np.ndarray]): List of detections per image with shape (num_boxes, 6 + num_masks)
+            containing (x1, y1, x2, y2, confidence, class, mask1, mask2, ...).
+        keepi (List[np.ndarray]): Indices of kept detections if return_idxs=True.
+    """
+    assert 0 <= conf_thres <= 1, f"Invalid Confidence threshold {conf_thres}, valid values are between 0.0 and 1.0"
+    assert 0 <= iou_thres <= 1, f"Invalid IoU {iou_thres}, valid values are between 0.0 and 1.0"
+    if isinstance(prediction, (list, tuple)):  # output = (inference_out, loss_out)
+        prediction = prediction[0]  # select only inference output
+    if classes is not None:
+        classes = np.array(classes)
+
+    if prediction.shape[-1] == 6 or end2end:  # end-to-end model (BNC, i.e. 1,300,6)
+        output = [pred[pred[:, 4] > conf_thres][:max_det] for pred in prediction]
+        if classes is not None:
+            output = [pred[(pred[:, 5:6] == classes).any(1)] for pred in output]
+        return output
+
+    bs = prediction.shape[0]  # batch size (BCN, i.e. 1,84,6300)
+    nc = nc or (prediction.shape[1] - 4)  # number of classes
+    mi = 4 + nc  # mask start index
+    multi_label &= nc > 1  # multiple labels per box
+
+    b, k = np.nonzero(prediction[:, 4:mi].max(1) > conf_thres)  # image and anchor indices of candidates
+    x = prediction.transpose(0, 2, 1)[b, k]  # shape(n,84)
+    box, cls, mask = np.split(x, (4, mi), axis=1)
+    if not rotated:
+        box = xywh2xyxy(box)  # xywh to xyxy
+    if multi_label:
+        i, j = np.nonzero(cls > conf_thres)
+        x = np.concatenate((box[i], cls[i, j, None], j[:, None].astype(x.dtype), mask[i]), 1)
+    else:  # best class only
+        j = cls.argmax(1)
+        conf = cls[np.arange(len(j)), j]
+        i = np.nonzero(conf > conf_thres)[0]
+        x = np.concatenate((box[i], conf[i, None], j[i, None].astype(x.dtype), mask[i]), 1)
+    b, k = b[i], k[i]
+    if classes is not None:
+        filt = (x[:, 5:6] == classes).any(1)
+        x, b, k = x[filt], b[filt], k[filt]
+
+    output, keepi = [], []
+    ends = np.cumsum(np.bincount(b, minlength=bs))
+    for s, e in zip([0, *ends[:-1]], ends):  # contiguous slice of each image
+        xi, ki = x[s:e], k[s:e]
+        if len(xi) > max_nms:  # excess boxes
+            filt = np.argsort(-xi[:, 4], kind="stable")[:max_nms]  # sort by confidence and remove excess boxes
+            xi, ki = xi[filt], ki[filt]
+        c = xi[:, 5:6] * (0 if agnostic else max_wh)  # classes
+        if rotated:
+            i = nms_rotated(np.concatenate((xi[:, :2] + c, xi[:, 2:4], xi[:, -1:]), 1), xi[:, 4], iou_thres)
+        else:
+            i = nms(xi[:, :4] + c, xi[:, 4], iou_thres)
+        i = i[:max_det]  # limit detections
+        output.append(xi[i])
+        keepi.append(ki[i])
+    return (output, keepi) if return_idxs else output
+
+
+def regularize_rboxes(rboxes: np.ndarray) -> np.ndarray:
+    """
+    Regularize rotated bounding boxes to range [0, pi/2].
+
+    Args:
+        rboxes (np.ndarray): Input rotated boxes with shape (N, 5) in xywhr format.
+
+    Returns:
+        (np.ndarray): Regularized rotated boxes.
+    """
+    x, y, w, h, t = rboxes.T
+    # Swap edge if t >= pi/2 while not being symmetrically opposite
+    swap = t % math.pi >= math.pi / 2
+    w_ = np.where(swap, h, w)
+    h_ = np.where(swap, w, h)
+    t = t % (math.pi / 2)
+    return np.stack([x, y, w_, h_, t], axis=-1)  # regularized boxes
+
+
+def crop_mask(masks: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """
+    Crop masks to bounding box regions.
+
+    Args:
+        masks (np.ndarray): Masks with shape (N, H, W).
+        boxes (np.ndarray): Bounding box coordinates with shape (N, 4) in relative point form.
+
+    Returns:
+        (np.ndarray): Cropped masks.
+    """
+    _, h, w = masks.shape
+    x1, y1, x2, y2 = np.split(boxes[:, :, None], 4, 1)  # x1 shape(n,1,1)
+    r = np.arange(w, dtype=x1.dtype)[None, None, :]  # rows shape(1,1,w)
+    c = np.arange(h, dtype=x1.dtype)[None, :, None]  # cols shape(1,h,1)
+    return masks * ((r >= x1) * (r < x2) * (c >= y1) * (c < y2))
+
+
+def resize_masks(masks: np.ndarray, shape) -> np.ndarray:
+    """
+    Resize masks with bilinear interpolation, matching F.interpolate(mode="bilinear", align_corners=False).
+
+    Args:
+        masks (np.ndarray): Masks with shape (N, H, W).
+        shape (tuple): Target height and width as (height, width).
+
+    Returns:
+        (np.ndarray): Resized masks with shape (N, height, width).
+    """
+    if not len(masks):
+        return np.zeros((0, *shape), dtype=masks.dtype)
+    masks = masks.transpose(1, 2, 0)  # HWN, cv2 resizes at most 512 channels per call
+    return np.concatenate(
+        [
+            cv2.resize(masks[..., i : i + 512], shape[::-1], interpolation=cv2.INTER_LINEAR).reshape(*shape, -1)
+            for i in range(0, masks.shape[-1], 512)
+        ],
+        axis=-1,
+    ).transpose(2, 0, 1)
+
+
+def process_mask(protos: np.ndarray, masks_in: np.ndarray, bboxes: np.ndarray, shape, upsample: bool = False):
+    """
+    Apply masks to bounding boxes using mask head output.
+
+    Args:
+        protos (np.ndarray): Mask prototypes with shape (mask_dim, mask_h, mask_w).
+        masks_in (np.ndarray): Mask coefficients with shape (N, mask_dim) where N is number of masks after NMS.
+        bboxes (np.ndarray): Bounding boxes with shape (N, 4) where N is number of masks after NMS.
+        shape (tuple): Input image size as (height, width).
+        upsample (bool): Whether to upsample masks to original image size.
+
+    Returns:
+        (np.ndarray): A binary mask array of shape (N, H, W).
+    """
+    c, mh, mw = protos.shape  # CHW
+    ih, iw = shape
+    masks = (masks_in @ protos.astype(np.float32).reshape(c, -1)).reshape(-1, mh, mw)  # CHW
+    downsampled_bboxes = bboxes * np.array([mw / iw, mh / ih, mw / iw, mh / ih], dtype=bboxes.dtype)
+    masks = crop_mask(masks, downsampled_bboxes)  # CHW
+    if upsample:
+        masks = resize_masks(masks, shape)  # CHW
+    return (masks > 0.0).astype(np.float32)
+
+
+def process_mask_native(protos: np.ndarray, masks_in: np.ndarray, bboxes: np.ndarray, shape) -> np.ndarray:
+    """
+    Apply masks to bounding boxes using mask head output with native upsampling.
+
+    Args:
+        protos (np.ndarray): Mask prototypes with shape (mask_dim, mask_h, mask_w).
+        masks_in (np.ndarray): Mask coefficients with shape (N, mask_dim) where N is number of masks after NMS.
+        bboxes (np.ndarray): Bounding boxes with shape (N, 4) where N is number of masks after NMS.
+        shape (tuple): Input image size as (height, width).
+
+    Returns:
+        (np.ndarray): Binary mask array with shape (N, H, W).
+    """
+    c, mh, mw = protos.shape  # CHW
+    masks = (masks_in @ protos.astype(np.float32).reshape(c, -1)).reshape(-1, mh, mw)
+    masks = scale_masks(masks, shape)  # CHW
+    masks = crop_mask(masks, bboxes)  # CHW
+    return (masks > 0.0).astype(np.float32)
+
+
+def scale_masks(masks: np.ndarray, shape, padding: bool = True) -> np.ndarray:
+    """
+    Rescale segment masks to target shape.
+
+    Args:
+        masks (np.ndarray): Masks with shape (N, H, W).
+        shape (tuple): Target height and width as (height, width).
+        padding (bool): Whether masks are based on YOLO-style augmented images with padding.
+
+    Returns:
+        (np.ndarray): Rescaled masks with shape (N, height, width).
+    """
+    mh, mw = masks.shape[1:]
+    gain = min(mh / shape[0], mw / shape[1])  # gain  = old / new
+    pad = [mw - shape[1] * gain, mh - shape[0] * gain]  # wh padding
+    if padding:
+        pad[0] /= 2
+        pad[1] /= 2
+    top, left = (int(round(pad[1] - 0.1)), int(round(pad[0] - 0.1))) if padding else (0, 0)  # y, x
+    bottom, right = (
+        mh - int(round(pad[1] + 0.1)),
+        mw - int(round(pad[0] + 0.1)),
+    )
+    return resize_masks(np.ascontiguousarray(masks[:, top:bottom, left:right]), shape)